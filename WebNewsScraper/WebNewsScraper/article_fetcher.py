@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+from scheduler import HostScheduler
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ArticleFetcher:
+    """
+    Background stage that fetches article pages for accepted homepage teasers.
+
+    submit() never waits: once max_pending articles are queued or in flight
+    new ones are dropped (and counted), so a slow stage cannot hold up the
+    next homepage cycle. A fixed pool of workers takes articles off the queue
+    and runs fetch(url), then extract(html), then on_result(article, body).
+    on_result is also called with None when the fetch or extraction fails,
+    and by stop() for every article still queued or in flight, so each
+    submitted article reaches on_result exactly once.
+    Host politeness goes through the shared HostScheduler: an article whose
+    host is busy is put back when its slot opens instead of blocking a worker.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[Optional[str]]],
+                 extract: Callable[[str, str], Awaitable[Optional[str]]],
+                 on_result: Callable[[Dict, Optional[str]], None],
+                 scheduler: HostScheduler, workers: int = 4, max_pending: int = 500,
+                 latency_window: int = 1000):
+        self.fetch = fetch
+        self.extract = extract
+        self.on_result = on_result
+        self.scheduler = scheduler
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending = 0
+        self._in_flight = 0
+        self._unfinished: Dict[int, Dict] = {}  # id(article) -> article, until on_result
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._fetch_times: Deque[float] = deque(maxlen=latency_window)
+        self._completed_at: Deque[float] = deque(maxlen=latency_window)
+        self.stats = {'submitted': 0, 'dropped': 0, 'completed': 0, 'failed': 0, 'deferred': 0}
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logging.info(f"Started full-article fetcher with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers, then hand every article still queued or in flight to on_result without a body"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending = self._in_flight = 0
+        unfinished, self._unfinished = list(self._unfinished.values()), {}
+        if unfinished:
+            logging.info(f"Full-article fetcher stopped, passing on {len(unfinished)} pending articles without a body")
+        for article in unfinished:
+            self._report(article, None)
+
+    @property
+    def pending(self) -> int:
+        """Articles queued or in flight"""
+        return self._pending
+
+    def submit(self, article: Dict) -> bool:
+        """Queue article for a full fetch; False if the stage is saturated or not running"""
+        if self._queue is None or self._pending >= self.max_pending:
+            self.stats['dropped'] += 1
+            return False
+        self._pending += 1
+        self.stats['submitted'] += 1
+        self._unfinished[id(article)] = article
+        self._queue.put_nowait((article, time.monotonic()))
+        return True
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            article, queued_at = item
+            domain = urlparse(article['url']).netloc
+            wait = self.scheduler.host_wait(domain, loop.time())
+            if wait > 0:
+                self.stats['deferred'] += 1
+                loop.call_later(wait, self._queue.put_nowait, item)
+                continue
+
+            self.scheduler.acquire_host(domain, loop.time())
+            self._in_flight += 1
+            body = None
+            try:
+                started = time.monotonic()
+                html = await self.fetch(article['url'])
+                self._fetch_times.append(time.monotonic() - started)
+                if html:
+                    body = await self.extract(html, article['url'])
+            except Exception as e:
+                logging.error(f"Full-article fetch failed for {article['url']}: {e}")
+            finally:
+                self.scheduler.release_host(domain)
+                self._in_flight -= 1
+                self._pending -= 1
+
+            self.stats['completed' if body else 'failed'] += 1
+            now = time.monotonic()
+            self._latencies.append(now - queued_at)
+            self._completed_at.append(now)
+            del self._unfinished[id(article)]
+            self._report(article, body)
+
+    def _report(self, article: Dict, body: Optional[str]) -> None:
+        try:
+            self.on_result(article, body)
+        except Exception as e:
+            logging.error(f"Full-article result handler failed for {article['url']}: {e}")
+
+    def metrics(self) -> Dict:
+        """Queue depth, in-flight count, counters, latency percentiles (s) and recent throughput (articles/s)"""
+        latencies = list(self._latencies)
+        fetch_times = list(self._fetch_times)
+        done = list(self._completed_at)
+        window = done[-1] - done[0] if len(done) > 1 else 0.0
+        return {
+            'queue_depth': self._pending - self._in_flight,
+            'in_flight': self._in_flight,
+            **self.stats,
+            'latency_p50': _percentile(latencies, 0.5),
+            'latency_p95': _percentile(latencies, 0.95),
+            'fetch_p50': _percentile(fetch_times, 0.5),
+            'throughput': (len(done) - 1) / window if window else 0.0,
+        }
+
+    def summary(self) -> str:
+        m = self.metrics()
+        return (
+            f"queue {m['queue_depth']}, in flight {m['in_flight']}, "
+            f"{m['completed']} fetched, {m['failed']} failed, {m['dropped']} dropped, "
+            f"latency p50 {m['latency_p50']:.1f}s p95 {m['latency_p95']:.1f}s, "
+            f"{m['throughput']:.2f} articles/s"
+        )
@@ -0,0 +1,318 @@
+"""
+Queryable SQLite store for scraped articles
+
+Usage:
+    python article_store.py import                  # load every articles_*.json snapshot
+    python article_store.py import 'old/*.ndjson'
+    python article_store.py search "banjir bekasi" --since 2025-06-01
+    python article_store.py recent --since 2025-06-19 --until 2025-06-20
+    python article_store.py stats
+"""
+import argparse
+import glob
+import gzip
+import json
+import logging
+import re
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_WORD = re.compile(r'\w+')
+
+_COLUMNS = (
+    'url', 'title', 'source', 'source_category', 'category', 'author', 'published_date',
+    'description', 'full_content', 'location', 'keywords', 'story_id', 'scraped_at', 'metadata'
+)
+
+
+def read_snapshot(path: str) -> Iterator[Tuple[Dict, Optional[str]]]:
+    """(article, NEWS_SOURCES group if the file records it) from a JSON snapshot or NDJSON file"""
+    if path.endswith(('.ndjson', '.ndjson.gz')):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line), None
+        return
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):  # early snapshots: a flat list of articles
+        for article in data:
+            yield article, None
+    else:
+        for category, articles in data.get('articles', {}).items():
+            for article in articles:
+                yield article, category
+
+
+class ArticleStore:
+    """
+    Articles in one SQLite table with B-tree indexes on url, source, category
+    and published_date, plus an FTS5 index over title, description and
+    full_content kept in sync by triggers.
+
+    Writes are batched: add_articles inserts a whole batch in one transaction
+    and skips URLs already stored. published_date is only indexed when it is
+    ISO formatted (what parse_indo_date produces); the raw value stays in the
+    metadata column.
+    """
+
+    def __init__(self, path: str = 'articles.sqlite3', cache_kib: int = 16384):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                source TEXT,
+                source_category TEXT,
+                category TEXT,
+                author TEXT,
+                published_date TEXT,
+                description TEXT,
+                full_content TEXT,
+                location TEXT,
+                keywords TEXT,
+                story_id TEXT,
+                scraped_at TEXT,
+                metadata TEXT
+            );
+            CREATE INDEX IF NOT EXISTS articles_source ON articles(source);
+            CREATE INDEX IF NOT EXISTS articles_category ON articles(category);
+            CREATE INDEX IF NOT EXISTS articles_source_category ON articles(source_category);
+            CREATE INDEX IF NOT EXISTS articles_published_date ON articles(published_date);
+            CREATE INDEX IF NOT EXISTS articles_story_id ON articles(story_id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, description, full_content,
+                content='articles', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts(rowid, title, description, full_content)
+                VALUES (new.id, new.title, new.description, new.full_content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, description, full_content)
+                VALUES ('delete', old.id, old.title, old.description, old.full_content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, description, full_content)
+                VALUES ('delete', old.id, old.title, old.description, old.full_content);
+                INSERT INTO articles_fts(rowid, title, description, full_content)
+                VALUES (new.id, new.title, new.description, new.full_content);
+            END;
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _row(article: Dict, source_category: Optional[str]) -> Tuple:
+        metadata = article.get('metadata') or {}
+        published_date = metadata.get('published_date') or ''
+        return (
+            article['url'],
+            article['title'],
+            article.get('source'),
+            source_category,
+            metadata.get('category'),
+            metadata.get('author'),
+            published_date if _ISO_DATE.match(published_date) else None,
+            metadata.get('description'),
+            metadata.get('full_content'),
+            metadata.get('location'),
+            json.dumps(metadata.get('keywords') or [], ensure_ascii=False),
+            metadata.get('story_id'),
+            article.get('timestamp'),
+            json.dumps(metadata, ensure_ascii=False)
+        )
+
+    def add_articles(self, articles: Iterable[Dict],
+                     category_of: Optional[Callable[[str], str]] = None,
+                     source_category: Optional[str] = None) -> int:
+        """
+        Insert articles in one transaction and return how many were new.
+
+        The NEWS_SOURCES group is source_category if given, else
+        category_of(article['source']).
+        """
+        rows = self._rows(articles, category_of, source_category)
+        if not rows:
+            return 0
+        with self.conn:
+            return self._insert(rows)
+
+    def _rows(self, articles: Iterable[Dict], category_of: Optional[Callable[[str], str]],
+              source_category: Optional[str]) -> List[Tuple]:
+        return [
+            self._row(article, source_category or (category_of(article.get('source') or '') if category_of else None))
+            for article in articles
+            if article.get('url') and article.get('title')
+        ]
+
+    def _insert(self, rows: List[Tuple]) -> int:
+        cursor = self.conn.executemany(
+            f"INSERT INTO articles ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))}) "
+            "ON CONFLICT(url) DO NOTHING",
+            rows
+        )
+        return cursor.rowcount
+
+    def import_snapshots(self, pattern: str = 'articles_*.json',
+                         category_of: Optional[Callable[[str], str]] = None) -> Tuple[int, int]:
+        """Bulk-load every file matching pattern, one transaction per file; returns (files, new articles)"""
+        files = inserted = 0
+        for path in sorted(glob.glob(pattern)):
+            try:
+                rows = [
+                    row
+                    for article, category in read_snapshot(path)
+                    for row in self._rows([article], category_of, category)
+                ]
+            except (OSError, ValueError) as e:
+                logging.warning(f"Skipping unreadable snapshot {path}: {e}")
+                continue
+            with self.conn:
+                inserted += self._insert(rows)
+            files += 1
+        logging.info(f"Imported {inserted} new articles from {files} files matching {pattern}")
+        return files, inserted
+
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Quote each word so user input like 'covid-19' cannot break FTS5 syntax"""
+        return ' '.join(f'"{word}"' for word in _WORD.findall(text))
+
+    @staticmethod
+    def _filters(since: Optional[str], until: Optional[str], source: Optional[str],
+                 category: Optional[str]) -> Tuple[str, List]:
+        clauses, params = [], []
+        if since:
+            clauses.append("a.published_date >= ?")
+            params.append(since)
+        if until:
+            # Dates may carry a time, so a bare date includes that whole day
+            clauses.append("a.published_date < date(?, '+1 day')" if len(until) == 10 else "a.published_date <= ?")
+            params.append(until)
+        if source:
+            clauses.append("a.source = ?")
+            params.append(source)
+        if category:
+            clauses.append("(a.category = ? OR a.source_category = ?)")
+            params.extend([category, category])
+        return ''.join(f" AND {clause}" for clause in clauses), params
+
+    @staticmethod
+    def _to_article(row: sqlite3.Row) -> Dict:
+        return {
+            'title': row['title'],
+            'url': row['url'],
+            'source': row['source'],
+            'source_category': row['source_category'],
+            'metadata': json.loads(row['metadata'] or '{}'),
+            'timestamp': row['scraped_at']
+        }
+
+    def search(self, text: str, since: Optional[str] = None, until: Optional[str] = None,
+               source: Optional[str] = None, category: Optional[str] = None,
+               limit: int = 50, raw: bool = False) -> List[Dict]:
+        """
+        Full-text search over title, description and full_content, best match
+        first. Every word must match unless raw=True, which passes text through
+        as an FTS5 query (phrases, OR, prefix*).
+        """
+        query = text if raw else self._fts_query(text)
+        if not query:
+            return []
+        where, params = self._filters(since, until, source, category)
+        rows = self.conn.execute(
+            "SELECT a.* FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            f"WHERE articles_fts MATCH ?{where} ORDER BY bm25(articles_fts) LIMIT ?",
+            [query, *params, limit]
+        ).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def recent(self, since: Optional[str] = None, until: Optional[str] = None,
+               source: Optional[str] = None, category: Optional[str] = None,
+               limit: int = 50) -> List[Dict]:
+        """Articles in a published_date range, newest first"""
+        where, params = self._filters(since, until, source, category)
+        rows = self.conn.execute(
+            f"SELECT a.* FROM articles a WHERE a.published_date IS NOT NULL{where} "
+            "ORDER BY a.published_date DESC LIMIT ?",
+            [*params, limit]
+        ).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def stats(self) -> Dict:
+        total, dated, sources = self.conn.execute(
+            "SELECT COUNT(*), COUNT(published_date), COUNT(DISTINCT source) FROM articles"
+        ).fetchone()
+        return {'articles': total, 'with_published_date': dated, 'sources': sources}
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def main(argv=None):
+    from config import ARTICLE_STORE_FILE
+    from news_scraper import NewsScraperAsync
+
+    parser = argparse.ArgumentParser(description="Query and import scraped articles")
+    parser.add_argument('--db', default=ARTICLE_STORE_FILE or 'articles.sqlite3')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="bulk-load JSON snapshots or NDJSON files")
+    import_parser.add_argument('patterns', nargs='*', default=['articles_*.json'])
+
+    for name in ('search', 'recent'):
+        query_parser = commands.add_parser(name)
+        if name == 'search':
+            query_parser.add_argument('text')
+            query_parser.add_argument('--raw', action='store_true', help="pass text through as an FTS5 query")
+        query_parser.add_argument('--since', help="YYYY-MM-DD")
+        query_parser.add_argument('--until', help="YYYY-MM-DD, inclusive")
+        query_parser.add_argument('--source')
+        query_parser.add_argument('--category')
+        query_parser.add_argument('--limit', type=int, default=20)
+
+    commands.add_parser('stats')
+    args = parser.parse_args(argv)
+
+    store = ArticleStore(args.db)
+    try:
+        if args.command == 'import':
+            for pattern in args.patterns:
+                files, inserted = store.import_snapshots(pattern, NewsScraperAsync._source_category)
+                print(f"{pattern}: {inserted} new articles from {files} files")
+        elif args.command == 'stats':
+            print(json.dumps(store.stats(), indent=2))
+        else:
+            filters = dict(since=args.since, until=args.until, source=args.source,
+                           category=args.category, limit=args.limit)
+            start = time.perf_counter()
+            if args.command == 'search':
+                results = store.search(args.text, raw=args.raw, **filters)
+            else:
+                results = store.recent(**filters)
+            elapsed = (time.perf_counter() - start) * 1000
+            for article in results:
+                print(f"{article['metadata'].get('published_date') or '-':<17} {article['title']}\n    {article['url']}")
+            print(f"{len(results)} results in {elapsed:.1f}ms")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
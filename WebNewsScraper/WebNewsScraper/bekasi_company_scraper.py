@@ -1,7 +1,7 @@
 
 import asyncio
-import aiohttp
-from bs4 import BeautifulSoup
+from http_client import HttpStats, create_session, read_body, request_headers
+from parser_backends import make_soup
 import json
 import re
 from datetime import datetime
@@ -22,6 +22,7 @@ logging.basicConfig(
 class BekasiCompanyScraper:
     def __init__(self):
         self.session = None
+        self.http_stats = HttpStats()
         self.companies = []
         
         # Sumber data perusahaan di Bekasi - diperbanyak
@@ -137,31 +138,29 @@ class BekasiCompanyScraper:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate",
+            "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1"
         }
     
     async def initialize(self):
-        """Initialize aiohttp session"""
+        """Initialize the shared aiohttp session; headers are sent per request"""
         if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+            self.session = create_session(self.http_stats, timeout=30)
     
     async def close(self):
         """Close aiohttp session"""
         if self.session:
+            logging.info(f"HTTP: {self.http_stats.summary()}")
             await self.session.close()
             self.session = None
     
     async def fetch_page(self, url: str) -> Optional[str]:
         """Fetch webpage content"""
         try:
-            async with self.session.get(url, ssl=False) as response:
+            async with self.session.get(url, headers=request_headers(self.headers), ssl=False) as response:
                 if response.status == 200:
-                    content = await response.text()
+                    content = await read_body(response, self.http_stats)
                     logging.info(f"✅ Berhasil mengambil data dari: {url}")
                     return content
                 else:
@@ -236,7 +235,7 @@ class BekasiCompanyScraper:
             if not html:
                 return companies
             
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html)
             
             # Find company listings
             company_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(
@@ -302,7 +301,7 @@ class BekasiCompanyScraper:
                 if not html:
                     continue
                 
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = make_soup(html)
                 
                 # Find job listings which contain company information
                 job_elements = soup.find_all(['div', 'article'], class_=lambda x: x and any(
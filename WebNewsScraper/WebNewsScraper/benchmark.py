@@ -0,0 +1,927 @@
+"""
+Offline benchmarks for the scraping hot path
+
+Homepages captured from NEWS_SOURCES are read from fixtures/ (see the capture
+command); without captured pages a deterministic synthetic portal homepage is
+used so every benchmark still runs offline. No captured pages are committed
+(they are third-party content), so run capture once before trusting absolute
+numbers: the suite report marks results measured on synthetic pages.
+
+Contoh penggunaan:
+    python benchmark.py capture
+    python benchmark.py parsers --repeat 5
+    python benchmark.py extraction
+    python benchmark.py keywords
+    python benchmark.py dedup
+    python benchmark.py bloom
+    python benchmark.py near-duplicates
+    python benchmark.py parquet          # needs pyarrow
+    python benchmark.py content
+    python benchmark.py profiles [--fixtures DIR]
+    python benchmark.py incremental
+    python benchmark.py polling
+    python benchmark.py locations [--full]
+    python benchmark.py suite --output before.json   # timed hot path, JSON report
+    python benchmark.py compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from statistics import mean
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+FIXTURES_DIR = 'fixtures'
+FIXTURE_INDEX = 'index.json'
+
+_WORDS = [
+    'pemerintah', 'politik', 'ekonomi', 'warga', 'jakarta', 'harga', 'presiden', 'menteri',
+    'pasar', 'bisnis', 'saham', 'teknologi', 'sekolah', 'pendidikan', 'rumah', 'sakit',
+    'kesehatan', 'timnas', 'olahraga', 'banjir', 'bencana', 'polisi', 'kriminal', 'kpk',
+    'korupsi', 'pemilu', 'partai', 'daerah', 'kota', 'bekasi', 'bandung', 'surabaya',
+    'investasi', 'rupiah', 'inflasi', 'laga', 'liga', 'juara', 'gempa', 'cuaca'
+]
+_MONTHS = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli', 'Agustus',
+           'September', 'Oktober', 'November', 'Desember']
+_CITIES = ['JAKARTA', 'BEKASI', 'BANDUNG', 'SURABAYA', 'MEDAN', 'MAKASSAR', 'SEMARANG']
+
+
+def synthetic_homepage(seed: int = 0, blocks: int = 120) -> str:
+    """Build a portal-like homepage with nested teaser blocks, scripts and metadata"""
+    rng = random.Random(seed)
+
+    def sentence(n: int) -> str:
+        return ' '.join(rng.choice(_WORDS) for _ in range(n)).capitalize()
+
+    teasers = []
+    for i in range(blocks):
+        title = sentence(rng.randint(5, 10))
+        date = f"{rng.randint(1, 28)} {rng.choice(_MONTHS)} 2025 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        author = rng.choice(['<span class="author-name">Budi Santoso</span>',
+                             '<div class="post__writer">Siti Rahma</div>', ''])
+        category = rng.choice(['<a class="kanal-link" href="/news">News</a>',
+                               '<span class="article-category">Ekonomi</span>', ''])
+        description = f"{rng.choice(_CITIES)}, KOMPAS.com - {sentence(rng.randint(12, 25))}."
+        body = ''
+        if rng.random() < 0.2:
+            body = ('<div class="article-content"><script>var ad = 1;</script>'
+                    + ''.join(f'<p>{sentence(20)}.</p>' for _ in range(rng.randint(2, 5)))
+                    + '</div>')
+        teasers.append(
+            f'<div class="{rng.choice(["article__list", "news-item", "post-card", "berita-terkini"])} clearfix">'
+            f'<div class="media"><img src="/img/{i}.jpg" alt=""></div>'
+            f'<h3 class="article__title"><a href="/read/2025/{i:05d}/{seed}">{title}</a></h3>'
+            f'{author}{category}'
+            f'<time class="published" datetime="">{date}</time>'
+            f'<p class="article-excerpt">{description}</p>{body}'
+            f'</div>'
+        )
+
+    sections = []
+    per_section = max(1, blocks // 6)
+    for start in range(0, len(teasers), per_section):
+        sections.append(
+            f'<section class="content-section"><div class="latest-news-wrap">'
+            f'{"".join(teasers[start:start + per_section])}</div></section>'
+        )
+
+    return (
+        '<!DOCTYPE html><html><head><title>Portal Berita</title>'
+        '<meta name="description" content="Berita terkini hari ini">'
+        '<script>window.dataLayer = [];</script><style>.x{color:red}</style></head>'
+        '<body><header class="nav"><ul>' + ''.join(f'<li><a href="/{w}">{w}</a></li>' for w in _WORDS[:15]) +
+        '</ul></header><main class="main-content">' + ''.join(sections) + '</main>'
+        '<footer class="footer"><p>Hak cipta dilindungi</p></footer></body></html>'
+    )
+
+
+def _fixture_name(url: str) -> str:
+    parsed = urlparse(url)
+    path = parsed.path.strip('/').replace('/', '_')
+    return f"{parsed.netloc}{'_' + path if path else ''}.html"
+
+
+def load_fixtures(directory: str = FIXTURES_DIR) -> List[Tuple[str, str, str]]:
+    """Return (name, base_url, html) tuples, or synthetic pages when none are captured"""
+    fixtures = []
+    index: Dict[str, str] = {}
+    index_path = os.path.join(directory, FIXTURE_INDEX)
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+    if os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.html'):
+                continue
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+            base_url = index.get(filename) or f"https://{filename[:-len('.html')].split('_')[0]}/"
+            fixtures.append((filename, base_url, html))
+
+    if not fixtures:
+        fixtures = [
+            (f'synthetic_{seed}.html', f'https://www.synthetic{seed}.example/', synthetic_homepage(seed))
+            for seed in range(4)
+        ]
+    return fixtures
+
+
+async def capture_fixtures(directory: str = FIXTURES_DIR) -> None:
+    """Download every NEWS_SOURCES homepage once into the fixtures directory"""
+    from config import NEWS_SOURCES
+    from news_scraper import NewsScraperAsync
+
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    scraper = NewsScraperAsync()
+    try:
+        await scraper.initialize()
+        for sources in NEWS_SOURCES.values():
+            for url in sources:
+                html = await scraper.fetch_page(url)
+                if not html:
+                    continue
+                filename = _fixture_name(url)
+                with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+                    f.write(html)
+                index[filename] = url
+    finally:
+        await scraper.close()
+
+    with open(os.path.join(directory, FIXTURE_INDEX), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    print(f"Captured {len(index)} homepages into {directory}/")
+
+
+def _comparable(articles: List[Dict]) -> List[Dict]:
+    return [{k: v for k, v in article.items() if k != 'timestamp'} for article in articles]
+
+
+def _time_call(func, repeat: int) -> Tuple[float, object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return mean(timings), result
+
+
+def bench_parser_backends(fixtures: List[Tuple[str, str, str]], repeat: int = 3) -> None:
+    """Per-page extract_articles time for every parser backend, checked against bs4"""
+    from news_scraper import extract_articles
+    from parser_backends import available_backends
+
+    backends = available_backends()
+    totals = {name: 0.0 for name in backends}
+    mismatches = {name: 0 for name in backends}
+
+    print(f"{'fixture':40} " + ' '.join(f'{name:>12}' for name in backends))
+    for name, base_url, html in fixtures:
+        row = []
+        reference = None
+        for backend in backends:
+            elapsed, articles = _time_call(lambda: extract_articles(html, base_url, backend), repeat)
+            totals[backend] += elapsed
+            articles = _comparable(articles)
+            if reference is None:
+                reference = articles
+            elif articles != reference:
+                mismatches[backend] += 1
+            row.append(f'{elapsed * 1000:10.1f}ms')
+        print(f"{name[:40]:40} " + ' '.join(row))
+
+    print(f"{'mean per page':40} " + ' '.join(
+        f'{totals[name] / len(fixtures) * 1000:10.1f}ms' for name in backends))
+    for backend in backends[1:]:
+        print(f"{backend}: {totals[backends[0]] / totals[backend]:.1f}x vs {backends[0]}, "
+              f"{mismatches[backend]} page(s) with different output")
+
+
+def bench_single_pass(fixtures: List[Tuple[str, str, str]], repeat: int = 3) -> None:
+    """Single-pass metadata extraction against one _extract_* call per field"""
+    from news_scraper import extract_articles
+    from parser_backends import available_backends
+
+    for backend in available_backends():
+        helper_total = single_total = 0.0
+        mismatches = 0
+        for name, base_url, html in fixtures:
+            helper_time, helper_articles = _time_call(
+                lambda: extract_articles(html, base_url, backend, single_pass=False), repeat)
+            single_time, single_articles = _time_call(
+                lambda: extract_articles(html, base_url, backend, single_pass=True), repeat)
+            helper_total += helper_time
+            single_total += single_time
+            if _comparable(helper_articles) != _comparable(single_articles):
+                mismatches += 1
+        print(f"{backend:10} per-helper {helper_total / len(fixtures) * 1000:8.1f}ms  "
+              f"single-pass {single_total / len(fixtures) * 1000:8.1f}ms  "
+              f"speedup {helper_total / single_total:4.1f}x  {mismatches} page(s) with different output")
+
+
+def _contains_keywords_reference(text: str, keywords: List[str]) -> bool:
+    """contains_keywords as it was before KeywordMatcher"""
+    text_lower = text.lower()
+    return any(keyword.lower() in text_lower for keyword in keywords)
+
+
+def synthetic_corpus(size: int = 20000, seed: int = 0) -> List[str]:
+    """Title + description sized texts built from the synthetic vocabulary"""
+    rng = random.Random(seed)
+    filler = ['yang', 'dan', 'di', 'untuk', 'dengan', 'pada', 'ini', 'itu', 'dari', 'akan', 'warga', 'kota']
+    return [
+        ' '.join(rng.choice(filler if rng.random() < 0.9 else _WORDS) for _ in range(rng.randint(20, 60)))
+        for _ in range(size)
+    ]
+
+
+def bench_keywords(corpus: List[str], repeat: int = 3) -> None:
+    """KeywordMatcher against the per-call lowercase + any() substring scan"""
+    from config import KEYWORDS
+    from utils import KeywordMatcher
+
+    rng = random.Random(1)
+    extended = list(KEYWORDS) + [
+        ''.join(rng.choice('abdegiklmnoprstu') for _ in range(rng.randint(5, 10))) for _ in range(200)
+    ]
+
+    for keywords in (list(KEYWORDS), extended):
+        matcher = KeywordMatcher(keywords)
+        bounded = KeywordMatcher(keywords, word_boundary=True)
+        expected = [_contains_keywords_reference(text, keywords) for text in corpus]
+        if [matcher.search(text) for text in corpus] != expected:
+            print("WARNING: KeywordMatcher.search disagrees with the reference scan")
+
+        print(f"{len(keywords)} keywords, {len(corpus)} texts")
+        runs = [
+            ('reference any()', lambda: [_contains_keywords_reference(t, keywords) for t in corpus]),
+            ('matcher.search', lambda: [matcher.search(t) for t in corpus]),
+            ('matcher.matches', lambda: [matcher.matches(t) for t in corpus]),
+            ('word-boundary matches', lambda: [bounded.matches(t) for t in corpus]),
+        ]
+        baseline = None
+        for label, func in runs:
+            elapsed, _ = _time_call(func, repeat)
+            baseline = baseline or elapsed
+            print(f"  {label:24} {elapsed * 1000:8.1f}ms  "
+                  f"({elapsed / len(corpus) * 1e6:6.2f}us/text, {baseline / elapsed:5.1f}x)")
+
+
+def bench_dedup(size: int = 1_000_000) -> None:
+    """Insert, reopen and look up keys in PersistentDedupStore vs MemoryCache"""
+    import tempfile
+    from dedup_store import PersistentDedupStore
+    from utils import MemoryCache
+
+    articles = [{'title': f'Judul berita {i}', 'url': f'https://example.com/read/{i}'} for i in range(size)]
+    probes = articles[::max(1, size // 50000)]
+    unseen = [{'title': f'Baru {i}', 'url': f'https://example.com/new/{i}'} for i in range(len(probes))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dedup.sqlite3')
+        store = PersistentDedupStore(path, commit_every=10000)
+        start = time.perf_counter()
+        for article in articles:
+            store.add_article(article)
+        store.flush()
+        insert_time = time.perf_counter() - start
+        store.close()
+
+        start = time.perf_counter()
+        store = PersistentDedupStore(path)
+        open_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hits = sum(store.is_duplicate(a) for a in probes) + sum(store.is_duplicate(a) for a in unseen)
+        lookup_time = time.perf_counter() - start
+        db_size = os.path.getsize(path)
+        store.close()
+
+    memory = MemoryCache(max_size=size)
+    start = time.perf_counter()
+    for article in articles:
+        memory.add_article(article)
+    memory_insert = time.perf_counter() - start
+    start = time.perf_counter()
+    sum(memory.is_duplicate(a) for a in probes) + sum(memory.is_duplicate(a) for a in unseen)
+    memory_lookup = time.perf_counter() - start
+
+    lookups = len(probes) + len(unseen)
+    print(f"PersistentDedupStore: {size} inserts in {insert_time:.2f}s, reopen {open_time * 1000:.1f}ms, "
+          f"{lookup_time / lookups * 1e6:.1f}us/lookup ({hits} hits of {lookups}), {db_size / 1e6:.1f}MB on disk")
+    print(f"MemoryCache:          {size} inserts in {memory_insert:.2f}s, "
+          f"{memory_lookup / lookups * 1e6:.1f}us/lookup, lost on restart")
+
+
+def bench_bloom(size: int = 200_000) -> None:
+    """Measured false-positive rate and speed of BloomFilter, plus sizing for large histories"""
+    from bloom_filter import BloomFilter
+
+    for error_rate in (0.01, 0.001, 0.0001):
+        bloom = BloomFilter(size, error_rate)
+        start = time.perf_counter()
+        for i in range(size):
+            bloom.add(f'https://example.com/read/{i}'.encode())
+        add_time = time.perf_counter() - start
+        start = time.perf_counter()
+        false_positives = sum(f'https://example.com/new/{i}'.encode() in bloom for i in range(size))
+        check_time = time.perf_counter() - start
+        print(f"target {error_rate:.4%}: measured {false_positives / size:.4%}, {bloom.nbytes / 1e3:.0f}KB, "
+              f"{bloom.num_hashes} hashes, {add_time / size * 1e6:.1f}us/add, {check_time / size * 1e6:.1f}us/check")
+
+    for capacity in (10_000_000, 50_000_000):
+        sizes = ', '.join(
+            f"{rate:.2%} -> {BloomFilter(1000, rate).num_bits / 1000 * capacity / 8 / 1e6:.0f}MB"
+            for rate in (0.01, 0.001, 0.0001)
+        )
+        print(f"{capacity:>11,} keys: {sizes}")
+
+
+def bench_near_duplicates(size: int = 100_000, republished: float = 0.2) -> None:
+    """MinHash signature and NearDuplicateIndex throughput with a share of lightly edited copies"""
+    from near_duplicate import NearDuplicateIndex, article_signature
+    from config import NEAR_DUPLICATE_THRESHOLD
+
+    rng = random.Random(0)
+    vocabulary = [f"{word}{i}" for i in range(200) for word in _WORDS]
+    texts = []
+    for _ in range(size):
+        if texts and rng.random() < republished:
+            # Republished wire story: same text with one word swapped
+            words = rng.choice(texts).split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            texts.append(' '.join(words))
+        else:
+            texts.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(30, 60))))
+
+    start = time.perf_counter()
+    signatures = [article_signature(text) for text in texts]
+    hash_time = time.perf_counter() - start
+
+    index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD, max_entries=size)
+    start = time.perf_counter()
+    stories = {index.add(str(i), signature) for i, signature in enumerate(signatures)}
+    index_time = time.perf_counter() - start
+
+    print(f"minhash: {size / hash_time:,.0f} articles/s ({hash_time:.1f}s for {size:,})")
+    print(f"index (similarity >= {NEAR_DUPLICATE_THRESHOLD}): {size / index_time:,.0f} articles/s ({index_time:.1f}s), "
+          f"{index.stats['comparisons'] / size:.1f} comparisons/article")
+    print(f"{len(stories):,} stories, {index.stats['near_duplicates']:,} near duplicates "
+          f"(~{int(size * republished):,} republished copies generated)")
+
+
+def _directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(path) for name in names
+    )
+
+
+def bench_parquet(snapshots: int = 200, per_snapshot: int = 500) -> None:
+    """Load time and size of save_articles JSON snapshots vs the partitioned Parquet export"""
+    import glob
+    import tempfile
+    import pandas as pd
+    from article_store import read_snapshot
+    from parquet_export import import_snapshots, read_articles
+
+    rng = random.Random(0)
+    categories = ['Media Berita Umum', 'Media Bisnis dan Keuangan', 'Media Olahraga', 'Media Teknologi']
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir, parquet_dir = os.path.join(tmp, 'json'), os.path.join(tmp, 'parquet')
+        os.makedirs(json_dir)
+        for n in range(snapshots):
+            day = f"2025-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}"
+            grouped: Dict[str, List[Dict]] = {}
+            for i in range(per_snapshot):
+                category = rng.choice(categories)
+                grouped.setdefault(category, []).append({
+                    'title': ' '.join(rng.choice(_WORDS) for _ in range(10)),
+                    'url': f"https://example.com/{n}/{i}",
+                    'source': f"https://site{i % 12}.example/",
+                    'metadata': {
+                        'author': rng.choice(['Tidak disebutkan', 'Redaksi', 'Andi']),
+                        'published_date': f"{day} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+                        'category': rng.choice(['Umum', 'Politik', 'Ekonomi']),
+                        'description': ' '.join(rng.choice(_WORDS) for _ in range(30)),
+                        'location': rng.choice(['', 'JAKARTA', 'BEKASI']),
+                        'keywords': [rng.choice(_WORDS)],
+                    },
+                    'timestamp': f"{day}T12:00:00",
+                })
+            with open(os.path.join(json_dir, f"articles_{n:05d}.json"), 'w', encoding='utf-8') as f:
+                json.dump({'metadata': {}, 'articles': grouped}, f, ensure_ascii=False, indent=2)
+
+        def load_json() -> 'pd.DataFrame':
+            rows = []
+            for path in sorted(glob.glob(os.path.join(json_dir, '*.json'))):
+                for article, category in read_snapshot(path):
+                    rows.append({**article, 'category': category})
+            return pd.json_normalize(rows)
+
+        start = time.perf_counter()
+        exported = import_snapshots(os.path.join(json_dir, '*.json'), parquet_dir)
+        export_time = time.perf_counter() - start
+
+        json_time, frame = _time_call(load_json, 1)
+        parquet_time, table = _time_call(lambda: read_articles(parquet_dir), 3)
+        day, category = frame['metadata.published_date'].iloc[0][:10], categories[0]
+        json_filtered_time, _ = _time_call(
+            lambda: (lambda df: df[(df['metadata.published_date'].str[:10] == day) & (df['category'] == category)])(load_json()),
+            1
+        )
+        filtered_time, filtered = _time_call(lambda: read_articles(parquet_dir, since=day, until=day, categories=[category]), 3)
+
+        print(f"{exported:,} articles in {snapshots} snapshots, exported in {export_time:.1f}s")
+        print(f"json:    {_directory_size(json_dir) / 1e6:6.1f}MB, full load {json_time * 1000:8.0f}ms, "
+              f"one day+category {json_filtered_time * 1000:8.0f}ms")
+        print(f"parquet: {_directory_size(parquet_dir) / 1e6:6.1f}MB, full load {parquet_time * 1000:8.0f}ms, "
+              f"one day+category {filtered_time * 1000:8.0f}ms ({len(filtered)} rows)")
+
+
+def synthetic_article_page(seed: int, layout: str) -> str:
+    """
+    Article page with navigation, related links and footer around the body.
+    layout 'known' uses a CONTENT_SELECTORS container, 'custom' an unknown
+    class and 'bare' loose paragraphs inside <article>.
+    """
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(12, 25))).capitalize() + '.'
+
+    paragraphs = ''.join(f"<p>{sentence()} {sentence()}</p>" for _ in range(rng.randint(4, 9)))
+    container = {
+        'known': f'<div class="article-content">{paragraphs}</div>',
+        'custom': f'<div class="read__content"><div class="clearfix">{paragraphs}</div></div>',
+        'bare': paragraphs,
+    }[layout]
+    nav = ''.join(f'<li><a href="/kanal/{i}">{rng.choice(_WORDS)}</a></li>' for i in range(25))
+    related = ''.join(f'<p><a href="/read/{seed}{i}">{sentence()}</a></p>' for i in range(6))
+    return (
+        f"<html><head><title>{sentence()}</title></head><body>"
+        f"<header><ul class='menu'>{nav}</ul></header>"
+        f"<article><h1>{sentence()}</h1><div class='date'>17 Februari 2025</div>{container}</article>"
+        f"<aside class='related'><h3>Berita Terkait</h3>{related}</aside>"
+        f"<footer><p>Copyright 2025 Redaksi. Hak cipta dilindungi undang-undang.</p></footer>"
+        f"</body></html>"
+    )
+
+
+def bench_content_extraction(pages_per_layout: int = 100) -> None:
+    """Per-strategy time and success rate, and the per-domain winner cache against the full chain"""
+    from content_extractor import STRATEGIES, ContentExtractor
+    from news_scraper import extract_article_body
+
+    layouts = ['known', 'custom', 'bare']
+    pages = [
+        (layout, f"https://{layout}.example/read/{i}", synthetic_article_page(i, layout))
+        for layout in layouts for i in range(pages_per_layout)
+    ]
+
+    print(f"{'strategy':<12} " + ' '.join(f"{layout:>18}" for layout in layouts))
+    for strategy in STRATEGIES:
+        cells = []
+        for layout in layouts:
+            runs = [extract_article_body(html, url, (strategy,))[2][strategy] for lay, url, html in pages if lay == layout]
+            cells.append(f"{sum(ok for _, ok in runs) / len(runs):>5.0%} {mean(t for t, _ in runs) * 1000:>7.2f}ms")
+        print(f"{strategy:<12} " + ' '.join(f"{cell:>18}" for cell in cells))
+
+    for label, cached in (('full chain', False), ('winner cache', True)):
+        extractor = ContentExtractor()
+        start = time.perf_counter()
+        found = 0
+        for _, url, html in pages:
+            domain = urlparse(url).netloc
+            order = extractor.order_for(domain) if cached else extractor.strategies
+            body, winner, timings = extract_article_body(html, url, order)
+            extractor.record(domain, winner, timings)
+            found += body is not None
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {elapsed / len(pages) * 1000:.2f}ms/page, {found}/{len(pages)} bodies; {extractor.summary()}")
+
+
+def bench_selector_profiles(fixtures: List[Tuple[str, str, str]], repeat: int = 3) -> None:
+    """Generic class-substring scan vs a profile learned from it, per backend"""
+    from news_scraper import extract_articles
+    from parser_backends import available_backends
+    from selector_profiles import SelectorProfiles
+
+    def key(articles: List[Dict]) -> List[Tuple[str, str]]:
+        return sorted({(a['title'], a['url']) for a in articles})
+
+    for backend in available_backends():
+        generic_total = profiled_total = 0.0
+        mismatches = []
+        for name, url, html in fixtures:
+            generic_time, generic = _time_call(lambda: extract_articles(html, url, backend), repeat)
+            profiles = SelectorProfiles(None)
+            profiles.learn(url, {(a['title'], a['url']): a['selectors'] for a in generic}.values())
+            profile = profiles.get(url)
+            profiled_time, profiled = _time_call(lambda: extract_articles(html, url, backend, True, profile), repeat)
+            generic_total += generic_time
+            profiled_total += profiled_time
+            if key(generic) != key(profiled):
+                mismatches.append(name)
+        print(f"{backend:<9} generic {generic_total * 1000:8.1f}ms  profiled {profiled_total * 1000:8.1f}ms  "
+              f"{generic_total / profiled_total:.2f}x" + (f"  differs on {mismatches}" if mismatches else ''))
+
+
+def _churn(html: str, changed: int, cycle: int) -> str:
+    """Next cycle of a synthetic homepage: the first changed teasers point at new articles"""
+    parts = html.split('<a href="/read/2025/')
+    for i in range(1, min(changed, len(parts) - 1) + 1):
+        parts[i] = parts[i].replace('">', f'-{cycle}">', 1)
+    return '<a href="/read/2025/'.join(parts)
+
+
+def bench_incremental(fixtures: List[Tuple[str, str, str]], changed: int = 5, cycles: int = 5) -> None:
+    """Full parse of every cycle vs incremental parsing of only the changed blocks"""
+    from news_scraper import extract_articles, extract_changed_articles
+    from parser_backends import available_backends
+
+    for backend in available_backends():
+        full_total = incremental_total = 0.0
+        seen = processed = missed = 0
+        for name, url, html in fixtures:
+            known = frozenset(extract_changed_articles(html, url, frozenset(), None, backend)[1])
+            previous = {a['url'] for a in extract_articles(html, url, backend)}
+            for cycle in range(1, cycles + 1):
+                page = _churn(html, changed * cycle, cycle)
+                full_time, full = _time_call(lambda: extract_articles(page, url, backend), 1)
+                incremental_time, (articles, fingerprints, count) = _time_call(
+                    lambda: extract_changed_articles(page, url, known, None, backend), 1)
+                full_total += full_time
+                incremental_total += incremental_time
+                seen += len(fingerprints)
+                processed += count
+                current = {a['url'] for a in full}
+                missed += len((current - previous) - {a['url'] for a in articles})
+                known, previous = frozenset(fingerprints), current
+        print(f"{backend:<9} full {full_total * 1000:8.1f}ms  incremental {incremental_total * 1000:8.1f}ms  "
+              f"{full_total / incremental_total:.2f}x  {processed}/{seen} blocks processed, "
+              f"{missed} new articles missed")
+
+
+def bench_polling(hours: int = 48, seed: int = 0) -> None:
+    """
+    Simulated sources publishing as Poisson processes: fixed 5-minute polling
+    vs PollSchedule. Freshness is the delay from publication to the poll
+    that finds the article.
+    """
+    import random as _random
+    from poll_schedule import PollSchedule
+
+    rng = _random.Random(seed)
+    # (label, articles per hour, number of sources)
+    profiles = [('busy', 30.0, 4), ('regular', 4.0, 8), ('slow', 0.5, 8), ('quiet', 2 / 24, 6)]
+    horizon = hours * 3600
+    sources = []
+    for label, per_hour, count in profiles:
+        for i in range(count):
+            times, t = [], 0.0
+            while True:
+                t += rng.expovariate(per_hour / 3600)
+                if t >= horizon:
+                    break
+                times.append(t)
+            sources.append((label, f'https://{label}{i}.example/', times))
+
+    def simulate(schedule):
+        polls = {label: 0 for label, _, _ in profiles}
+        delays = {label: [] for label, _, _ in profiles}
+        for label, url, times in sources:
+            now, index = 0.0, 0
+            while now < horizon:
+                found = 0
+                while index < len(times) and times[index] <= now:
+                    delays[label].append(now - times[index])
+                    index += 1
+                    found += 1
+                polls[label] += 1
+                now += schedule.record(url, found, now) if schedule else 300
+        return polls, delays
+
+    for name, schedule in (('fixed 300s', None), ('adaptive', PollSchedule(None))):
+        polls, delays = simulate(schedule)
+        total = sum(polls.values())
+        print(f"{name:<11} {total:6d} requests  " + '  '.join(
+            f"{label} {polls[label]:5d} req, delay p50 {sorted(delays[label])[len(delays[label]) // 2] / 60:5.1f}m"
+            for label, _, _ in profiles if delays[label]))
+
+
+def _location_corpus(size: int, seed: int = 0) -> List[str]:
+    """Article texts (dateline, then 80-400 words) mentioning regions from the gazetteer"""
+    from gazetteer import default_gazetteer
+
+    rng = random.Random(seed)
+    names = [region.name for region in default_gazetteer().regions.values()]
+    bare = [name.split(' ', 1)[1] if name.startswith(('Kota ', 'Kabupaten ')) else name for name in names]
+    filler = ['yang', 'dan', 'di', 'untuk', 'dengan', 'pada', 'ini', 'itu', 'dari', 'akan', 'warga', 'kota',
+              'batu', 'padang', 'jalan'] + _WORDS
+    texts = []
+    for _ in range(size):
+        words = [rng.choice(filler) for _ in range(rng.randint(80, 400))]
+        for _ in range(rng.randint(0, 4)):
+            words[rng.randrange(len(words))] = rng.choice(names + bare)
+        dateline = rng.choice(bare).upper() + rng.choice([', KOMPAS.com - ', ' (ANTARA) - ', ' - '])
+        texts.append((dateline if rng.random() < 0.7 else '') + ' '.join(words) + '.')
+    return texts
+
+
+def _locate_reference(text: str, keys: List[Tuple[str, str]]) -> List[str]:
+    """One substring scan per gazetteer name, the approach the trie replaces"""
+    lowered = text.lower()
+    return [code for key, code in keys if key in lowered]
+
+
+def bench_locations(size: int = 5000, repeat: int = 3, full: bool = False) -> None:
+    """
+    Location extraction throughput: the old dateline regex, a per-name
+    substring scan and the gazetteer trie, on the shipped gazetteer and on
+    one padded to the size of the full kecamatan-level list. The substring
+    scan over the padded list takes minutes and only runs with full=True.
+    """
+    import re
+    from gazetteer import Gazetteer, default_gazetteer
+
+    dateline_pattern = re.compile(r'^([A-Z]+(?:\s*,\s*[A-Z]+)*)')
+    corpus = _location_corpus(size)
+    megabytes = sum(len(text.encode('utf-8')) for text in corpus) / 1048576
+    shipped = default_gazetteer()
+    rng = random.Random(1)
+    padded_rows = [(region.code, region.name, ()) for region in shipped.regions.values()] + [
+        (f'99.{i // 100:02d}.{i % 100:02d}', 'Kecamatan ' + ''.join(
+            rng.choice('abdegiklmnoprstu') for _ in range(rng.randint(5, 11))).title(), ())
+        for i in range(7000)
+    ]
+    padded = Gazetteer(padded_rows)
+    print(f"{len(corpus)} articles, {megabytes:.1f}MB")
+
+    def report(label: str, func) -> None:
+        elapsed, _ = _time_call(lambda: [func(text) for text in corpus], repeat)
+        print(f"  {label:<40} {len(corpus) / elapsed:9.0f} articles/s  {megabytes / elapsed:6.1f}MB/s")
+
+    report("dateline regex (dateline only)", lambda text: dateline_pattern.match(text))
+    for label, gazetteer in (('shipped', shipped), ('padded', padded)):
+        print(f"{label} gazetteer: {len(gazetteer.regions)} regions")
+        if label == 'shipped' or full:
+            keys = [(region.name.lower(), region.code) for region in gazetteer.regions.values()]
+            report("substring scan per name", lambda text: _locate_reference(text, keys))
+        report("trie locate (dateline + body)", gazetteer.locate)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def measure(func, calls: int = 1, warmup: int = 1, repeat: int = 10, setup=None) -> Dict[str, float]:
+    """
+    Run func warmup times untimed, then repeat timed runs; func makes `calls`
+    calls of the measured operation, so the statistics are per call, in ms.
+    setup, if given, runs untimed before every run. p99 needs at least 100
+    runs to differ from the maximum and is None below that.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000 / max(calls, 1))
+    timings.sort()
+    return {
+        'calls': calls, 'runs': repeat,
+        'mean': mean(timings), 'min': timings[0], 'max': timings[-1],
+        'p50': _percentile(timings, 0.5), 'p90': _percentile(timings, 0.9),
+        'p99': _percentile(timings, 0.99) if repeat >= 100 else None,
+    }
+
+
+_SAMPLE_DATES = [
+    '17 Februari 2025', '17 Feb 2025 20:29', '17/02/2025', '2025-02-17', 'Senin, 3 Maret 2025 07:15 WIB',
+    '3 Agustus 2024', '12/12/2024 10:00', '', 'Kamis, 19 Juni 2025', '1 Desember 2023 23:59',
+    '6 jam yang lalu', 'Selasa, 4 Mar 2025 | 09:30 WITA', '2025-02-17T20:29:00+07:00',
+]
+
+
+def _isolated_scraper():
+    """
+    NewsScraperAsync with inline parsing and every persistent or output
+    stage switched off, so parse_article can be timed repeatedly without
+    touching the working directory. Its state files go to a throwaway
+    directory while it is constructed.
+    """
+    import tempfile
+    from news_scraper import NewsScraperAsync
+    from parse_executor import ParseExecutor
+    from selector_profiles import SelectorProfiles
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            scraper = NewsScraperAsync()
+            if scraper.store is not None:
+                scraper.store.close()
+            if scraper.sink is not None:
+                scraper.sink.close()
+            scraper.cache.flush()
+        finally:
+            os.chdir(cwd)
+    scraper.parse_executor.shutdown()
+    scraper.parse_executor = ParseExecutor('inline')
+    scraper.bloom = scraper.sink = scraper.store = scraper.parquet = None
+    scraper.article_fetcher = scraper.blocks = scraper.poll_schedule = None
+    scraper.profiles = SelectorProfiles(None, scraper.profiles.declared and {
+        domain: profile._asdict() for domain, profile in scraper.profiles.declared.items()
+    })
+    return scraper
+
+
+def run_suite(fixtures: List[Tuple[str, str, str]], warmup: int = 1, repeat: int = 10) -> Dict:
+    """
+    Time the parse/dedup hot path on the fixtures: parse_article and
+    extract_articles per page, every _extract_* helper per candidate block,
+    and contains_keywords, parse_indo_date, parse_indo_dates, clean_indo_text
+    and MemoryCache per call. INFO logging is muted while timing. parse_article is measured
+    in steady state: the selector profiles learned during warm-up apply.
+    The date parsers are timed with their LRU caches cleared before every
+    run, the cost of dates not seen before, and again warm (*_cached).
+    """
+    import logging
+    import platform
+    import subprocess
+    from config import MEMORY_CACHE_SIZE, KEYWORDS, PARSER_BACKEND
+    from id_helpers import _iso_tanggal, _parse_tanggal, clean_indo_text, parse_indo_date, parse_indo_dates
+    from news_scraper import ARTICLE_CLASS_HINTS, ARTICLE_TAGS, NewsScraperAsync, extract_articles
+    from parser_backends import get_backend
+    from utils import MemoryCache, contains_keywords
+
+    backend = get_backend(PARSER_BACKEND)
+    elements = []
+    for _, _, html in fixtures:
+        elements.extend(backend.find_all(backend.parse(html), ARTICLE_TAGS, ARTICLE_CLASS_HINTS))
+    texts = [backend.get_text(element) for element in elements]
+    dates = [NewsScraperAsync._extract_date(element, backend) for element in elements] + _SAMPLE_DATES
+    corpus = synthetic_corpus(2000) + [clean_indo_text(text) for text in texts]
+    articles = [{'title': f'Judul berita {i}', 'url': f'https://example.com/read/{i}'} for i in range(20000)]
+    probes = articles[::2] + [{'title': f'Baru {i}', 'url': f'https://example.com/new/{i}'} for i in range(10000)]
+
+    results: Dict[str, Dict] = {}
+    previous_level = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    loop = asyncio.new_event_loop()
+    scraper = _isolated_scraper()
+    try:
+        def parse_all():
+            scraper.cache = MemoryCache(max_size=MEMORY_CACHE_SIZE)
+            scraper._unsaved.clear()  # articles kept for save_articles
+            for _, url, html in fixtures:
+                loop.run_until_complete(scraper.parse_article(html, url))
+
+        results['parse_article'] = measure(parse_all, len(fixtures), warmup, repeat)
+        results['extract_articles'] = measure(
+            lambda: [extract_articles(html, url) for _, url, html in fixtures], len(fixtures), warmup, repeat)
+        for name in ('_extract_metadata', '_extract_author', '_extract_date', '_extract_category',
+                     '_extract_description', '_extract_full_content'):
+            helper = getattr(NewsScraperAsync, name)
+            results[name] = measure(lambda: [helper(e, backend) for e in elements], len(elements), warmup, repeat)
+        results['contains_keywords'] = measure(
+            lambda: [contains_keywords(text, KEYWORDS) for text in corpus], len(corpus), warmup, repeat)
+        def clear_date_caches():
+            _parse_tanggal.cache_clear()
+            _iso_tanggal.cache_clear()
+
+        results['parse_indo_date'] = measure(
+            lambda: [parse_indo_date(d) for d in dates], len(dates), warmup, repeat, clear_date_caches)
+        results['parse_indo_dates'] = measure(
+            lambda: parse_indo_dates(dates), len(dates), warmup, repeat, clear_date_caches)
+        results['parse_indo_date_cached'] = measure(
+            lambda: [parse_indo_date(d) for d in dates], len(dates), warmup, repeat)
+        results['clean_indo_text'] = measure(lambda: [clean_indo_text(t) for t in texts], len(texts), warmup, repeat)
+
+        def cache_adds():
+            cache = MemoryCache(max_size=len(articles))
+            for article in articles:
+                cache.add_article(article)
+
+        filled = MemoryCache(max_size=len(articles))
+        for article in articles:
+            filled.add_article(article)
+        results['MemoryCache.add_article'] = measure(cache_adds, len(articles), warmup, repeat)
+        results['MemoryCache.is_duplicate'] = measure(
+            lambda: [filled.is_duplicate(a) for a in probes], len(probes), warmup, repeat)
+    finally:
+        loop.close()
+        logging.disable(previous_level)
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'backend': PARSER_BACKEND, 'fixtures': [name for name, _, _ in fixtures],
+            'synthetic_fixtures': all(name.startswith('synthetic_') for name, _, _ in fixtures),
+            'blocks': len(elements), 'warmup': warmup, 'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def print_suite(report: Dict) -> None:
+    if report['meta'].get('synthetic_fixtures'):
+        print("No captured homepages found, timed on synthetic pages (run 'python benchmark.py capture')")
+    print(f"{'benchmark':28} {'calls':>6} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+    for name, stats in report['results'].items():
+        p99 = f"{stats['p99']:10.4f}" if stats.get('p99') is not None else f"{'-':>10}"
+        print(f"{name:28} {stats['calls']:6d} {stats['p50']:10.4f} {stats['p90']:10.4f} "
+              f"{p99} {stats['mean']:10.4f}")
+
+
+def compare_reports(before: Dict, after: Dict) -> None:
+    """p50 per-call change for every benchmark present in both reports"""
+    print(f"{'benchmark':28} {'before p50':>12} {'after p50':>12} {'change':>9}")
+    for name, stats in after['results'].items():
+        old = before['results'].get(name)
+        if old is None:
+            continue
+        change = (stats['p50'] - old['p50']) / old['p50'] * 100 if old['p50'] else 0.0
+        print(f"{name:28} {old['p50']:10.4f}ms {stats['p50']:10.4f}ms {change:+8.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the news scraper")
+    parser.add_argument('command', choices=['capture', 'parsers', 'extraction', 'keywords', 'dedup', 'bloom', 'near-duplicates', 'parquet', 'content', 'profiles', 'incremental', 'polling', 'locations', 'suite', 'compare'])
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="directory of captured homepages")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per measurement (suite: at least 10, 100+ for a p99)")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs before measuring (suite)")
+    parser.add_argument('--output', default='benchmark_results.json', help="suite report file")
+    parser.add_argument('--full', action='store_true',
+                        help="locations: also time the substring scan over the padded gazetteer (minutes)")
+    parser.add_argument('reports', nargs='*', help="compare: BEFORE.json AFTER.json")
+    args = parser.parse_args(argv)
+
+    if args.command == 'capture':
+        asyncio.run(capture_fixtures(args.fixtures))
+        return
+    if args.command == 'compare':
+        if len(args.reports) != 2:
+            parser.error("compare needs two report files")
+        with open(args.reports[0], 'r', encoding='utf-8') as f:
+            before = json.load(f)
+        with open(args.reports[1], 'r', encoding='utf-8') as f:
+            after = json.load(f)
+        compare_reports(before, after)
+        return
+
+    fixtures = load_fixtures(args.fixtures)
+    if args.command == 'parsers':
+        bench_parser_backends(fixtures, args.repeat)
+    elif args.command == 'extraction':
+        bench_single_pass(fixtures, args.repeat)
+    elif args.command == 'keywords':
+        bench_keywords(synthetic_corpus(), args.repeat)
+    elif args.command == 'dedup':
+        bench_dedup()
+    elif args.command == 'bloom':
+        bench_bloom()
+    elif args.command == 'near-duplicates':
+        bench_near_duplicates()
+    elif args.command == 'parquet':
+        bench_parquet()
+    elif args.command == 'content':
+        bench_content_extraction()
+    elif args.command == 'profiles':
+        bench_selector_profiles(load_fixtures(args.fixtures), args.repeat)
+    elif args.command == 'incremental':
+        bench_incremental(fixtures)
+    elif args.command == 'polling':
+        bench_polling()
+    elif args.command == 'locations':
+        bench_locations(repeat=args.repeat, full=args.full)
+    elif args.command == 'suite':
+        report = run_suite(fixtures, args.warmup, max(args.repeat, 10))
+        print_suite(report)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
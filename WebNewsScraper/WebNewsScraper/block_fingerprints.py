@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+from typing import AbstractSet, Dict, FrozenSet, List, Optional
+
+
+class BlockFingerprints:
+    """
+    Persistent per-source fingerprints of the article blocks parsed last cycle.
+
+    Fingerprints come from ParserBackend.fingerprints, a hash of each
+    candidate block's markup. extract_changed_articles skips metadata
+    extraction and keyword filtering for any block whose fingerprint is in
+    known(source); update() then replaces the source's set with every
+    fingerprint seen this cycle, so blocks that left the homepage are
+    forgotten and the file stays proportional to the number of teasers on
+    each homepage.
+    """
+
+    def __init__(self, path: Optional[str] = 'block_fingerprints.json'):
+        self.path = path
+        self.entries: Dict[str, FrozenSet[str]] = {}
+        self.stats = {'seen': 0, 'processed': 0}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = {source: frozenset(prints) for source, prints in json.load(f).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"Ignoring unreadable block fingerprints {self.path}: {e}")
+            self.entries = {}
+
+    def save(self, exclude: AbstractSet[str] = frozenset()) -> None:
+        """Write fingerprints to disk atomically, leaving out the sources in exclude (parsed in full after a restart)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({source: sorted(prints) for source, prints in self.entries.items() if source not in exclude}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save block fingerprints {self.path}: {e}")
+
+    def known(self, source: str) -> FrozenSet[str]:
+        return self.entries.get(source, frozenset())
+
+    def update(self, source: str, fingerprints: List[str], processed: int) -> None:
+        """Record the fingerprints of every block seen this cycle and how many were actually processed"""
+        self.entries[source] = frozenset(fingerprints)
+        self.stats['seen'] += len(fingerprints)
+        self.stats['processed'] += processed
+
+    def forget(self, source: str) -> None:
+        """Drop a source's fingerprints so its next pass processes every block"""
+        self.entries.pop(source, None)
+
+    def summary(self) -> str:
+        seen, processed = self.stats['seen'], self.stats['processed']
+        skipped = (seen - processed) / seen * 100 if seen else 0.0
+        return f"{processed} of {seen} blocks processed ({skipped:.1f}% unchanged and skipped)"
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
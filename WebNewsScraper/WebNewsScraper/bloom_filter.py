@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import time
+from typing import Iterable, Optional
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set answering "definitely new?" for byte keys.
+
+    Sized from the expected capacity and target false-positive rate, uses
+    double hashing over one BLAKE2b digest, and serializes to a single file.
+    Callers report confirmed false positives so the observed rate can be
+    compared with the target when sizing the filter, and positives for keys
+    that expired from the backing store since the filter was built, which
+    are stale rather than false.
+    """
+
+    MAGIC = b'BLM2'
+    _HEADER = struct.Struct('<4sQIQQdd')
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.built_at = time.time()
+        self.stats = {'checks': 0, 'negatives': 0, 'false_positives': 0, 'stale': 0}
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: bytes) -> None:
+        """Insert key; adding a key twice is harmless but counts twice"""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+        if self.count == self.capacity + 1:
+            logging.warning(
+                f"Bloom filter exceeded its capacity of {self.capacity} keys, "
+                f"false-positive rate will rise above {self.error_rate}"
+            )
+
+    def __contains__(self, key: bytes) -> bool:
+        """False means definitely not added; True means probably added"""
+        self.stats['checks'] += 1
+        for position in self._positions(key):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                self.stats['negatives'] += 1
+                return False
+        return True
+
+    def record_false_positive(self) -> None:
+        """Call when the backing store contradicts a positive answer"""
+        self.stats['false_positives'] += 1
+
+    def record_stale(self) -> None:
+        """Call for a positive answer on a key that was added but has since expired"""
+        self.stats['stale'] += 1
+
+    @property
+    def age(self) -> float:
+        """Seconds since the filter was built"""
+        return time.time() - self.built_at
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array"""
+        return len(self.bits)
+
+    @property
+    def observed_fp_rate(self) -> float:
+        """Share of genuinely new keys the filter wrongly reported as present"""
+        new_keys = self.stats['negatives'] + self.stats['false_positives']
+        return self.stats['false_positives'] / new_keys if new_keys else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.count} keys, {self.nbytes / 1e6:.1f}MB, {self.num_hashes} hashes, "
+            f"observed FP rate {self.observed_fp_rate:.4%} (target {self.error_rate:.4%}), "
+            f"{self.stats['stale']} expired keys hit, {self.stats['checks']} checks, "
+            f"built {self.age / 3600:.1f}h ago"
+        )
+
+    def save(self, path: str) -> None:
+        """Write the filter to path atomically"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(
+                self.MAGIC, self.num_bits, self.num_hashes, self.count, self.capacity, self.error_rate,
+                self.built_at
+            ))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BloomFilter']:
+        """Read a filter written by save(), or None if the file is missing or corrupt"""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls._HEADER.size)
+                magic, num_bits, num_hashes, count, capacity, error_rate, built_at = cls._HEADER.unpack(header)
+                if magic != cls.MAGIC:
+                    raise ValueError("bad magic")
+                bits = bytearray(f.read())
+        except (OSError, ValueError, struct.error) as e:
+            if os.path.exists(path):
+                logging.warning(f"Ignoring unreadable Bloom filter {path}: {e}")
+            return None
+
+        bloom = cls(capacity, error_rate)
+        if bloom.num_bits != num_bits or bloom.num_hashes != num_hashes or len(bits) != len(bloom.bits):
+            logging.warning(f"Ignoring Bloom filter {path} with inconsistent size")
+            return None
+        bloom.bits = bits
+        bloom.count = count
+        bloom.built_at = built_at
+        return bloom
+
+    @classmethod
+    def build(cls, capacity: int, error_rate: float, keys: Iterable[bytes] = ()) -> 'BloomFilter':
+        bloom = cls(capacity, error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    @classmethod
+    def open(cls, path: str, capacity: int, error_rate: float,
+             seed_keys: Optional[Iterable[bytes]] = None, max_age: Optional[float] = None) -> 'BloomFilter':
+        """
+        Load the filter at path if it was built with the same sizing less than
+        max_age seconds ago, otherwise build a new one from seed_keys (e.g.
+        every unexpired key of the dedup store) so it never answers "new" for
+        something already stored and drops keys that have expired since.
+        """
+        bloom = cls.load(path)
+        if (bloom is not None and bloom.capacity == capacity and bloom.error_rate == error_rate
+                and (max_age is None or bloom.age < max_age)):
+            return bloom
+
+        bloom = cls.build(capacity, error_rate, seed_keys or ())
+        logging.info(f"Built Bloom filter with {bloom.count} keys for {path}")
+        return bloom
@@ -0,0 +1,198 @@
+"""
+Per-domain circuit breaker for homepage and article fetches
+
+closed     requests flow; the last `window` outcomes are kept, and once at
+           least min_requests are in and the share of failures (errors,
+           blocked or rate-limited answers, responses slower than
+           slow_seconds) reaches error_rate the circuit opens
+open       every request is refused at no cost until the open period ends;
+           the period starts at open_seconds and doubles each time a probe
+           fails, up to max_open_seconds
+half_open  one probe request is let through: success closes the circuit,
+           failure opens it again; a probe that ends without an outcome
+           (cancelled, or out of time before it was sent) is released so
+           the next request can probe. allow() hands the probe a token and
+           only a result recorded with that token decides; requests that
+           were already in flight when the circuit opened are ignored
+
+Usage:
+    python circuit_breaker.py            # print the status report
+"""
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitBreaker:
+    """Circuit state per domain, persisted to path as JSON with wall-clock times"""
+
+    def __init__(self, path: Optional[str] = 'circuit_breaker.json', window: int = 20,
+                 min_requests: int = 4, error_rate: float = 0.5, slow_seconds: float = 20,
+                 open_seconds: float = 600, max_open_seconds: float = 6 * 3600,
+                 seed_open: Iterable[str] = ()):
+        self.path = path
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.entries: Dict[str, Dict] = {}
+        self._probing: Dict[str, Optional[int]] = {}  # domain -> token of the half-open probe in flight
+        self._tokens = itertools.count(1)
+        self.stats = {'refused': 0, 'opened': 0, 'closed': 0}
+        self.load()
+        # Seeds (formerly SKIP_SITES) start open unless their state is known
+        for domain in seed_open:
+            if domain not in self.entries:
+                self._open(self._entry(domain), time.time())
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable circuit breaker state {self.path}: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Write the state to disk atomically"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save circuit breaker state {self.path}: {e}")
+
+    def _entry(self, domain: str) -> Dict:
+        return self.entries.setdefault(domain, {
+            'state': CLOSED, 'results': [], 'open_until': 0.0, 'opens': 0,
+            'latency': None, 'last_error': None
+        })
+
+    def _open(self, entry: Dict, now: float) -> None:
+        period = min(self.open_seconds * 2 ** entry['opens'], self.max_open_seconds)
+        entry.update(state=OPEN, open_until=now + period, opens=entry['opens'] + 1, results=[])
+        self.stats['opened'] += 1
+
+    def state(self, domain: str) -> str:
+        return self.entries[domain]['state'] if domain in self.entries else CLOSED
+
+    def allow(self, domain: str, now: Optional[float] = None) -> Tuple[bool, Optional[int]]:
+        """
+        Whether a request to domain may go out now, and its probe token when
+        it is the one probe an expired open circuit lets through (else None)
+        """
+        entry = self.entries.get(domain)
+        if entry is None or entry['state'] == CLOSED:
+            return True, None
+        now = time.time() if now is None else now
+        if entry['state'] == OPEN and now >= entry['open_until']:
+            entry['state'] = HALF_OPEN
+            self._probing[domain] = None
+        if entry['state'] == HALF_OPEN and self._probing.get(domain) is None:
+            probe = self._probing[domain] = next(self._tokens)
+            logging.info(f"Circuit half-open for {domain}, sending a probe request")
+            return True, probe
+        self.stats['refused'] += 1
+        return False, None
+
+    def release(self, domain: str, probe: int) -> None:
+        """Give back a half-open probe that will not record an outcome"""
+        entry = self.entries.get(domain)
+        if entry is not None and entry['state'] == HALF_OPEN and self._probing.get(domain) == probe:
+            self._probing[domain] = None
+
+    def record(self, domain: str, ok: bool, latency: Optional[float] = None,
+               error: Optional[str] = None, now: Optional[float] = None, probe: Optional[int] = None) -> None:
+        """
+        Record one request outcome; a response slower than slow_seconds counts
+        as a failure. While half-open only the result carrying the probe token
+        from allow() counts.
+        """
+        now = time.time() if now is None else now
+        entry = self._entry(domain)
+        if latency is not None:
+            entry['latency'] = latency if entry['latency'] is None else 0.8 * entry['latency'] + 0.2 * latency
+            if ok and latency > self.slow_seconds:
+                ok, error = False, f"slow response ({latency:.1f}s)"
+        if not ok:
+            entry['last_error'] = error
+
+        if entry['state'] == HALF_OPEN:
+            if probe is None or self._probing.get(domain) != probe:
+                return  # a request that started before the circuit opened
+            self._probing[domain] = None
+            if ok:
+                entry.update(state=CLOSED, opens=0, results=[])
+                self.stats['closed'] += 1
+                logging.info(f"Circuit closed for {domain}, probe succeeded")
+            else:
+                self._open(entry, now)
+                logging.warning(f"Circuit re-opened for {domain} until "
+                                f"{time.strftime('%H:%M:%S', time.localtime(entry['open_until']))}: {error}")
+            return
+        if entry['state'] == OPEN:
+            return  # a request that started before the circuit opened
+
+        results = entry['results'] = (entry['results'] + [1 if ok else 0])[-self.window:]
+        failures = results.count(0)
+        if not ok and len(results) >= self.min_requests and failures / len(results) >= self.error_rate:
+            self._open(entry, now)
+            logging.warning(f"Circuit opened for {domain} after {failures}/{len(results)} failures: {error}")
+
+    def report(self, now: Optional[float] = None) -> List[str]:
+        """One line per domain that is not healthy and closed, worst first"""
+        now = time.time() if now is None else now
+        lines = []
+        order = {OPEN: 0, HALF_OPEN: 1, CLOSED: 2}
+        for domain, entry in sorted(self.entries.items(), key=lambda item: (order[item[1]['state']], item[0])):
+            results = entry['results']
+            failures = results.count(0)
+            if entry['state'] == CLOSED and not failures:
+                continue
+            line = f"{domain:<32} {entry['state']:<9}"
+            if entry['state'] == OPEN:
+                line += f" retry in {max(0.0, entry['open_until'] - now) / 60:5.1f}m, opened {entry['opens']}x"
+            else:
+                line += f" {failures}/{len(results)} recent failures"
+            if entry['latency'] is not None:
+                line += f", latency {entry['latency']:.1f}s"
+            if entry['last_error']:
+                line += f", last error: {entry['last_error']}"
+            lines.append(line)
+        return lines
+
+    def summary(self) -> str:
+        states = [entry['state'] for entry in self.entries.values()]
+        return (
+            f"{states.count(OPEN)} open, {states.count(HALF_OPEN)} half-open, {states.count(CLOSED)} closed; "
+            f"{self.stats['refused']} requests refused, {self.stats['opened']} opened, {self.stats['closed']} closed"
+        )
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
+
+
+def main():
+    from config import CIRCUIT_BREAKER_FILE
+
+    breaker = CircuitBreaker(CIRCUIT_BREAKER_FILE)
+    print(breaker.summary())
+    for line in breaker.report():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
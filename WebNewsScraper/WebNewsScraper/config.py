@@ -80,13 +80,29 @@ KEYWORDS: List[str] = [
     "bencana"
 ]
 
+# Match keywords only as whole words ("politik" but not "politikus")
+KEYWORD_WORD_BOUNDARY = False
+
+# Per-domain selector profiles: exact container and title selectors used
+# instead of the generic class-substring scan. Declared profiles take
+# precedence over learned ones, e.g.
+# {'www.kompas.com': {'containers': ['div.latest__item'], 'titles': ['h3.latest__title']}}
+SELECTOR_PROFILES: Dict[str, Dict[str, List[str]]] = {}
+SELECTOR_PROFILES_FILE = 'selector_profiles.json'  # learned profiles, None = learn in memory only
+PROFILE_REFRESH_CYCLES = 12  # re-run the generic pass after this many profiled passes
+
+# Incremental homepage parsing: skip article blocks whose HTML is unchanged
+# since the previous cycle of the same source
+INCREMENTAL_PARSING = True
+BLOCK_FINGERPRINT_FILE = 'block_fingerprints.json'  # None = keep fingerprints in memory only
+
 # Updated Request Configuration with more sophisticated headers
 REQUEST_HEADERS: List[Dict[str, str]] = [
     {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Encoding": "gzip, deflate",
+        "Accept-Encoding": "gzip, deflate, br",
         "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1",
         "Cache-Control": "max-age=0",
@@ -99,7 +115,7 @@ REQUEST_HEADERS: List[Dict[str, str]] = [
         "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8",
-        "Accept-Encoding": "gzip, deflate",
+        "Accept-Encoding": "gzip, deflate, br",
         "Connection": "keep-alive",
         "Sec-Fetch-Dest": "document",
         "Sec-Fetch-Mode": "navigate",
@@ -133,12 +149,83 @@ SITE_SPECIFIC_HEADERS = {
 # Scraping Configuration with increased delays and backoff
 RATE_LIMIT_DELAY = 15  # increased base delay between requests
 MAX_RETRIES = 3  # reduced max retries to fail faster
-REQUEST_TIMEOUT = 30
+REQUEST_TIMEOUT = 30  # per attempt
+REQUEST_DEADLINE = 120  # one URL's attempts and backoff waits together
+CYCLE_TIME_BUDGET = 240  # homepage fetching per cycle; sources not reached wait for the next one, None = no limit
 MEMORY_CACHE_SIZE = 1000
+DEDUP_STORE_FILE = 'dedup.sqlite3'  # persistent dedup index, None = in-memory MemoryCache
+DEDUP_TTL_DAYS = 14  # forget articles not seen on any homepage for this many days
+BLOOM_FILTER_FILE = 'dedup.bloom'  # Bloom filter checked before the dedup store, None = off; needs DEDUP_STORE_FILE
+BLOOM_CAPACITY = 1_000_000  # expected number of historical articles
+BLOOM_ERROR_RATE = 0.001  # target false-positive rate
+BLOOM_REBUILD_HOURS = 24  # rebuild from the dedup store this often to drop expired keys
+NEAR_DUPLICATE_THRESHOLD = 0.6  # estimated Jaccard similarity at which articles count as the same story
+NEAR_DUPLICATE_INDEX_SIZE = 100_000  # recent articles kept for story clustering
+
+# Output
+OUTPUT_MODE = 'ndjson'  # 'ndjson' streams each article as it is found, 'json' writes one snapshot per cycle
+OUTPUT_DIR = '.'
+NDJSON_MAX_BYTES = 64 * 1024 * 1024  # start a new file after this many (uncompressed) bytes
+NDJSON_ROTATE_SECONDS = 3600  # or after this long
+NDJSON_COMPRESS = False  # gzip the NDJSON files
+ARTICLE_STORE_FILE = 'articles.sqlite3'  # queryable SQLite/FTS5 copy of every article, None = off
+PARQUET_EXPORT_DIR = None  # e.g. 'articles_parquet' to append each cycle to a Parquet dataset (needs the parquet extra: pip install .[parquet])
 BASE_RETRY_DELAY = 10  # increased base delay for exponential backoff
 MAX_RETRY_DELAY = 60  # reduced maximum delay between retries
 
-# List of temporarily problematic sites
+# Scheduler Configuration
+MAX_CONCURRENT_REQUESTS = 10  # global cap on sources scraped at the same time
+PER_HOST_CONCURRENCY = 1  # simultaneous requests allowed to a single host
+PER_HOST_DELAY = RATE_LIMIT_DELAY  # minimum gap between request starts on one host
+FETCH_FULL_ARTICLES = False  # fetch each new article's page in the background to fill full_content
+ARTICLE_FETCH_WORKERS = 4  # concurrent full-article fetches (host limits still apply)
+ARTICLE_QUEUE_SIZE = 500  # articles queued or in flight before new ones are dropped
+
+# Shared HTTP connection pool (http_client.create_session)
+HTTP_POOL_SIZE = 100  # open connections across all hosts
+HTTP_POOL_PER_HOST = 4  # homepage poll plus full-article fetches on one host
+DNS_CACHE_TTL = 300  # seconds a resolved host is reused
+KEEPALIVE_TIMEOUT = 75  # idle seconds before a pooled connection is closed; must exceed PER_HOST_DELAY
+
+# Prometheus text endpoint served from main() at http://METRICS_HOST:METRICS_PORT/metrics
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108  # None = no endpoint
+
+# Tracing and profiling (tracing.py)
+TRACE_DIR = None  # e.g. 'traces' to write a Chrome trace of every cycle (chrome://tracing, Perfetto)
+PROFILER = 'cprofile'  # or 'pyinstrument' (sampling, if installed); NEWS_SCRAPER_PROFILE=1 or SIGUSR1 profiles a cycle
+
+# Conditional GET cache for homepage polling
+HTTP_CACHE_FILE = 'http_cache.json'
+
+# Adaptive homepage polling: each source's interval follows its rate of new
+# articles within these bounds; False polls every source every POLL_DEFAULT_INTERVAL
+ADAPTIVE_POLLING = True
+POLL_SCHEDULE_FILE = 'poll_schedule.json'
+POLL_MIN_INTERVAL = 60
+POLL_MAX_INTERVAL = 3600
+POLL_DEFAULT_INTERVAL = 300  # also the starting interval of a new source
+POLL_TARGET_ARTICLES = 1.0  # new articles a poll should find on average
+
+# Where homepage HTML is parsed: 'inline' (event loop), 'thread' or 'process'
+PARSE_EXECUTOR_MODE = 'process'
+PARSE_WORKERS = None  # None = one worker per CPU core
+
+# HTML parser backend: 'bs4' (html.parser), 'bs4-lxml' or 'lxml' (native, fastest). lxml repairs
+# malformed markup differently from html.parser: switch only once 'python benchmark.py extraction'
+# reports identical output on pages captured with 'python benchmark.py capture'
+PARSER_BACKEND = 'bs4'
+
+# Per-domain circuit breaker (python circuit_breaker.py prints its status)
+CIRCUIT_BREAKER_FILE = 'circuit_breaker.json'  # None = keep state in memory only
+BREAKER_WINDOW = 20  # recent requests per domain the error rate is computed over
+BREAKER_MIN_REQUESTS = 4  # requests in the window before the circuit may open
+BREAKER_ERROR_RATE = 0.5  # failure share that opens the circuit
+BREAKER_SLOW_SECONDS = 20  # responses slower than this count as failures
+BREAKER_OPEN_SECONDS = 600  # first open period; doubles after every failed probe
+BREAKER_MAX_OPEN_SECONDS = 6 * 3600
+
+# Known problematic sites: their circuits start open, then get probed like any other
 SKIP_SITES = [
     "www.indopos.co.id",
     "www.pontianakpost.com"
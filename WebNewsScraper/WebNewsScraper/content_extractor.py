@@ -0,0 +1,124 @@
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import trafilatura
+except ImportError:  # trafilatura is optional, the selector and density strategies always work
+    trafilatura = None
+
+from id_helpers import clean_indo_text
+from parser_backends import ParserBackend
+
+# Default order: trafilatura is the most accurate, selectors the cheapest
+# once known to work for a site, density the last resort
+STRATEGIES = ('trafilatura', 'selectors', 'density')
+MIN_BODY_CHARS = 120
+
+# (strategy that produced the body or None, {strategy: (seconds, succeeded)})
+StrategyTimings = Dict[str, Tuple[float, bool]]
+
+
+def trafilatura_body(html: str, url: Optional[str] = None) -> Optional[str]:
+    """Main text via trafilatura's fast mode (no fallback extractors)"""
+    if trafilatura is None:
+        return None
+    return trafilatura.extract(html, url=url, fast=True, include_comments=False, include_tables=False)
+
+
+def density_body(root, backend: ParserBackend, min_paragraph_chars: int = 40,
+                 max_link_ratio: float = 0.5) -> Optional[str]:
+    """
+    Text-density fallback: score each element by the text of the substantial,
+    mostly non-link paragraphs directly inside it and return the paragraphs
+    of the best scoring one.
+    """
+    scores: Dict[int, int] = {}
+    paragraphs: Dict[int, List[str]] = {}
+    for paragraph in backend.find_all(root, ['p']):
+        text = clean_indo_text(backend.get_text(paragraph))
+        if len(text) < min_paragraph_chars:
+            continue
+        link_chars = sum(len(backend.get_text(link)) for link in backend.find_all(paragraph, ['a']))
+        if link_chars > max_link_ratio * len(text):
+            continue
+        container = backend.parent(paragraph)
+        if container is None:
+            continue
+        key = id(container)
+        scores[key] = scores.get(key, 0) + len(text)
+        paragraphs.setdefault(key, []).append(text)
+
+    if not scores:
+        return None
+    best = max(scores, key=scores.get)
+    return '\n'.join(paragraphs[best])
+
+
+def run_strategies(order: Sequence[str], strategies: Dict[str, Callable[[], Optional[str]]],
+                   min_chars: int = MIN_BODY_CHARS) -> Tuple[Optional[str], Optional[str], StrategyTimings]:
+    """
+    Try strategies in order until one returns at least min_chars of text.
+
+    Returns (body, winning strategy, timings). Kept free of state so it can
+    run in a parse worker process; ContentExtractor records the outcome.
+    """
+    timings: StrategyTimings = {}
+    for name in order:
+        start = time.perf_counter()
+        try:
+            body = strategies[name]()
+        except Exception as e:
+            logging.warning(f"Content strategy {name} failed: {e}")
+            body = None
+        ok = bool(body) and len(body.strip()) >= min_chars
+        timings[name] = (time.perf_counter() - start, ok)
+        if ok:
+            return body.strip(), name, timings
+    return None, None, timings
+
+
+class ContentExtractor:
+    """
+    Chooses the strategy order per domain and keeps per-strategy statistics.
+
+    Once a strategy has produced a body for a domain, later pages from that
+    domain start with it and skip the strategies ahead of it that failed; if
+    it stops working the remaining strategies are tried and, when they all
+    fail, the domain goes back to the full chain.
+    """
+
+    def __init__(self, strategies: Sequence[str] = STRATEGIES):
+        self.strategies = tuple(s for s in strategies if s != 'trafilatura' or trafilatura is not None)
+        self.winners: Dict[str, str] = {}
+        self.stats = {name: {'attempts': 0, 'successes': 0, 'seconds': 0.0} for name in self.strategies}
+
+    def order_for(self, domain: str) -> Tuple[str, ...]:
+        winner = self.winners.get(domain)
+        if winner not in self.strategies:
+            return self.strategies
+        return self.strategies[self.strategies.index(winner):]
+
+    def record(self, domain: str, winner: Optional[str], timings: StrategyTimings) -> None:
+        for name, (seconds, ok) in timings.items():
+            stats = self.stats.setdefault(name, {'attempts': 0, 'successes': 0, 'seconds': 0.0})
+            stats['attempts'] += 1
+            stats['successes'] += ok
+            stats['seconds'] += seconds
+        if winner:
+            self.winners[domain] = winner
+        else:
+            self.winners.pop(domain, None)
+
+    def summary(self) -> str:
+        parts = []
+        for name, stats in self.stats.items():
+            if stats['attempts']:
+                parts.append(
+                    f"{name} {stats['successes']}/{stats['attempts']} ok, "
+                    f"{stats['seconds'] / stats['attempts'] * 1000:.1f}ms avg"
+                )
+        winners: Dict[str, int] = {}
+        for name in self.winners.values():
+            winners[name] = winners.get(name, 0) + 1
+        return f"{'; '.join(parts) or 'no pages yet'}; domains per strategy {winners}"
@@ -0,0 +1,108 @@
+import hashlib
+import logging
+import sqlite3
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class PersistentDedupStore:
+    """
+    SQLite-backed replacement for MemoryCache that survives restarts.
+
+    Keys are the 16-byte MD5 of title + URL in a WITHOUT ROWID primary-key
+    table, so a lookup is a single B-tree probe, startup loads nothing, and
+    memory stays at the configured page cache no matter how many keys are
+    stored. Entries expire ttl_seconds after they were last added or
+    touched, i.e. once an article has not been seen for that long.
+
+    before_commit, when set, runs right before every commit, e.g. to save a
+    Bloom filter of the keys so it never lags behind what is on disk.
+    """
+
+    def __init__(self, path: str = 'dedup.sqlite3', ttl_seconds: int = 14 * 86400,
+                 cache_kib: int = 8192, commit_every: int = 500):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.commit_every = commit_every
+        self.before_commit: Optional[Callable[[], None]] = None
+        self._pending = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key BLOB PRIMARY KEY,"
+            " expires_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_expires_at ON seen(expires_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def _generate_key(article: Dict) -> bytes:
+        """Binary form of MemoryCache._generate_hash"""
+        return hashlib.md5(f"{article['title']}{article['url']}".encode('utf-8')).digest()
+
+    def is_duplicate(self, article: Dict) -> bool:
+        """Check if article was seen and has not expired"""
+        row = self.conn.execute(
+            "SELECT 1 FROM seen WHERE key = ? AND expires_at > ?",
+            (self._generate_key(article), int(time.time()))
+        ).fetchone()
+        return row is not None
+
+    def add_article(self, article: Dict) -> None:
+        """Record article, refreshing its expiry if it was already stored"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO seen (key, expires_at) VALUES (?, ?)",
+            (self._generate_key(article), int(time.time()) + self.ttl_seconds)
+        )
+        self._count_write()
+
+    def touch(self, article: Dict) -> None:
+        """Push back the expiry of an article seen again"""
+        self.conn.execute(
+            "UPDATE seen SET expires_at = ? WHERE key = ?",
+            (int(time.time()) + self.ttl_seconds, self._generate_key(article))
+        )
+        self._count_write()
+
+    def _count_write(self) -> None:
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        if self.before_commit is not None:
+            self.before_commit()
+        self.conn.commit()
+        self._pending = 0
+
+    def expire(self, now: Optional[float] = None) -> List[bytes]:
+        """Delete expired keys and return them"""
+        cutoff = int(now or time.time())
+        keys = [key for (key,) in self.conn.execute("SELECT key FROM seen WHERE expires_at <= ?", (cutoff,))]
+        self.conn.execute("DELETE FROM seen WHERE expires_at <= ?", (cutoff,))
+        self.commit()
+        return keys
+
+    def flush(self) -> List[bytes]:
+        """Commit pending keys and drop expired ones; returns the expired keys"""
+        removed = self.expire()
+        if removed:
+            logging.info(f"Dedup store expired {len(removed)} keys")
+        return removed
+
+    def iter_keys(self) -> Iterator[bytes]:
+        """Every unexpired key, e.g. to seed a Bloom filter"""
+        for (key,) in self.conn.execute("SELECT key FROM seen WHERE expires_at > ?", (int(time.time()),)):
+            yield key
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
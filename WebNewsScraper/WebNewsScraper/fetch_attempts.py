@@ -0,0 +1,88 @@
+import random
+import time
+from collections import OrderedDict, deque
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+# How a fetch_page call ended
+OUTCOMES = ('ok', 'not_modified', 'failed', 'max_retries', 'deadline', 'budget', 'circuit_open')
+
+
+class Attempt(NamedTuple):
+    """One HTTP request made by fetch_page"""
+    status: Optional[int]  # None when no response arrived
+    error: Optional[str]
+    seconds: float
+    wait: float  # backoff slept before the next attempt, 0 for the last one
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Exponential backoff for the given 0-based attempt with +-50% jitter"""
+    return min(base * (2 ** attempt), maximum) * random.uniform(0.5, 1.5)
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as delta-seconds or an HTTP-date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class AttemptLog:
+    """
+    Attempt history of the last `history` fetch_page calls per URL, plus
+    totals since the last reset_stats() for the cycle log and metrics.
+
+    Article URLs are fetched once and never again, so only the `max_urls`
+    most recently fetched URLs keep their history; the totals cover all.
+    """
+
+    def __init__(self, history: int = 10, max_urls: int = 2000):
+        self.history = history
+        self.max_urls = max_urls
+        self.requests: 'OrderedDict[str, Deque[Dict]]' = OrderedDict()
+        self.stats = {'requests': 0, 'attempts': 0, 'retries': 0, 'wait_seconds': 0.0}
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+
+    def record(self, url: str, outcome: str, attempts: List[Attempt]) -> None:
+        history = self.requests.get(url)
+        if history is None:
+            history = self.requests[url] = deque(maxlen=self.history)
+            if len(self.requests) > self.max_urls:
+                self.requests.popitem(last=False)
+        else:
+            self.requests.move_to_end(url)
+        history.append({'at': time.time(), 'outcome': outcome, 'attempts': attempts})
+        self.stats['requests'] += 1
+        self.stats['attempts'] += len(attempts)
+        self.stats['retries'] += max(0, len(attempts) - 1)
+        self.stats['wait_seconds'] += sum(attempt.wait for attempt in attempts)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def last_outcome(self, url: str) -> Optional[str]:
+        requests = self.requests.get(url)
+        return requests[-1]['outcome'] if requests else None
+
+    def summary(self) -> str:
+        outcomes = ', '.join(f"{count} {outcome}" for outcome, count in self.outcomes.items() if count)
+        return (
+            f"{self.stats['requests']} requests in {self.stats['attempts']} attempts "
+            f"({self.stats['retries']} retries, {self.stats['wait_seconds']:.0f}s backing off): {outcomes or 'none'}"
+        )
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
+        for key in self.outcomes:
+            self.outcomes[key] = 0
@@ -0,0 +1,225 @@
+"""
+Gazetteer of Indonesian administrative regions for locating articles
+
+Regions are read from a CSV of Kemendagri region codes (data/wilayah.csv):
+kode,nama[,alias] rows where the code's depth gives the level, 32 is a
+province, 32.75 a kabupaten/kota and 32.75.01 a kecamatan, and alias holds
+extra spellings separated by ';'. The shipped file lists the 38 provinces
+and all 514 kabupaten/kota, with common abbreviations and, where it is not
+the regency's own name, the seat of a kabupaten ("Timika", "Labuan Bajo")
+as aliases, since datelines name towns. Kecamatan rows in the same format
+can be appended as is.
+
+Names are compiled into a word-level trie. A text is matched in one pass:
+a regex finds the runs of capitalised words, and the trie takes the longest
+name at each token inside them. A match must end on a capitalised word, so
+"batu" or "padang" in running text is not a place.
+"""
+import csv
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'wilayah.csv')
+
+_TOKEN = re.compile(r'\w+')
+# Runs of capitalised words, optionally after a lowercase region-type word
+# ("kota Bekasi"): every name the trie can match lies inside one, so the
+# regex engine skips the lowercase bulk of a text before any Python runs
+_RUN = re.compile(r'(?:\b(?:kota|kabupaten|kab|provinsi|prov|kecamatan|kec)\.?\s+)?\b[A-Z]\w*(?:\.?[ \t]+[A-Z]\w*)*')
+# The lead-in of a dateline: "JAKARTA, KOMPAS.com -", "Bekasi (ANTARA) -", "BANDUNG -"
+_DATELINE = re.compile(r'^\s*([^,(\-–—|:]{2,50}?)\s*(?:,|\(|\s[-–—|:]\s)')
+# Leading words that only say what kind of region a name is
+_PREFIXES = (
+    (('kota', 'administrasi'), ('kota',)),
+    (('kabupaten', 'administrasi'), ('kabupaten', 'kab')),
+    (('kabupaten',), ('kabupaten', 'kab')),
+    (('kota',), ('kota',)),
+    (('kecamatan',), ('kecamatan', 'kec')),
+)
+_END = ''  # trie key holding the region reached at a node
+_PHRASE = ' '  # trie key marking a _PREFIX_ONLY phrase, which covers its words without naming a place
+# Bare names that are also everyday words ("batu" is stone, "padang" field):
+# capitalised at the start of a sentence they are not taken as places
+_COMMON_WORDS = frozenset({
+    'batu', 'padang', 'palu', 'serang', 'batang', 'kudus', 'malang', 'badung', 'lebak', 'pati', 'banjar',
+    'solo', 'bangli', 'sampang', 'buru', 'borong', 'landak',
+})
+# Bare names that are everyday phrases anywhere in a sentence ("Polda Metro
+# Jaya", "kawasan Puncak", "Batu Bara" for coal): only matched with their
+# region-type word, e.g. "Kota Metro" or "Kabupaten Puncak", and otherwise
+# keep a shorter name inside them ("Batu") from matching
+_PREFIX_ONLY = frozenset({('metro',), ('puncak',), ('batu', 'bara')})
+_SENTENCE_END = '.!?-–—:;"\''
+
+
+class Region(NamedTuple):
+    code: str  # Kemendagri code, e.g. '32.75'
+    name: str  # official name, e.g. 'Kota Bekasi'
+
+    @property
+    def level(self) -> str:
+        return ('provinsi', 'kabupaten/kota', 'kecamatan', 'desa')[min(self.code.count('.'), 3)]
+
+    @property
+    def province(self) -> str:
+        return self.code.split('.', 1)[0]
+
+
+class Place(NamedTuple):
+    """A region named in a text, with the character span of the name"""
+    region: Region
+    start: int
+    end: int
+
+
+def _rank(region: Region) -> Tuple[int, str]:
+    """Which region a bare shared name means: the city, then the regency, then the province"""
+    parts = region.code.split('.')
+    if len(parts) == 2:
+        return (0 if int(parts[1]) >= 71 else 1), region.code
+    return (2 if len(parts) == 1 else 3), region.code
+
+
+class Gazetteer:
+    """Word-level trie from region names and aliases to regions"""
+
+    def __init__(self, regions: Iterable[Tuple[str, str, Iterable[str]]]):
+        self.regions: Dict[str, Region] = {}
+        self._trie: Dict = {}
+        self.max_words = 0
+        for code, name, aliases in regions:
+            region = self.regions[code] = Region(code, name)
+            for key in self._keys(name, aliases, top_level='.' not in code):
+                self._insert(key, region)
+        for key in _PREFIX_ONLY:
+            node = self._trie
+            for word in key:
+                node = node.setdefault(word, {})
+            node[_PHRASE] = True
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_GAZETTEER) -> 'Gazetteer':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = [
+                (row['kode'].strip(), row['nama'].strip(), (row.get('alias') or '').split(';'))
+                for row in csv.DictReader(f) if row.get('kode') and row.get('nama')
+            ]
+        return cls(rows)
+
+    @staticmethod
+    def _keys(name: str, aliases: Iterable[str], top_level: bool) -> List[Tuple[str, ...]]:
+        words = tuple(_TOKEN.findall(name.lower()))
+        keys = [words]
+        for prefix, spellings in _PREFIXES:
+            if words[:len(prefix)] == prefix and len(words) > len(prefix):
+                base = words[len(prefix):]
+                if base not in _PREFIX_ONLY:
+                    keys.append(base)
+                keys.extend((spelling,) + base for spelling in spellings)
+                break
+        if top_level:
+            keys.extend([('provinsi',) + words, ('prov',) + words])
+        keys.extend(tuple(_TOKEN.findall(alias.lower())) for alias in aliases if alias.strip())
+        return keys
+
+    def _insert(self, key: Tuple[str, ...], region: Region) -> None:
+        node = self._trie
+        for word in key:
+            node = node.setdefault(word, {})
+        current = node.get(_END)
+        if current is None or _rank(region) < _rank(current):
+            node[_END] = region
+        self.max_words = max(self.max_words, len(key))
+
+    def find(self, text: str, dateline: bool = False) -> List[Place]:
+        """
+        Every region named in text, left to right, longest name first at each
+        position. dateline=True accepts everyday-word names at the start too.
+        """
+        places = []
+        if not text:
+            return places
+        for run in _RUN.finditer(text):
+            self._scan(text, list(_TOKEN.finditer(text, run.start(), run.end())), places, dateline)
+        return places
+
+    def _scan(self, text: str, matches: List[re.Match], places: List[Place], dateline: bool) -> None:
+        words = [match.group().lower() for match in matches]
+        trie = self._trie
+        i = 0
+        while i < len(matches):
+            node = trie.get(words[i])
+            if node is None:
+                i += 1
+                continue
+            found, found_end = None, i
+            j = i
+            while node is not None:
+                region = node.get(_END)
+                # The place name itself must be capitalised (prefixes like "kota" need not be)
+                if text[matches[j].start()].isupper():
+                    if region is not None:
+                        found, found_end = region, j
+                    elif _PHRASE in node:
+                        found, found_end = None, j
+                j += 1
+                if j == len(matches) or j - i >= self.max_words:
+                    break
+                node = node.get(words[j])
+            if found is None or (not dateline and found_end == i and words[i] in _COMMON_WORDS
+                                 and self._starts_sentence(text, matches[i].start())):
+                i = found_end + 1
+                continue
+            places.append(Place(found, matches[i].start(), matches[found_end].end()))
+            i = found_end + 1
+
+    @staticmethod
+    def _starts_sentence(text: str, start: int) -> bool:
+        k = start - 1
+        while k >= 0 and text[k].isspace():
+            k -= 1
+        return k < 0 or text[k] in _SENTENCE_END
+
+    def dateline(self, text: str) -> Optional[Place]:
+        """The region a dateline opening the text names, e.g. "JAKARTA, KOMPAS.com - ..." """
+        match = _DATELINE.match(text or '')
+        if not match:
+            return None
+        lead = match.group(1)
+        places = self.find(lead, dateline=True)
+        # The whole lead-in must be the name: "Pemerintah Kota Bekasi, ..." is no dateline
+        if len(places) == 1 and places[0].start == 0 and places[0].end == len(lead):
+            return places[0]
+        return None
+
+    def locate(self, text: str, *more: Optional[str]) -> Tuple[Optional[Region], List[str]]:
+        """
+        (dateline region of text, codes of every region named in text and
+        more), codes unique and in order with the dateline's first
+        """
+        place = self.dateline(text)
+        codes = [place.region.code] if place is not None else []
+        seen = set(codes)
+        for part in (text,) + more:
+            for found in self.find(part or ''):
+                if found.region.code not in seen:
+                    seen.add(found.region.code)
+                    codes.append(found.region.code)
+        return (place.region if place is not None else None), codes
+
+
+_default: Optional[Gazetteer] = None
+
+
+def default_gazetteer() -> Gazetteer:
+    """The shipped gazetteer, loaded once per process (an empty one if the file is missing)"""
+    global _default
+    if _default is None:
+        try:
+            _default = Gazetteer.load()
+        except OSError as e:
+            logging.error(f"Gazetteer {DEFAULT_GAZETTEER} not loaded, locations disabled: {e}")
+            _default = Gazetteer([])
+    return _default
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+import os
+from typing import AbstractSet, Dict, Mapping
+
+# Returned by fetch_page when a revalidated page has not changed: falsy like a
+# failed fetch, but distinguishable from None
+NOT_MODIFIED = ""
+
+
+class HttpCache:
+    """Persistent ETag/Last-Modified and body-hash store for conditional GETs"""
+
+    def __init__(self, path: str = "http_cache.json"):
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'misses': 0}
+        self.load()
+
+    def load(self) -> None:
+        """Load cached validators from disk if the cache file exists"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable HTTP cache {self.path}: {e}")
+            self.entries = {}
+
+    def save(self, exclude: AbstractSet[str] = frozenset()) -> None:
+        """
+        Write validators to disk atomically. URLs in exclude are left out, so
+        after a restart they are fetched unconditionally and parsed again,
+        e.g. while articles found on them have not been written out yet.
+        """
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({url: entry for url, entry in self.entries.items() if url not in exclude}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save HTTP cache {self.path}: {e}")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached URL"""
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self, url: str) -> None:
+        """Count a 304 response"""
+        self.stats['not_modified'] += 1
+
+    def store(self, url: str, headers: Mapping[str, str], body: str) -> bool:
+        """
+        Store validators and body hash for a 200 response.
+
+        Returns False when the body is identical to the cached one, so the
+        caller can skip parsing it again.
+        """
+        body_hash = hashlib.sha1(body.encode('utf-8', 'replace')).hexdigest()
+        previous = self.entries.get(url, {})
+        self.entries[url] = {
+            'etag': headers.get('ETag', ''),
+            'last_modified': headers.get('Last-Modified', ''),
+            'body_hash': body_hash
+        }
+        if previous.get('body_hash') == body_hash:
+            self.stats['unchanged'] += 1
+            return False
+        self.stats['misses'] += 1
+        return True
+
+    @property
+    def hits(self) -> int:
+        return self.stats['not_modified'] + self.stats['unchanged']
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
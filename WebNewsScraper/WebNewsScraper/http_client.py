@@ -0,0 +1,139 @@
+"""
+Shared aiohttp session factory for the scrapers
+
+Sessions come with a tuned TCPConnector (pool size, per-host limit, DNS
+cache, keep-alive), no default headers (each request passes its own, so
+concurrent tasks never race on shared session state) and automatic
+decompression turned off: read_body decodes gzip, deflate and brotli
+itself so the compressed bytes on the wire can be counted. HttpStats,
+filled by a trace config and read_body, reports connection reuse.
+
+Kept free of config imports so either scraper can use it with its own
+logging setup; callers pass their settings in.
+"""
+import zlib
+from typing import Dict, Optional, Sequence
+
+import aiohttp
+from aiohttp.abc import AbstractCookieJar
+
+try:
+    import brotli
+except ImportError:  # without brotli only gzip and deflate are negotiated
+    brotli = None
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
+
+class HttpStats:
+    """Requests, connections opened vs reused, and body bytes on the wire vs decoded"""
+
+    def __init__(self):
+        self.stats = {'requests': 0, 'new_connections': 0, 'reused_connections': 0,
+                      'wire_bytes': 0, 'decoded_bytes': 0}
+        self.encodings: Dict[str, int] = {}
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.stats['requests'] += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.stats['new_connections'] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats['reused_connections'] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    @property
+    def reuse_ratio(self) -> float:
+        connections = self.stats['new_connections'] + self.stats['reused_connections']
+        return self.stats['reused_connections'] / connections if connections else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded bytes per byte on the wire"""
+        return self.stats['decoded_bytes'] / self.stats['wire_bytes'] if self.stats['wire_bytes'] else 0.0
+
+    def summary(self) -> str:
+        encodings = ', '.join(f"{name} {count}" for name, count in sorted(self.encodings.items()))
+        return (
+            f"{self.stats['requests']} requests, connection reuse {self.reuse_ratio:.0%} "
+            f"({self.stats['new_connections']} opened), {self.stats['wire_bytes'] / 1048576:.1f}MB on the wire "
+            f"for {self.stats['decoded_bytes'] / 1048576:.1f}MB decoded ({encodings or 'no bodies'})"
+        )
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
+        self.encodings.clear()
+
+
+def create_session(stats: Optional[HttpStats] = None, pool_size: int = 100, per_host: int = 4,
+                   dns_cache_ttl: int = 300, keepalive_timeout: float = 75, timeout: float = 30,
+                   cookie_jar: Optional[AbstractCookieJar] = None,
+                   trace_configs: Sequence[aiohttp.TraceConfig] = ()) -> aiohttp.ClientSession:
+    """
+    ClientSession on a tuned connector. keepalive_timeout must outlast the
+    gap between requests to one host (the politeness delay), otherwise every
+    request opens a new connection.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=cookie_jar,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        auto_decompress=False,
+        trace_configs=([stats.trace_config()] if stats is not None else []) + list(trace_configs) or None,
+    )
+
+
+def request_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Copy of headers advertising exactly the encodings read_body can decode"""
+    return {**headers, 'Accept-Encoding': ACCEPT_ENCODING}
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(data)
+        except zlib.error:  # raw deflate stream without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(data)
+    raise ValueError(f"unsupported content encoding {encoding!r}")
+
+
+async def read_body(response: aiohttp.ClientResponse, stats: Optional[HttpStats] = None) -> str:
+    """
+    Body of a response from a create_session session, decompressed and
+    decoded to text; raises ValueError (or zlib/brotli errors) on a body it
+    cannot decode.
+    """
+    data = await response.read()
+    wire_bytes = len(data)
+    encoding = response.headers.get('Content-Encoding', '').strip().lower()
+    if encoding and encoding != 'identity':
+        data = _decompress(data, encoding)
+    if stats is not None:
+        stats.stats['wire_bytes'] += wire_bytes
+        stats.stats['decoded_bytes'] += len(data)
+        name = encoding or 'identity'
+        stats.encodings[name] = stats.encodings.get(name, 0) + 1
+    try:
+        return data.decode(response.charset or 'utf-8', errors='replace')
+    except LookupError:  # unknown charset label
+        return data.decode('utf-8', errors='replace')
@@ -1,9 +1,23 @@
 """
 Helper functions untuk konten berbahasa Indonesia
 """
-from datetime import datetime
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
 import re
 import logging
+from typing import Iterable, List, Optional, Tuple, Union
+
+from gazetteer import default_gazetteer
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    JAKARTA = ZoneInfo('Asia/Jakarta')
+except (ImportError, ZoneInfoNotFoundError):  # tanpa tzdata; Jakarta tidak memakai DST sejak 1964
+    JAKARTA = timezone(timedelta(hours=7), 'WIB')
+
+# Pola yang dipakai berulang, dikompilasi sekali
+_KARAKTER_SPESIAL = re.compile(r'[^\w\s\-\'āĀēĒīĪōŌūŪḍḌṭṬṇṆñÑḷḶṃṂḥḤ]')
+_POLA_LOKASI = re.compile(r'^([A-Z]{2,}\b(?:\s*,\s*[A-Z]+)*)')
 
 # Mapping bulan Indonesia ke angka
 BULAN_MAP = {
@@ -21,61 +35,164 @@ BULAN_MAP = {
     'desember': '12'
 }
 
-def parse_indo_date(date_str: str) -> str:
+# Semua penulisan bulan yang dikenali: nama lengkap, singkatan Indonesia dan Inggris
+_BULAN = {nama: int(angka) for nama, angka in BULAN_MAP.items()}
+_BULAN.update({
+    'jan': 1, 'january': 1, 'feb': 2, 'peb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4,
+    'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'agu': 8, 'agt': 8, 'agus': 8, 'aug': 8,
+    'august': 8, 'sep': 9, 'sept': 9, 'okt': 10, 'oct': 10, 'october': 10, 'nov': 11, 'nop': 11,
+    'des': 12, 'dec': 12, 'december': 12,
+})
+
+# Zona waktu Indonesia dalam menit dari UTC
+_ZONA = {'wib': 420, 'wita': 480, 'wit': 540, 'z': 0, 'utc': 0, 'gmt': 0}
+
+_SATUAN = {
+    'detik': 1, 'menit': 60, 'jam': 3600, 'hari': 86400, 'minggu': 7 * 86400, 'pekan': 7 * 86400,
+    'bulan': 30 * 86400, 'tahun': 365 * 86400,
+}
+
+# Satu grammar untuk tanggal absolut: "17 Feb 2025", "17/02/2025" atau
+# "2025-02-17", diikuti jam dan zona waktu opsional. search() dipakai agar
+# awalan seperti "Senin, " atau "Diterbitkan:" dilewati.
+_POLA_TANGGAL = re.compile(r"""
+    (?:
+        (?P<tgl>\d{1,2})\s*(?P<bulan>%s)\.?,?\s*(?P<thn>\d{4})
+      | (?P<tgl_n>\d{1,2})[/.-](?P<bulan_n>\d{1,2})[/.-](?P<thn_n>\d{4})
+      | (?P<thn_i>\d{4})-(?P<bulan_i>\d{1,2})-(?P<tgl_i>\d{1,2})
+    )
+    (?:
+        (?:\s*[,|t-]?\s*|\s+)(?:pukul\s+|jam\s+)?
+        (?P<jam>\d{1,2})[:.](?P<menit>\d{2})(?:[:.](?P<detik>\d{2}))?(?:\.\d+)?
+    )?
+    \s*(?:(?P<zona>wita|wib|wit|utc|gmt|z)\b|(?P<offset>[+-]\d{2}):?(?P<offset_m>\d{2}))?
+""" % '|'.join(sorted(_BULAN, key=len, reverse=True)), re.VERBOSE)
+
+_POLA_RELATIF = re.compile(
+    r'(?:(?P<n>\d+)\s*|se|satu\s+)(?P<satuan>%s)\s+(?:yang\s+)?(?:lalu|lampau)' % '|'.join(_SATUAN)
+)
+_POLA_SEKARANG = re.compile(r'baru\s+saja|barusan|beberapa\s+detik')
+# Jam pada "kemarin 10:00" atau "kemarin pukul 08.30 WIB"
+_POLA_JAM = re.compile(r'(?P<jam>\d{1,2})[:.](?P<menit>\d{2})(?:\s*(?P<zona>wita|wib|wit|utc|gmt)\b)?')
+
+
+@lru_cache(maxsize=8192)
+def _parse_tanggal(date_str: str) -> Union[datetime, timedelta, time, None]:
+    """
+    Hasil parse yang di-cache per string: datetime (zona Jakarta) untuk
+    tanggal absolut, timedelta mundur dari sekarang untuk bentuk relatif,
+    time berzona untuk "kemarin" dengan jam (jam itu pada hari kemarin),
+    None bila tidak dikenali
     """
-    Parse tanggal format Indonesia ke ISO format
+    teks = ' '.join(date_str.lower().split())
+    if not teks:
+        return None
+
+    match = _POLA_TANGGAL.search(teks)
+    if match:
+        if match.group('tgl'):
+            tahun, bulan, tanggal = match.group('thn'), _BULAN[match.group('bulan')], match.group('tgl')
+        elif match.group('tgl_n'):
+            tahun, bulan, tanggal = match.group('thn_n'), match.group('bulan_n'), match.group('tgl_n')
+        else:
+            tahun, bulan, tanggal = match.group('thn_i'), match.group('bulan_i'), match.group('tgl_i')
+        if match.group('zona'):
+            offset = _ZONA[match.group('zona')]
+        elif match.group('offset'):
+            jam_offset = int(match.group('offset'))
+            offset = jam_offset * 60 + (int(match.group('offset_m')) if jam_offset >= 0 else -int(match.group('offset_m')))
+        else:
+            offset = None  # tanpa zona: waktu Jakarta
+        try:
+            hasil = datetime(
+                int(tahun), int(bulan), int(tanggal),
+                int(match.group('jam') or 0), int(match.group('menit') or 0), int(match.group('detik') or 0),
+                tzinfo=JAKARTA if offset is None else timezone(timedelta(minutes=offset))
+            )
+        except ValueError:  # 31 Februari, jam 25 dan sejenisnya
+            return None
+        return hasil.astimezone(JAKARTA)
+
+    match = _POLA_RELATIF.search(teks)
+    if match:
+        return timedelta(seconds=int(match.group('n') or 1) * _SATUAN[match.group('satuan')])
+    if 'kemarin' in teks:
+        match = _POLA_JAM.search(teks)
+        if match and int(match.group('jam')) < 24 and int(match.group('menit')) < 60:
+            zona = match.group('zona')
+            return time(int(match.group('jam')), int(match.group('menit')),
+                        tzinfo=JAKARTA if zona is None else timezone(timedelta(minutes=_ZONA[zona])))
+        return timedelta(days=1)
+    if _POLA_SEKARANG.search(teks):
+        return timedelta(0)
+    return None
+
+@lru_cache(maxsize=8192)
+def _iso_tanggal(date_str: str) -> Optional[str]:
+    """String ISO tanggal absolut yang di-cache, None untuk bentuk relatif dan kemarin"""
+    hasil = _parse_tanggal(date_str)
+    return hasil.isoformat() if isinstance(hasil, datetime) else None
+
+def parse_indo_datetime(date_str: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse tanggal berita Indonesia ke datetime dengan zona Asia/Jakarta
 
     Contoh input yang didukung:
-    - 17 Februari 2025
-    - 17 Feb 2025
-    - 17/02/2025
-    - 2025-02-17
-    - 17 Feb 2025 20:29
+    - 17 Februari 2025, 17 Feb 2025, 17 Agt. 2025
+    - Senin, 17 Feb 2025 20:29 WIB (WITA +8 dan WIT +9 dikonversi ke WIB)
+    - 17/02/2025 20.29, 2025-02-17, 2025-02-17T20:29:00+07:00
+    - 6 jam yang lalu, sejam lalu, kemarin, baru saja (relatif terhadap now)
+    - Kemarin 10:00, kemarin pukul 08.30 WIB (jam itu pada hari sebelum now)
+
+    Tanggal tanpa jam menjadi pukul 00:00; "kemarin" tanpa jam menjadi
+    now dikurangi satu hari. Mengembalikan None bila tidak dikenali.
     """
-    try:
-        # Handle empty or None input
-        if not date_str:
-            return ""
-
-        # Bersihkan string
-        date_str = date_str.lower().strip()
-
-        # Coba parse format ISO
-        if '-' in date_str and len(date_str.split('-')[0]) == 4:
-            return date_str
-
-        # Extract time if present
-        time_part = ""
-        if any(c.isdigit() for c in date_str[-5:]):
-            parts = date_str.rsplit(' ', 2)
-            if len(parts) >= 2 and ':' in parts[-1]:
-                time_part = f" {parts[-2]}:{parts[-1]}"
-                date_str = ' '.join(parts[:-2])
-
-        # Coba format dengan nama bulan
-        for bulan, angka in BULAN_MAP.items():
-            if bulan in date_str:
-                # Ekstrak tanggal dan tahun
-                parts = re.findall(r'\d+', date_str)
-                if len(parts) >= 2:
-                    tanggal = parts[0].zfill(2)
-                    tahun = parts[-1]
-                    return f"{tahun}-{angka}-{tanggal}{time_part}"
-
-        # Coba format dengan slash atau dash
-        if '/' in date_str or '-' in date_str:
-            parts = re.split(r'[/-]', date_str)
-            if len(parts) == 3:
-                if len(parts[0]) == 4:  # yyyy-mm-dd
-                    return f"{parts[0]}-{parts[1].zfill(2)}-{parts[2].zfill(2)}{time_part}"
-                else:  # dd/mm/yyyy
-                    return f"{parts[2]}-{parts[1].zfill(2)}-{parts[0].zfill(2)}{time_part}"
-
-        return date_str  # Return original if no format matches
+    if not date_str:
+        return None
+    hasil = _parse_tanggal(date_str)
+    if isinstance(hasil, timedelta):
+        now = datetime.now(JAKARTA) if now is None else now
+        return (now - hasil).astimezone(JAKARTA).replace(microsecond=0)
+    if isinstance(hasil, time):
+        now = datetime.now(JAKARTA) if now is None else now
+        kemarin = now.astimezone(hasil.tzinfo).date() - timedelta(days=1)
+        return datetime.combine(kemarin, hasil).astimezone(JAKARTA)
+    return hasil
 
+def parse_indo_dates(values: Iterable[Optional[str]], now: Optional[datetime] = None):
+    """
+    Versi batch parse_indo_datetime dengan satu acuan now untuk seluruh
+    batch. pandas Series menghasilkan Series datetime64 berzona Asia/Jakarta
+    (NaT bila tidak dikenali) dengan index yang sama; input lain
+    menghasilkan list.
+    """
+    now = datetime.now(JAKARTA) if now is None else now
+    if type(values).__module__.startswith('pandas'):
+        import pandas as pd
+        parsed = [parse_indo_datetime(value if isinstance(value, str) else None, now) for value in values]
+        return pd.Series(pd.to_datetime(parsed, utc=True), index=values.index).dt.tz_convert(JAKARTA)
+    return [parse_indo_datetime(value, now) for value in values]
+
+def parse_indo_date(date_str: str) -> str:
+    """
+    Parse tanggal format Indonesia ke string ISO 8601 berzona Jakarta
+    (mis. 2025-02-17T20:29:00+07:00), sehingga urutan string sama dengan
+    urutan waktu. Lihat parse_indo_datetime untuk format yang didukung;
+    string yang tidak dikenali dikembalikan apa adanya (spasinya
+    dirapikan). Berikan teks mentah, bukan hasil clean_indo_text, yang
+    membuang ':', '/', '+' dan '.' dari jam, zona dan tanggal angka.
+    """
+    if not date_str:
+        return ""
+    try:
+        iso = _iso_tanggal(date_str)
+        if iso is None:  # relatif (bergantung pada waktu sekarang) atau tidak dikenali
+            hasil = parse_indo_datetime(date_str)
+            iso = hasil.isoformat() if hasil is not None else None
     except Exception as e:
         logging.error(f"Error parsing date '{date_str}': {e}")
-        return date_str  # Return original string on error
+        iso = None
+    return iso if iso is not None else ' '.join(date_str.split())
 
 def clean_indo_text(text: str) -> str:
     """
@@ -88,36 +205,54 @@ def clean_indo_text(text: str) -> str:
     text = ' '.join(text.split())
 
     # Hapus karakter spesial tapi pertahankan huruf dengan tanda diakritik
-    text = re.sub(r'[^\w\s\-\'āĀēĒīĪōŌūŪḍḌṭṬṇṆñÑḷḶṃṂḥḤ]', ' ', text)
+    text = _KARAKTER_SPESIAL.sub(' ', text)
 
     # Normalisasi spasi
     text = text.strip()
 
     return text
 
+def _lokasi_kapital(text: str) -> str:
+    match = _POLA_LOKASI.match(text)
+    if match:
+        location = match.group(1)
+        return location.split(',')[0].strip()
+
+    return ""
+
 def extract_location(text: str) -> str:
     """
-    Ekstrak lokasi dari teks berita Indonesia
+    Ekstrak lokasi dari dateline teks berita Indonesia
+
+    Wilayah yang ada di gazetteer (lihat gazetteer.py) dikembalikan dengan
+    nama resminya; dateline huruf kapital lain dikembalikan apa adanya.
 
     Contoh:
-    "JAKARTA, KOMPAS.com - ..." -> "Jakarta"
+    "JAKARTA, KOMPAS.com - ..." -> "DKI Jakarta"
+    "Bekasi (ANTARA) - ..." -> "Kota Bekasi"
     """
-    # Pattern untuk lokasi di awal berita
-    location_pattern = r'^([A-Z]+(?:\s*,\s*[A-Z]+)*)'
-
-    match = re.match(location_pattern, text)
-    if match:
-        location = match.group(1)
-        return location.split(',')[0].strip()
+    if not text:
+        return ""
+    place = default_gazetteer().dateline(text)
+    return place.region.name if place is not None else _lokasi_kapital(text)
 
-    return ""
+def extract_regions(text: str, *more: Optional[str]) -> Tuple[str, List[str]]:
+    """
+    Lokasi dateline seperti extract_location, plus kode wilayah Kemendagri
+    semua wilayah yang disebut di text dan more (mis. judul, isi), dalam
+    satu lintasan per teks; kode dateline di urutan pertama.
+    """
+    region, codes = default_gazetteer().locate(text or '', *more)
+    return (region.name if region is not None else _lokasi_kapital(text or '')), codes
 
 """
 Contoh penggunaan:
 
 # Parse tanggal Indonesia
 tanggal = parse_indo_date("17 Februari 2025")
-print(tanggal)  # Output: 2025-02-17
+print(tanggal)  # Output: 2025-02-17T00:00:00+07:00
+waktu = parse_indo_datetime("Senin, 17 Feb 2025 20:29 WITA")
+print(waktu)  # Output: 2025-02-17 19:29:00+07:00
 
 # Bersihkan teks
 teks = clean_indo_text("JAKARTA - Ini adalah contoh teks berita...")
@@ -125,5 +260,7 @@ print(teks)  # Output: Ini adalah contoh teks berita...
 
 # Ekstrak lokasi
 lokasi = extract_location("JAKARTA, KOMPAS.com - Berita terkini...")
-print(lokasi)  # Output: JAKARTA
+print(lokasi)  # Output: DKI Jakarta
+lokasi, kode = extract_regions("BEKASI, KOMPAS.com - Banjir di Kabupaten Bekasi dan Karawang")
+print(lokasi, kode)  # Output: Kota Bekasi ['32.75', '32.16', '32.15']
 """
\ No newline at end of file
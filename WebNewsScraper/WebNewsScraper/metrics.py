@@ -0,0 +1,242 @@
+"""
+In-process metrics for the news scraper, served in Prometheus text format
+
+MetricsRegistry holds labelled counters, gauges and histograms and renders
+them for GET /metrics (exposition format 0.0.4); ScraperMetrics defines the
+scraper's own series. Values are cumulative from process start, so per
+cycle figures come from rate()/increase() on the Prometheus side, except
+the news_scraper_last_cycle_* gauges, which show where the last cycle's
+time went.
+"""
+import logging
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CYCLE_BUCKETS = (5, 10, 30, 60, 120, 240, 480, 900)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(self.values.items())]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._key(labels)] = value
+
+    def clear(self) -> None:
+        self.values.clear()
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> per-bucket counts (non-cumulative), then sum and count
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that refresh gauges right before each render"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception as e:
+                logging.error(f"Metrics collector failed: {e}")
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class ScraperMetrics:
+    """The scraper's series; host labels are domains, source labels NEWS_SOURCES URLs"""
+
+    def __init__(self):
+        r = self.registry = MetricsRegistry()
+        self.requests = r.counter('news_scraper_http_requests_total',
+                                  'HTTP attempts by host and status code (or error)', ('host', 'status'))
+        self.request_seconds = r.histogram('news_scraper_http_request_seconds',
+                                           'Time to response headers per attempt', ('host',))
+        self.response_bytes = r.counter('news_scraper_http_response_bytes_total',
+                                        'Response body bytes on the wire', ('host',))
+        self.retries = r.counter('news_scraper_http_retries_total', 'Attempts beyond the first', ('host',))
+        self.fetches = r.counter('news_scraper_fetches_total', 'fetch_page calls by outcome', ('host', 'outcome'))
+        self.parse_seconds = r.histogram('news_scraper_parse_seconds',
+                                         'Homepage extraction time in the parse executor', ('source',))
+        self.candidates = r.counter('news_scraper_candidate_blocks_total',
+                                    'Candidate article blocks found on homepages', ('source',))
+        self.processed = r.counter('news_scraper_processed_blocks_total',
+                                   'Candidate blocks actually extracted (not skipped as unchanged)', ('source',))
+        self.keyword_hits = r.counter('news_scraper_keyword_hits_total',
+                                      'Articles matching the keywords', ('source',))
+        self.duplicates = r.counter('news_scraper_duplicates_total', 'Keyword hits already seen', ('source',))
+        self.saved = r.counter('news_scraper_articles_saved_total', 'New articles kept', ('source',))
+        self.cycles = r.counter('news_scraper_cycles_total', 'Completed scrape cycles')
+        self.cycle_seconds = r.histogram('news_scraper_cycle_seconds', 'Duration of scrape cycles',
+                                         buckets=CYCLE_BUCKETS)
+        self.cycle_fetch_seconds = r.gauge('news_scraper_last_cycle_fetch_seconds',
+                                           'Time spent in fetch_page per host in the last cycle', ('host',))
+        self.cycle_parse_seconds = r.gauge('news_scraper_last_cycle_parse_seconds',
+                                           'Time spent parsing per source in the last cycle', ('source',))
+        # Refreshed by a collector the scraper registers (connection reuse by main())
+        self.queue_depth = r.gauge('news_scraper_article_queue_depth', 'Full-article fetches waiting')
+        self.circuits = r.gauge('news_scraper_circuits', 'Hosts per circuit breaker state', ('state',))
+        self.poll_interval = r.gauge('news_scraper_poll_interval_seconds',
+                                     'Current adaptive poll interval', ('source',))
+        self.connection_reuse = r.gauge('news_scraper_http_connection_reuse_ratio',
+                                        'Share of requests on a pooled connection in the last cycle')
+        self._fetch_time: Dict[str, float] = {}
+        self._parse_time: Dict[str, float] = {}
+
+    def observe_request(self, host: str, status: str, seconds: float) -> None:
+        self.requests.inc(host=host, status=status)
+        self.request_seconds.observe(seconds, host=host)
+
+    def observe_fetch(self, host: str, outcome: str, attempts: int, seconds: float) -> None:
+        self.fetches.inc(host=host, outcome=outcome)
+        if attempts > 1:
+            self.retries.inc(attempts - 1, host=host)
+        self._fetch_time[host] = self._fetch_time.get(host, 0.0) + seconds
+
+    def observe_parse(self, source: str, seconds: float, candidates: int, processed: int,
+                      hits: int, duplicates: int, saved: int) -> None:
+        self.parse_seconds.observe(seconds, source=source)
+        self.candidates.inc(candidates, source=source)
+        self.processed.inc(processed, source=source)
+        self.keyword_hits.inc(hits, source=source)
+        self.duplicates.inc(duplicates, source=source)
+        self.saved.inc(saved, source=source)
+        self._parse_time[source] = self._parse_time.get(source, 0.0) + seconds
+
+    def end_cycle(self, seconds: float) -> None:
+        """Publish the finished cycle's per-host and per-source time and start counting the next one"""
+        self.cycles.inc()
+        self.cycle_seconds.observe(seconds)
+        self.cycle_fetch_seconds.clear()
+        for host, spent in self._fetch_time.items():
+            self.cycle_fetch_seconds.set(spent, host=host)
+        self.cycle_parse_seconds.clear()
+        for source, spent in self._parse_time.items():
+            self.cycle_parse_seconds.set(spent, source=source)
+        self._fetch_time.clear()
+        self._parse_time.clear()
+
+
+async def start_metrics_server(registry: MetricsRegistry, host: str = '127.0.0.1',
+                               port: int = 9108) -> Optional[web.AppRunner]:
+    """Serve GET /metrics; returns the runner to clean up, or None if the port is unavailable"""
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=registry.render().encode('utf-8'), headers={'Content-Type': CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        logging.error(f"Metrics endpoint not started on {host}:{port}: {e}")
+        await runner.cleanup()
+        return None
+    logging.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,111 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+
+class NdjsonSink:
+    """
+    Append-only newline-delimited JSON output, one article per line.
+
+    Articles are written as soon as they are accepted, so memory does not
+    grow with cycle size. A new file is started once the current one reaches
+    max_bytes (uncompressed) or is older than rotate_seconds, optionally
+    gzip-compressed. Next to each file a small <file>.summary.json sidecar
+    keeps the per-category counts and sources that the whole-cycle JSON
+    snapshot used to carry in its metadata block.
+    """
+
+    def __init__(self, directory: str = '.', prefix: str = 'articles',
+                 max_bytes: int = 64 * 1024 * 1024, rotate_seconds: float = 3600,
+                 compress: bool = False):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = compress
+        self.path: Optional[str] = None
+        self._file = None
+        self._opened_at = 0.0
+        self._bytes = 0
+        self._total = 0
+        self._categories: Dict[str, Dict] = {}
+        self._sources: Dict[str, Set[str]] = {}
+        self._since_flush = 0
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = '.ndjson.gz' if self.compress else '.ndjson'
+        self.path = os.path.join(self.directory, f"{self.prefix}_{timestamp}{suffix}")
+        sequence = 1
+        while os.path.exists(self.path):  # rotated twice within a second
+            self.path = os.path.join(self.directory, f"{self.prefix}_{timestamp}_{sequence}{suffix}")
+            sequence += 1
+        self._file = gzip.open(self.path, 'ab') if self.compress else open(self.path, 'ab')
+        self._opened_at = time.time()
+        self._bytes = 0
+        self._total = 0
+        self._categories = {}
+        self._sources = {}
+        logging.info(f"Writing articles to {self.path}")
+
+    def _needs_rotation(self) -> bool:
+        return (self._bytes >= self.max_bytes
+                or time.time() - self._opened_at >= self.rotate_seconds)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._write_summary()
+            self._file = None
+
+    def write(self, article: Dict, category: str) -> None:
+        """Append one article, rotating first if the current file is full or old"""
+        if self._file is not None and self._needs_rotation():
+            self._close_file()
+        if self._file is None:
+            self._open()
+
+        line = json.dumps(article, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        self._file.write(line)
+        self._bytes += len(line)
+        self._total += 1
+        self._since_flush += 1
+
+        info = self._categories.setdefault(category, {'count': 0})
+        info['count'] += 1
+        self._sources.setdefault(category, set()).add(article['source'])
+
+    def _write_summary(self) -> None:
+        summary = {
+            'file': os.path.basename(self.path),
+            'opened': datetime.fromtimestamp(self._opened_at).isoformat(),
+            'updated': datetime.now().isoformat(),
+            'total_articles': self._total,
+            'bytes': self._bytes,
+            'compressed': self.compress,
+            'categories': {
+                category: {'count': info['count'], 'sources': sorted(self._sources[category])}
+                for category, info in self._categories.items()
+            }
+        }
+        summary_path = f"{self.path}.summary.json"
+        tmp_path = f"{summary_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, summary_path)
+
+    def flush(self) -> int:
+        """Flush buffered lines, refresh the summary and return articles written since the last flush"""
+        written, self._since_flush = self._since_flush, 0
+        if self._file is not None:
+            self._file.flush()
+            self._write_summary()
+        return written
+
+    def close(self) -> None:
+        self._close_file()
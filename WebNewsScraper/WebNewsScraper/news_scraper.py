@@ -1,323 +1,790 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+from typing import AbstractSet, Any, Dict, List, Optional, Sequence, Set, Tuple
 import logging
 from datetime import datetime
 import json
 import random
+import time
 from urllib.parse import urlparse
 
 from config import (
-    NEWS_SOURCES, KEYWORDS, REQUEST_HEADERS, RATE_LIMIT_DELAY,
-    MAX_RETRIES, REQUEST_TIMEOUT, MEMORY_CACHE_SIZE, SKIP_SITES, BASE_RETRY_DELAY, MAX_RETRY_DELAY, SITE_SPECIFIC_HEADERS
+    NEWS_SOURCES, KEYWORDS, REQUEST_HEADERS,
+    HTTP_POOL_SIZE, HTTP_POOL_PER_HOST, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, METRICS_HOST, METRICS_PORT, TRACE_DIR, PROFILER,
+    MAX_RETRIES, REQUEST_TIMEOUT, REQUEST_DEADLINE, CYCLE_TIME_BUDGET, MEMORY_CACHE_SIZE, SKIP_SITES, BASE_RETRY_DELAY, MAX_RETRY_DELAY, SITE_SPECIFIC_HEADERS,
+    MAX_CONCURRENT_REQUESTS, PER_HOST_CONCURRENCY, PER_HOST_DELAY, HTTP_CACHE_FILE,
+    CIRCUIT_BREAKER_FILE, BREAKER_WINDOW, BREAKER_MIN_REQUESTS, BREAKER_ERROR_RATE, BREAKER_SLOW_SECONDS,
+    BREAKER_OPEN_SECONDS, BREAKER_MAX_OPEN_SECONDS,
+    ADAPTIVE_POLLING, POLL_SCHEDULE_FILE, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_DEFAULT_INTERVAL,
+    POLL_TARGET_ARTICLES,
+    FETCH_FULL_ARTICLES, ARTICLE_FETCH_WORKERS, ARTICLE_QUEUE_SIZE,
+    PARSE_EXECUTOR_MODE, PARSE_WORKERS, PARSER_BACKEND, KEYWORD_WORD_BOUNDARY,
+    SELECTOR_PROFILES, SELECTOR_PROFILES_FILE, PROFILE_REFRESH_CYCLES, INCREMENTAL_PARSING, BLOCK_FINGERPRINT_FILE,
+    DEDUP_STORE_FILE, DEDUP_TTL_DAYS, BLOOM_FILTER_FILE, BLOOM_CAPACITY, BLOOM_ERROR_RATE, BLOOM_REBUILD_HOURS,
+    NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATE_INDEX_SIZE,
+    OUTPUT_MODE, OUTPUT_DIR, NDJSON_MAX_BYTES, NDJSON_ROTATE_SECONDS, NDJSON_COMPRESS, ARTICLE_STORE_FILE,
+    PARQUET_EXPORT_DIR
 )
-from utils import MemoryCache, clean_text, normalize_url, contains_keywords, log_error
-from id_helpers import parse_indo_date, clean_indo_text, extract_location
+from article_fetcher import ArticleFetcher
+from article_store import ArticleStore
+from block_fingerprints import BlockFingerprints
+from bloom_filter import BloomFilter
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from content_extractor import (
+    STRATEGIES, ContentExtractor, StrategyTimings, density_body, run_strategies, trafilatura_body
+)
+from dedup_store import PersistentDedupStore
+from fetch_attempts import Attempt, AttemptLog, backoff_delay, retry_after_seconds
+from http_cache import HttpCache, NOT_MODIFIED
+from http_client import HttpStats, create_session, read_body, request_headers
+from metrics import ScraperMetrics, start_metrics_server
+from ndjson_sink import NdjsonSink
+from near_duplicate import NearDuplicateIndex, article_signature
+from parquet_export import ParquetExporter
+from parse_executor import ParseExecutor
+from parser_backends import ParserBackend, SOUP_BACKEND, SlotMatcher, get_backend
+from poll_schedule import PollSchedule
+from scheduler import HostScheduler
+from selector_profiles import Profile, SelectorProfiles, element_selector
+from tracing import CycleProfiler, Tracer
+from utils import MemoryCache, KeywordMatcher, clean_text, normalize_url, log_error
+from id_helpers import parse_indo_date, clean_indo_text, extract_regions
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS, word_boundary=KEYWORD_WORD_BOUNDARY)
+
+# Candidate article blocks and their title element
+ARTICLE_TAGS = ['article', 'div', 'h3']
+ARTICLE_CLASS_HINTS = ['article', 'news', 'post', 'berita', 'content']
+TITLE_TAGS = ['h1', 'h2', 'h3', 'a']
+
+# Metadata selectors tried in order, then a (tags, class substrings) fallback
+AUTHOR_SELECTORS = [
+    '.author-name', '.post-author', 'span[rel="author"]',
+    '.byline', '.entry-author', '.penulis', '.journalist'
+]
+AUTHOR_FALLBACK = (['span', 'div', 'p', 'a'], ['author', 'writer', 'penulis', 'journalist'])
+DATE_SELECTORS = [
+    'time.published', 'time.entry-date', 'span.post-date',
+    '.article-date', 'meta[property="article:published_time"]'
+]
+DATE_FALLBACK = (['time', 'span', 'div', 'p'], ['date', 'time', 'tanggal', 'waktu', 'published'])
+CATEGORY_SELECTORS = [
+    '.article-category', '.post-category', '.entry-category',
+    '.breadcrumb .category', '.kategori', '.rubrik'
+]
+CATEGORY_FALLBACK = (['a', 'span', 'div'], ['category', 'kategori', 'rubrik', 'kanal'])
+DESCRIPTION_SELECTORS = [
+    '.article-excerpt', '.post-excerpt', '.entry-summary',
+    'meta[name="description"]', '.ringkasan'
+]
+DESCRIPTION_FALLBACK = (['p', 'div'], ['desc', 'summary', 'excerpt', 'ringkasan'])
+CONTENT_SELECTORS = [
+    'div.article-content', 'div.entry-content', 'div.post-content',
+    'article .content', '.body-text'
+]
+
+# All of the above resolved in a single walk over each candidate block
+METADATA_SLOTS = SlotMatcher({
+    'title': ([], (TITLE_TAGS, None)),
+    'author': (AUTHOR_SELECTORS, AUTHOR_FALLBACK),
+    'date': (DATE_SELECTORS, DATE_FALLBACK),
+    'category': (CATEGORY_SELECTORS, CATEGORY_FALLBACK),
+    'description': (DESCRIPTION_SELECTORS, DESCRIPTION_FALLBACK),
+    'content': (CONTENT_SELECTORS, None)
+})
 
 class NewsScraperAsync:
     def __init__(self):
-        self.cache = MemoryCache(max_size=MEMORY_CACHE_SIZE)
+        if DEDUP_STORE_FILE:
+            self.cache = PersistentDedupStore(DEDUP_STORE_FILE, ttl_seconds=DEDUP_TTL_DAYS * 86400)
+        else:
+            self.cache = MemoryCache(max_size=MEMORY_CACHE_SIZE)
+        # Keys of new articles accepted but not yet written out, e.g. waiting
+        # for the full-article stage; only written articles are remembered
+        self._accepted: Set[bytes] = set()
+        # Articles written out since the last scrape_all_sources, for save_articles
+        self._unsaved: List[Dict] = []
+        # Source URL -> its articles still in the full-article stage. Their
+        # homepage's validators and block fingerprints are not saved until
+        # the count drops to zero: after a crash the page must come back
+        # changed and be parsed again, or those articles would be lost
+        self._held_sources: Dict[str, int] = {}
+        self.bloom: Optional[BloomFilter] = None
+        # Keys expired from the store since the Bloom filter was built
+        self._expired_keys: Set[bytes] = set()
+        # The filter mirrors the persistent store; a saved filter next to the
+        # in-memory cache, which forgets keys on eviction and on restart,
+        # would only answer false positives for articles it no longer has
+        if BLOOM_FILTER_FILE and isinstance(self.cache, PersistentDedupStore):
+            self.bloom = BloomFilter.open(
+                BLOOM_FILTER_FILE, BLOOM_CAPACITY, BLOOM_ERROR_RATE, self.cache.iter_keys(), BLOOM_REBUILD_HOURS * 3600
+            )
+            # Saved ahead of every store commit, so after a crash the
+            # filter holds every key the store has
+            self.cache.before_commit = self._save_bloom
+        elif BLOOM_FILTER_FILE:
+            logging.info("Bloom filter disabled: it needs DEDUP_STORE_FILE to be set")
+        self.stories = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD, max_entries=NEAR_DUPLICATE_INDEX_SIZE)
+        self.sink: Optional[NdjsonSink] = None
+        if OUTPUT_MODE == 'ndjson':
+            self.sink = NdjsonSink(OUTPUT_DIR, 'articles', NDJSON_MAX_BYTES, NDJSON_ROTATE_SECONDS, NDJSON_COMPRESS)
+        self.store = ArticleStore(ARTICLE_STORE_FILE) if ARTICLE_STORE_FILE else None
+        self.parquet = ParquetExporter(PARQUET_EXPORT_DIR) if PARQUET_EXPORT_DIR else None
         self.session: Optional[aiohttp.ClientSession] = None
+        self.http_stats = HttpStats()
+        self.metrics = ScraperMetrics()
+        self.tracer = Tracer(TRACE_DIR)
+        self.scheduler = HostScheduler(
+            max_concurrency=MAX_CONCURRENT_REQUESTS,
+            per_host_limit=PER_HOST_CONCURRENCY,
+            host_delay=PER_HOST_DELAY
+        )
+        self.http_cache = HttpCache(HTTP_CACHE_FILE)
+        self.attempt_log = AttemptLog()
+        self.cycle_deadline: Optional[float] = None
+        self.breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_FILE, BREAKER_WINDOW, BREAKER_MIN_REQUESTS, BREAKER_ERROR_RATE,
+            BREAKER_SLOW_SECONDS, BREAKER_OPEN_SECONDS, BREAKER_MAX_OPEN_SECONDS, seed_open=SKIP_SITES
+        )
+        self.parse_executor = ParseExecutor(PARSE_EXECUTOR_MODE, PARSE_WORKERS)
+        self.article_fetcher: Optional[ArticleFetcher] = None
+        if FETCH_FULL_ARTICLES:
+            self.article_fetcher = ArticleFetcher(
+                self.fetch_page, self._extract_article_body, self._on_full_content,
+                self.scheduler, ARTICLE_FETCH_WORKERS, ARTICLE_QUEUE_SIZE
+            )
+        self.content_extractor = ContentExtractor()
+        self.profiles = SelectorProfiles(SELECTOR_PROFILES_FILE, SELECTOR_PROFILES, PROFILE_REFRESH_CYCLES)
+        self.blocks = BlockFingerprints(BLOCK_FINGERPRINT_FILE) if INCREMENTAL_PARSING else None
+        self.poll_schedule: Optional[PollSchedule] = None
+        if ADAPTIVE_POLLING:
+            self.poll_schedule = PollSchedule(
+                POLL_SCHEDULE_FILE, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_DEFAULT_INTERVAL, POLL_TARGET_ARTICLES
+            )
+        self.metrics.registry.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self) -> None:
+        """Refresh the gauges that mirror other components' state before /metrics is rendered"""
+        m = self.metrics
+        if self.article_fetcher is not None:
+            m.queue_depth.set(self.article_fetcher.metrics()['queue_depth'])
+        states = [self.breaker.state(domain) for domain in self.breaker.entries]
+        for state in (CLOSED, OPEN, HALF_OPEN):
+            m.circuits.set(states.count(state), state=state)
+        if self.poll_schedule is not None:
+            for url, entry in self.poll_schedule.entries.items():
+                m.poll_interval.set(entry['interval'], source=url)
 
     async def initialize(self):
-        """Initialize aiohttp session with default headers and cookie support"""
+        """Initialize the shared aiohttp session with cookie support; headers are sent per request"""
         if not self.session:
-            initial_headers = self._get_random_headers()
-            cookie_jar = aiohttp.CookieJar(unsafe=True)
-            self.session = aiohttp.ClientSession(
-                headers=initial_headers,
-                cookie_jar=cookie_jar,
-                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            self.session = create_session(
+                self.http_stats, HTTP_POOL_SIZE, HTTP_POOL_PER_HOST, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT,
+                REQUEST_TIMEOUT, cookie_jar=aiohttp.CookieJar(unsafe=True),
+                trace_configs=[self.tracer.trace_config()] if self.tracer.enabled else ()
             )
+        if self.article_fetcher is not None:
+            self.article_fetcher.start()
 
     async def close(self):
-        """Close aiohttp session"""
+        """Close aiohttp session, stop parse workers and persist caches"""
+        if self.article_fetcher is not None:
+            # Articles still waiting for their body are written out without it
+            await self.article_fetcher.stop()
+        if self._unsaved:
+            unsaved, self._unsaved = self._unsaved, []
+            self.save_articles(unsaved)
+        self.http_cache.save(exclude=self.held_sources())
+        self.breaker.save()
+        self.profiles.save()
+        if self.blocks is not None:
+            self.blocks.save(exclude=self.held_sources())
+        if self.poll_schedule is not None:
+            self.poll_schedule.save()
+        self.flush_dedup()
+        if isinstance(self.cache, PersistentDedupStore):
+            self.cache.close()
+        self.parse_executor.shutdown()
+        if self.sink is not None:
+            self.sink.close()
+        if self.store is not None:
+            self.store.close()
+        if self.parquet is not None:
+            self.parquet.flush()
         if self.session:
             await self.session.close()
             self.session = None
 
+    def is_duplicate(self, article: Dict) -> bool:
+        """
+        Whether article was accepted before; the Bloom filter is asked first
+        and the dedup cache only on a maybe
+        """
+        key = PersistentDedupStore._generate_key(article)
+        if key in self._accepted:
+            return True
+        if self.bloom is None:
+            return self.cache.is_duplicate(article)
+
+        if key not in self.bloom:
+            return False
+        duplicate = self.cache.is_duplicate(article)
+        if not duplicate:
+            if key in self._expired_keys:
+                self.bloom.record_stale()
+            else:
+                self.bloom.record_false_positive()
+        return duplicate
+
+    def remember(self, article: Dict) -> None:
+        """Record an accepted article in the Bloom filter and the dedup cache"""
+        # Filter first: the store may commit, and save the filter, in add_article
+        if self.bloom is not None:
+            self.bloom.add(PersistentDedupStore._generate_key(article))
+        self.cache.add_article(article)
+
+    def pending_articles(self) -> int:
+        """New articles accepted but not written out yet"""
+        return len(self._accepted)
+
+    def held_sources(self) -> AbstractSet[str]:
+        """Sources whose HTTP cache entry and block fingerprints must not be saved yet"""
+        return self._held_sources.keys()
+
+    def _emit(self, articles: List[Dict], category: str) -> None:
+        """
+        Write new articles to the outputs and only then remember them, so an
+        article is never marked as seen without having been written
+        """
+        if not articles:
+            return
+        if self.sink is not None:
+            for article in articles:
+                self.sink.write(article, category)
+            if self.store is not None:
+                # Streaming mode never reaches save_articles, store as they come
+                self.store.add_articles(articles, source_category=category)
+        else:
+            self._unsaved.extend(articles)
+        if self.parquet is not None:
+            self.parquet.add(articles, category)
+        for article in articles:
+            self._accepted.discard(PersistentDedupStore._generate_key(article))
+            self.remember(article)
+
+    def flush_dedup(self) -> None:
+        """Persist the dedup cache and Bloom filter, rebuilding the filter once it is due"""
+        if self.bloom is None:
+            self.cache.flush()
+            return
+        self._expired_keys.update(self.cache.flush() or ())
+        logging.info(f"Bloom filter: {self.bloom.summary()}")
+        if self.bloom.age >= BLOOM_REBUILD_HOURS * 3600:
+            self.bloom = BloomFilter.build(BLOOM_CAPACITY, BLOOM_ERROR_RATE, self.cache.iter_keys())
+            self._expired_keys.clear()
+            logging.info(f"Rebuilt Bloom filter with {self.bloom.count} unexpired keys")
+        self._save_bloom()
+
+    def _save_bloom(self) -> None:
+        if self.bloom is None:
+            return
+        try:
+            self.bloom.save(BLOOM_FILTER_FILE)
+        except OSError as e:
+            logging.error(f"Failed to save Bloom filter {BLOOM_FILTER_FILE}: {e}")
+
     def _get_random_headers(self) -> Dict[str, str]:
         """Get random headers to rotate between requests"""
         return random.choice(REQUEST_HEADERS)
 
     async def _get_headers_for_site(self, url: str) -> Dict[str, str]:
         """Get headers with site-specific additions if needed"""
-        base_headers = self._get_random_headers()
+        base_headers = dict(self._get_random_headers())
         domain = urlparse(url).netloc
         if domain in SITE_SPECIFIC_HEADERS:
             base_headers.update(SITE_SPECIFIC_HEADERS[domain])
-        return base_headers
+        return request_headers(base_headers)
+
+    async def fetch_page(self, url: str, revalidate: bool = False,
+                         cycle_deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Fetch page content, retrying transient failures with backoff
+
+        Up to MAX_RETRIES attempts are made within REQUEST_DEADLINE seconds
+        (and before cycle_deadline, a loop.time() value, when given); a retry
+        whose wait would pass the deadline is not made. Every attempt returns
+        its connection before the backoff sleep, Retry-After is honoured in
+        both its forms, and the attempts are kept in self.attempt_log.
 
-    async def fetch_page(self, url: str, retries: int = 0) -> Optional[str]:
-        """Fetch page content with enhanced retry logic and error handling"""
+        With revalidate=True the request is made conditional on the cached
+        ETag/Last-Modified, and NOT_MODIFIED is returned when the server answers
+        304 or the body hash matches the previous fetch.
+        """
         if not self.session:
             await self.initialize()
 
+        loop = asyncio.get_running_loop()
         domain = urlparse(url).netloc
-        if domain in SKIP_SITES:
-            logging.warning(f"Skipping known problematic site: {url}")
-            return None
+        deadline, limit = loop.time() + REQUEST_DEADLINE, 'deadline'
+        if cycle_deadline is not None and cycle_deadline < deadline:
+            deadline, limit = cycle_deadline, 'budget'
 
-        if retries >= MAX_RETRIES:
-            logging.error(f"Max retries reached for {url}")
-            return None
+        attempts: List[Attempt] = []
+        page, outcome = None, 'max_retries'
+        fetch_started = loop.time()
+        traced = time.perf_counter()
+        for attempt in range(MAX_RETRIES):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                outcome = limit
+                break
+            allowed, probe = self.breaker.allow(domain)
+            if not allowed:
+                logging.info(f"Circuit open for {domain}, skipping {url}")
+                outcome = 'circuit_open'
+                break
 
-        try:
-            delay = min(BASE_RETRY_DELAY * (2 ** retries), MAX_RETRY_DELAY)
-            jitter = random.uniform(0.5, 1.5)
-            delay = delay * jitter
+            started = loop.time()
+            try:
+                page, status, error, wait = await self._attempt(url, domain, revalidate, attempt, remaining, probe)
+            finally:
+                if probe is not None:
+                    # No-op once the probe's outcome is recorded
+                    self.breaker.release(domain, probe)
+            elapsed = loop.time() - started
+            if wait is None:
+                outcome = 'failed' if page is None else 'not_modified' if page == NOT_MODIFIED else 'ok'
+            elif attempt + 1 == MAX_RETRIES:
+                logging.error(f"Max retries reached for {url}")
+            elif self.breaker.state(domain) != CLOSED:
+                logging.warning(f"Circuit open for {domain}, not retrying {url}")
+                outcome = 'circuit_open'
+            elif loop.time() + wait >= deadline:
+                logging.warning(f"Giving up on {url}: a retry in {wait:.0f}s would pass its {limit}")
+                outcome = limit
+            else:
+                # The connection is already back in the pool while we wait
+                attempts.append(Attempt(status, error, elapsed, wait))
+                with self.tracer.span('backoff', domain, status=status, error=error):
+                    await asyncio.sleep(wait)
+                continue
+            attempts.append(Attempt(status, error, elapsed, 0.0))
+            break
+
+        self.attempt_log.record(url, outcome, attempts)
+        self.metrics.observe_fetch(domain, outcome, len(attempts), loop.time() - fetch_started)
+        self.tracer.add('fetch_page', traced, time.perf_counter(), domain,
+                        url=url, outcome=outcome, attempts=len(attempts))
+        return page
 
+    async def _attempt(self, url: str, domain: str, revalidate: bool, attempt: int, remaining: float,
+                       probe: Optional[int] = None) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[float]]:
+        """
+        Make one request, the half-open circuit's probe when probe is its
+        token. Returns (page, HTTP status, error, wait) where wait is the
+        delay before a retry, or None when the outcome is final.
+        """
+        backoff = backoff_delay(attempt, BASE_RETRY_DELAY, MAX_RETRY_DELAY)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # A timeout cut short by the deadline or cycle budget is not the host's fault
+        capped = remaining < REQUEST_TIMEOUT
+        try:
             headers = await self._get_headers_for_site(url)
-            if self.session:
-                self.session.headers.update(headers)
-
-                # Log request details for debugging
-                if domain == "www.tribunnews.com":
-                    logging.info(f"Attempting request to {url}")
-                    logging.info(f"Headers being used: {json.dumps(headers, indent=2)}")
-
-                async with self.session.get(
-                    url,
-                    ssl=False,
-                    allow_redirects=True,
-                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 200:
-                        try:
-                            content = await response.text()
-                            logging.info(f"Successfully fetched content from {url}")
-                            return content
-                        except Exception as e:
-                            logging.error(f"Error decoding content from {url}: {e}")
-                            return None
-                    elif response.status == 403:
-                        logging.warning(f"Access forbidden for {url}, response headers: {dict(response.headers)}")
-                        if self.session and self.session.cookie_jar:
-                            self.session.cookie_jar.clear_domain(domain)
-                        await asyncio.sleep(delay)
-                        return await self.fetch_page(url, retries + 1)
-                    elif response.status == 429:
-                        wait_time = int(response.headers.get('Retry-After', delay))
-                        logging.warning(f"Rate limited on {url}, waiting {wait_time}s")
-                        await asyncio.sleep(wait_time)
-                        return await self.fetch_page(url, retries + 1)
-                    elif response.status >= 500:
-                        logging.warning(f"Server error {response.status} for {url}, retrying...")
-                        await asyncio.sleep(delay)
-                        return await self.fetch_page(url, retries + 1)
-                    else:
-                        logging.warning(f"Failed to fetch {url}, status: {response.status}")
-                        return None
+            if revalidate:
+                headers.update(self.http_cache.conditional_headers(url))
+
+            # Log request details for debugging
+            if domain == "www.tribunnews.com":
+                logging.info(f"Attempting request to {url}")
+                logging.info(f"Headers being used: {json.dumps(headers, indent=2)}")
+
+            async with self.session.get(
+                url,
+                headers=headers,
+                ssl=False,
+                allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=min(REQUEST_TIMEOUT, remaining))
+            ) as response:
+                status = response.status
+                self.metrics.observe_request(domain, str(status), loop.time() - started)
+                # Blocking, rate limiting and server errors count against the host
+                self.breaker.record(
+                    domain, status < 500 and status not in (403, 429), loop.time() - started, f"HTTP {status}",
+                    probe=probe
+                )
+                if status == 304 and revalidate:
+                    self.http_cache.record_not_modified(url)
+                    logging.info(f"Not modified since last fetch: {url}")
+                    return NOT_MODIFIED, status, None, None
+                elif status == 200:
+                    try:
+                        with self.tracer.span('download', domain):
+                            body = await response.read()
+                        self.metrics.response_bytes.inc(len(body), host=domain)
+                        # read_body gets the buffered body back from read()
+                        with self.tracer.span('decode', domain, encoding=response.headers.get('Content-Encoding')):
+                            content = await read_body(response, self.http_stats)
+                    except Exception as e:
+                        logging.error(f"Error decoding content from {url}: {e}")
+                        return None, status, f"decode error: {e}", None
+                    if revalidate and not self.http_cache.store(url, response.headers, content):
+                        logging.info(f"Content unchanged since last fetch: {url}")
+                        return NOT_MODIFIED, status, None, None
+                    logging.info(f"Successfully fetched content from {url}")
+                    return content, status, None, None
+
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+                if status == 403:
+                    logging.warning(f"Access forbidden for {url}, response headers: {dict(response.headers)}")
+                    if self.session.cookie_jar:
+                        self.session.cookie_jar.clear_domain(domain)
+                    return None, status, None, backoff
+                elif status == 429:
+                    wait = backoff if retry_after is None else retry_after
+                    logging.warning(f"Rate limited on {url}, waiting {wait:.0f}s")
+                    return None, status, None, wait
+                elif status >= 500:
+                    logging.warning(f"Server error {status} for {url}, retrying...")
+                    return None, status, None, backoff if retry_after is None else retry_after
+                logging.warning(f"Failed to fetch {url}, status: {status}")
+                return None, status, None, None
 
         except aiohttp.ClientError as e:
             logging.error(f"Connection error for {url}: {e}")
-            await asyncio.sleep(delay)
-            return await self.fetch_page(url, retries + 1)
+            self.metrics.observe_request(domain, 'error', loop.time() - started)
+            self.breaker.record(domain, False, error=f"connection error: {e}", probe=probe)
+            return None, None, f"connection error: {e}", backoff
         except asyncio.TimeoutError:
+            self.metrics.observe_request(domain, 'timeout', loop.time() - started)
+            if capped:
+                logging.warning(f"Out of time for {url} after {loop.time() - started:.1f}s")
+                return None, None, "timeout at deadline", backoff
             logging.error(f"Timeout error for {url}")
-            await asyncio.sleep(delay)
-            return await self.fetch_page(url, retries + 1)
+            self.breaker.record(domain, False, loop.time() - started, "timeout", probe=probe)
+            return None, None, "timeout", backoff
         except Exception as e:
             logging.error(f"Unexpected error fetching {url}: {e}")
-            return None
+            self.metrics.observe_request(domain, 'error', loop.time() - started)
+            self.breaker.record(domain, False, error=str(e), probe=probe)
+            return None, None, str(e), None
 
     async def parse_article(self, html: str, base_url: str) -> List[Dict]:
-        """Parse HTML content and extract articles with enhanced metadata"""
+        """
+        Parse HTML content in the parse executor and return the articles not
+        seen before. They are written out at once, or once the full-article
+        stage has their body. In incremental mode blocks unchanged since this
+        source's last pass are skipped inside the parse.
+        """
         articles = []
+        ready = []  # new articles not waiting for their full text
+        duplicates = 0
+        domain = urlparse(base_url).netloc
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Find article elements with improved selectors
-            article_elements = soup.find_all(
-                ['article', 'div', 'h3'],
-                class_=lambda x: isinstance(x, str) and any(
-                    c in x.lower() for c in ['article', 'news', 'post', 'berita', 'content']
-                )
+            parse_started = time.perf_counter()
+            profile = self.profiles.get(domain)
+            # A generic pass on a domain that has a profile relearns it and
+            # must see every block, not only the changed ones
+            known = None
+            if self.blocks is not None:
+                relearn = profile is None and self.profiles.has_profile(domain)
+                known = frozenset() if relearn else self.blocks.known(base_url)
+            candidates, fingerprints, processed, timings = await self.parse_executor.run(
+                extract_changed_articles_timed, html, base_url, known, profile
             )
+            self._trace_parse(domain, parse_started, timings, profiled=profile is not None)
+            produced = len(candidates)
+            if known is not None:
+                # Unchanged blocks still show the profile matches the page
+                produced += len(fingerprints) - processed
+            if self.profiles.record(domain, profile is not None, produced):
+                logging.info(f"Selector profile for {domain} found nothing, using the generic pass")
+                profile = None
+                rerun_started = time.perf_counter()
+                candidates, fingerprints, processed, timings = await self.parse_executor.run(
+                    extract_changed_articles_timed, html, base_url, None if known is None else frozenset()
+                )
+                self._trace_parse(domain, rerun_started, timings, profiled=False)
+                self.profiles.record(domain, False, len(candidates))
+            parse_seconds = time.perf_counter() - parse_started
+
+            # Nested candidates can yield the same article; the innermost
+            # container comes last and is the one worth learning
+            observed = {}
+            for article in candidates:
+                observed[(article['title'], article['url'])] = article.pop('selectors')
+            if profile is None:
+                self.profiles.learn(domain, observed.values())
 
-            for element in article_elements:
-                # Extract title with multiple selectors
-                title_element = element.find(['h1', 'h2', 'h3', 'a'])
-                if not title_element:
-                    continue
-
-                title = clean_indo_text(title_element.get_text())
-                url = normalize_url(base_url, title_element.get('href', ''))
-
-                if not title or not url:
-                    continue
-
-                # Extract metadata with improved parsing
-                metadata = {
-                    'author': self._extract_author(element),
-                    'published_date': parse_indo_date(self._extract_date(element)),
-                    'category': self._extract_category(element),
-                    'description': self._extract_description(element),
-                    'location': extract_location(self._extract_description(element))
-                }
-
-                # Extract full content if available
-                content = self._extract_full_content(element)
-                if content:
-                    metadata['full_content'] = content
-
-                if not contains_keywords(title + ' ' + metadata['description'], KEYWORDS):
-                    continue
-
-                article = {
-                    'title': title,
-                    'url': url,
-                    'source': base_url,
-                    'metadata': metadata,
-                    'timestamp': datetime.now().isoformat()
-                }
-
-                if not self.cache.is_duplicate(article):
+            dedup_started = time.perf_counter()
+            for article in candidates:
+                signature = article.pop('signature', None)
+                if self.is_duplicate(article):
+                    # A teaser still on the homepage must not expire and come back as new
+                    self.cache.touch(article)
+                    duplicates += 1
+                else:
+                    if signature:
+                        article['metadata']['story_id'] = self.stories.add(article['url'], signature)
                     articles.append(article)
-                    self.cache.add_article(article)
-                    logging.info(f"📰 Artikel baru ditemukan: {title}")
+                    self._accepted.add(PersistentDedupStore._generate_key(article))
+                    logging.info(f"📰 Artikel baru ditemukan: {article['title']}")
+                    if (self.article_fetcher is not None and not article['metadata'].get('full_content')
+                            and self.article_fetcher.submit(article)):
+                        # Written out by _on_full_content once the page is fetched
+                        self._held_sources[base_url] = self._held_sources.get(base_url, 0) + 1
+                        continue
+                    ready.append(article)
+            self._emit(ready, self._source_category(base_url))
+            self.tracer.add('dedup', dedup_started, time.perf_counter(), domain,
+                            candidates=len(candidates), new=len(articles))
+
+            if self.blocks is not None:
+                self.blocks.update(base_url, fingerprints, processed)
+            self.metrics.observe_parse(
+                base_url, parse_seconds, len(fingerprints) or processed, processed,
+                len(candidates), duplicates, len(articles)
+            )
 
         except Exception as e:
             log_error(e, f"parse_article: {base_url}")
 
         return articles
 
-    def _extract_author(self, element) -> str:
-        """Extract author information with multiple selectors"""
-        author_selectors = [
-            '.author-name', '.post-author', 'span[rel="author"]',
-            '.byline', '.entry-author', '.penulis', '.journalist'
-        ]
-
-        for selector in author_selectors:
-            author_elem = element.select_one(selector)
-            if author_elem:
-                return clean_indo_text(author_elem.get_text())
+    def _trace_parse(self, domain: str, started: float, timings: Tuple[float, float], **args) -> None:
+        """
+        Span for one parse executor run, with the worker's tree build and
+        extraction placed at its end (the worker's clock is not ours, any
+        queueing in the pool shows as the gap before them)
+        """
+        if not self.tracer.enabled:
+            return
+        ended = time.perf_counter()
+        build, extract = timings
+        self.tracer.add('parse', started, ended, domain, **args)
+        self.tracer.add('build_tree', ended - extract - build, ended - extract, domain)
+        self.tracer.add('extract', ended - extract, ended, domain)
 
-        # Fallback to searching by class content
-        author_element = element.find(
-            ['span', 'div', 'p', 'a'],
-            class_=lambda x: isinstance(x, str) and any(
-                c in x.lower() for c in ['author', 'writer', 'penulis', 'journalist']
-            )
+    async def _extract_article_body(self, html: str, url: str) -> Optional[str]:
+        """Run the content strategies in the parse executor, in the order that worked for this domain"""
+        domain = urlparse(url).netloc
+        body, winner, timings = await self.parse_executor.run(
+            extract_article_body, html, url, self.content_extractor.order_for(domain)
         )
-        return clean_indo_text(author_element.get_text()) if author_element else "Tidak disebutkan"
+        self.content_extractor.record(domain, winner, timings)
+        return body
+
+    def _on_full_content(self, article: Dict, content: Optional[str]) -> None:
+        """Write back a body fetched by the full-article stage (None if there is none), then emit the article"""
+        if content:
+            metadata = article['metadata']
+            metadata['full_content'] = content
+            # The teaser's dateline region stays first
+            _, codes = extract_regions(content)
+            metadata['region_codes'] = list(dict.fromkeys(metadata.get('region_codes', []) + codes))
+        self._emit([article], self._source_category(article['source']))
+        held = self._held_sources.get(article['source'], 0) - 1
+        if held > 0:
+            self._held_sources[article['source']] = held
+        else:
+            self._held_sources.pop(article['source'], None)
+
+    @staticmethod
+    def _extract_metadata(element, backend: ParserBackend = SOUP_BACKEND) -> Tuple[Optional[object], Dict, bool, str]:
+        """
+        Single-pass equivalent of the title lookup and the _extract_* helpers:
+        walk the element once, then build the same metadata they would return.
+
+        Returns the title element (or None), the metadata without full_content,
+        whether a content selector matched, and the description before
+        clean_indo_text (its commas and parentheses mark datelines). Content
+        extraction strips nodes from the tree, so it is left to the caller
+        once the title is accepted.
+        """
+        slots = METADATA_SLOTS.match(backend, element)
+
+        def text_of(name: str, default: str) -> str:
+            hit = slots.get(name)
+            return clean_indo_text(backend.get_text(hit[1])) if hit else default
+
+        # Dates go to parse_indo_date as found: clean_indo_text would strip
+        # the ':', '/', '+' and '.' of times, zones and numeric dates
+        date_str = ""
+        hit = slots.get('date')
+        if hit:
+            rank, date_elem = hit
+            if rank < len(DATE_SELECTORS):
+                date_str = (
+                    backend.get_attr(date_elem, 'datetime')
+                    or backend.get_attr(date_elem, 'content')
+                    or backend.get_text(date_elem)
+                )
+            else:
+                date_str = backend.get_text(date_elem)
+
+        raw_description = ""
+        hit = slots.get('description')
+        if hit:
+            rank, desc_elem = hit
+            if rank < len(DESCRIPTION_SELECTORS):
+                raw_description = backend.get_attr(desc_elem, 'content') or backend.get_text(desc_elem)
+            else:
+                raw_description = backend.get_text(desc_elem)
+            raw_description = ' '.join(raw_description.split())
+
+        metadata = {
+            'author': text_of('author', "Tidak disebutkan"),
+            'published_date': parse_indo_date(date_str),
+            'category': text_of('category', "Umum"),
+            'description': clean_indo_text(raw_description)
+        }
+
+        title_hit = slots.get('title')
+        return (title_hit[1] if title_hit else None), metadata, 'content' in slots, raw_description
 
-    def _extract_date(self, element) -> str:
-        """Extract publication date with multiple selectors"""
-        date_selectors = [
-            'time.published', 'time.entry-date', 'span.post-date',
-            '.article-date', 'meta[property="article:published_time"]'
-        ]
+    @staticmethod
+    def _extract_author(element, backend: ParserBackend = SOUP_BACKEND) -> str:
+        """Extract author information with multiple selectors"""
+        for selector in AUTHOR_SELECTORS:
+            author_elem = backend.select_one(element, selector)
+            if author_elem is not None:
+                return clean_indo_text(backend.get_text(author_elem))
+
+        # Fallback to searching by class content
+        author_element = backend.find(element, *AUTHOR_FALLBACK)
+        return clean_indo_text(backend.get_text(author_element)) if author_element is not None else "Tidak disebutkan"
 
-        for selector in date_selectors:
-            date_elem = element.select_one(selector)
-            if date_elem:
-                date_str = date_elem.get('datetime') or date_elem.get('content') or date_elem.text
-                return clean_indo_text(date_str)
+    @staticmethod
+    def _extract_date(element, backend: ParserBackend = SOUP_BACKEND) -> str:
+        """Extract the raw publication date text for parse_indo_date, whitespace collapsed"""
+        for selector in DATE_SELECTORS:
+            date_elem = backend.select_one(element, selector)
+            if date_elem is not None:
+                date_str = (
+                    backend.get_attr(date_elem, 'datetime')
+                    or backend.get_attr(date_elem, 'content')
+                    or backend.get_text(date_elem)
+                )
+                return ' '.join(date_str.split())
 
         # Fallback to searching by class content
-        date_element = element.find(
-            ['time', 'span', 'div', 'p'],
-            class_=lambda x: isinstance(x, str) and any(
-                c in x.lower() for c in ['date', 'time', 'tanggal', 'waktu', 'published']
-            )
-        )
-        return clean_indo_text(date_element.get_text()) if date_element else ""
+        date_element = backend.find(element, *DATE_FALLBACK)
+        return ' '.join(backend.get_text(date_element).split()) if date_element is not None else ""
 
-    def _extract_category(self, element) -> str:
+    @staticmethod
+    def _extract_category(element, backend: ParserBackend = SOUP_BACKEND) -> str:
         """Extract article category with multiple selectors"""
-        category_selectors = [
-            '.article-category', '.post-category', '.entry-category',
-            '.breadcrumb .category', '.kategori', '.rubrik'
-        ]
-
-        for selector in category_selectors:
-            category_elem = element.select_one(selector)
-            if category_elem:
-                return clean_indo_text(category_elem.get_text())
-
-        category_element = element.find(
-            ['a', 'span', 'div'],
-            class_=lambda x: isinstance(x, str) and any(
-                c in x.lower() for c in ['category', 'kategori', 'rubrik', 'kanal']
-            )
-        )
-        return clean_indo_text(category_element.get_text()) if category_element else "Umum"
+        for selector in CATEGORY_SELECTORS:
+            category_elem = backend.select_one(element, selector)
+            if category_elem is not None:
+                return clean_indo_text(backend.get_text(category_elem))
+
+        category_element = backend.find(element, *CATEGORY_FALLBACK)
+        return clean_indo_text(backend.get_text(category_element)) if category_element is not None else "Umum"
 
-    def _extract_description(self, element) -> str:
+    @staticmethod
+    def _extract_description(element, backend: ParserBackend = SOUP_BACKEND) -> str:
         """Extract article description with multiple selectors"""
-        desc_selectors = [
-            '.article-excerpt', '.post-excerpt', '.entry-summary',
-            'meta[name="description"]', '.ringkasan'
-        ]
-
-        for selector in desc_selectors:
-            desc_elem = element.select_one(selector)
-            if desc_elem:
-                content = desc_elem.get('content') or desc_elem.text
-                return clean_indo_text(content)
-
-        desc_element = element.find(
-            ['p', 'div'],
-            class_=lambda x: isinstance(x, str) and any(
-                c in x.lower() for c in ['desc', 'summary', 'excerpt', 'ringkasan']
-            )
-        )
-        return clean_indo_text(desc_element.get_text()) if desc_element else ""
+        return clean_indo_text(NewsScraperAsync._extract_raw_description(element, backend))
 
-    def _extract_full_content(self, element) -> Optional[str]:
+    @staticmethod
+    def _extract_raw_description(element, backend: ParserBackend = SOUP_BACKEND) -> str:
+        """The description text before clean_indo_text, whitespace collapsed, for dateline matching"""
+        for selector in DESCRIPTION_SELECTORS:
+            desc_elem = backend.select_one(element, selector)
+            if desc_elem is not None:
+                content = backend.get_attr(desc_elem, 'content') or backend.get_text(desc_elem)
+                return ' '.join(content.split())
+
+        desc_element = backend.find(element, *DESCRIPTION_FALLBACK)
+        return ' '.join(backend.get_text(desc_element).split()) if desc_element is not None else ""
+
+    @staticmethod
+    def _extract_full_content(element, backend: ParserBackend = SOUP_BACKEND) -> Optional[str]:
         """Extract full article content if available"""
-        content_selectors = [
-            'div.article-content', 'div.entry-content', 'div.post-content',
-            'article .content', '.body-text'
-        ]
-
-        for selector in content_selectors:
-            content_elem = element.select_one(selector)
-            if content_elem:
+        for selector in CONTENT_SELECTORS:
+            content_elem = backend.select_one(element, selector)
+            if content_elem is not None:
                 # Remove unwanted elements
-                for unwanted in content_elem.find_all(['script', 'style', 'iframe', 'form']):
-                    unwanted.decompose()
+                for unwanted in backend.find_all(content_elem, ['script', 'style', 'iframe', 'form']):
+                    backend.remove(unwanted)
 
                 # Extract paragraphs
-                paragraphs = content_elem.find_all('p')
+                paragraphs = backend.find_all(content_elem, ['p'])
                 if paragraphs:
-                    content = '\n'.join(clean_indo_text(p.get_text()) for p in paragraphs)
+                    content = '\n'.join(clean_indo_text(backend.get_text(p)) for p in paragraphs)
                     return content if content.strip() else None
 
         return None
 
     async def scrape_source(self, source_url: str) -> List[Dict]:
-        """Scrape a single news source"""
-        html = await self.fetch_page(source_url)
+        """Scrape a single news source and report the outcome to the poll schedule"""
+        html = await self.fetch_page(source_url, revalidate=True, cycle_deadline=self.cycle_deadline)
+        if html is None and self.attempt_log.last_outcome(source_url) == 'budget':
+            # Not the source's fault: leave it due for the next cycle
+            logging.warning(f"Cycle time budget spent, {source_url} waits for the next cycle")
+            return []
         if not html:
+            # NOT_MODIFIED is a successful poll without news, None a failure
+            if self.poll_schedule is not None:
+                self.poll_schedule.record(source_url, 0 if html == NOT_MODIFIED else None)
             return []
 
-        await asyncio.sleep(RATE_LIMIT_DELAY)
-        return await self.parse_article(html, source_url)
+        articles = await self.parse_article(html, source_url)
+        if self.poll_schedule is not None:
+            self.poll_schedule.record(source_url, len(articles))
+        return articles
 
-    async def scrape_all_sources(self) -> List[Dict]:
-        """Scrape all configured news sources with concurrent execution"""
-        all_articles = []
+    @staticmethod
+    def source_urls() -> List[str]:
+        return [url for sources in NEWS_SOURCES.values() for url in sources]
 
-        for category, sources in NEWS_SOURCES.items():
-            tasks = []
-            for source_url in sources:
-                task = asyncio.create_task(self.scrape_source(source_url))
-                tasks.append(task)
+    async def scrape_all_sources(self, source_urls: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Scrape the given sources (default: all configured) through the
+        per-host scheduler, within CYCLE_TIME_BUDGET seconds. Returns the
+        articles written out since the last call, including those the
+        full-article stage finished in between; none with an NDJSON sink,
+        which has them already.
+        """
+        if source_urls is None:
+            source_urls = self.source_urls()
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        self.cycle_deadline = loop.time() + CYCLE_TIME_BUDGET if CYCLE_TIME_BUDGET else None
+        try:
+            results = await self.scheduler.run(source_urls, self.scrape_source)
+        finally:
+            self.cycle_deadline = None
 
-            for result in results:
-                if isinstance(result, Exception):
-                    log_error(result, "scrape_all_sources")
-                elif isinstance(result, list):
-                    all_articles.extend(result)
+        for result in results:
+            if isinstance(result, Exception):
+                log_error(result, "scrape_all_sources")
 
+        all_articles, self._unsaved = self._unsaved, []
         return all_articles
 
+    @staticmethod
+    def _source_category(source: str) -> str:
+        """Category of the configured NEWS_SOURCES entry a homepage belongs to"""
+        return next(
+            (cat for cat, urls in NEWS_SOURCES.items()
+             if any(url in source for url in urls)),
+            "Lainnya"
+        )
+
+    @staticmethod
+    def _group_stories(articles: List[Dict]) -> Dict[str, List[Dict]]:
+        """Stories covered by more than one article, e.g. a wire story republished by several sites"""
+        stories: Dict[str, List[Dict]] = {}
+        for article in articles:
+            story_id = article['metadata'].get('story_id')
+            if story_id:
+                stories.setdefault(story_id, []).append(
+                    {'title': article['title'], 'url': article['url'], 'source': article['source']}
+                )
+        return {story_id: members for story_id, members in stories.items() if len(members) > 1}
+
     def save_articles(self, articles: List[Dict]):
         """Save articles to JSON file with enhanced structure and error handling"""
         try:
@@ -335,12 +802,7 @@ class NewsScraperAsync:
             deduplicated_articles = list(unique_articles.values())
             categorized_articles = {}
             for article in deduplicated_articles:
-                source_domain = urlparse(article['source']).netloc
-                category = next(
-                    (cat for cat, urls in NEWS_SOURCES.items()
-                     if any(url in article['source'] for url in urls)),
-                    "Lainnya"
-                )
+                category = self._source_category(article['source'])
 
                 if category not in categorized_articles:
                     categorized_articles[category] = []
@@ -357,13 +819,24 @@ class NewsScraperAsync:
                         } for cat, arts in categorized_articles.items()
                     }
                 },
-                "articles": categorized_articles
+                "articles": categorized_articles,
+                "stories": self._group_stories(deduplicated_articles)
             }
+            output_data["metadata"]["total_stories"] = len(
+                {art['metadata'].get('story_id', art['url']) for art in deduplicated_articles}
+            )
 
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(output_data, f, ensure_ascii=False, indent=2)
 
-            logging.info(f"✅ Berhasil menyimpan {len(deduplicated_articles)} artikel ke {filename}")
+            if self.store is not None:
+                stored = self.store.add_articles(deduplicated_articles, self._source_category)
+                logging.info(f"🗄️ {stored} artikel baru disimpan ke {self.store.path}")
+
+            logging.info(
+                f"✅ Berhasil menyimpan {len(deduplicated_articles)} artikel "
+                f"({output_data['metadata']['total_stories']} cerita) ke {filename}"
+            )
             for category, info in output_data["metadata"]["categories"].items():
                 logging.info(f"📊 {category}: {info['count']} artikel dari {len(info['sources'])} sumber")
 
@@ -371,28 +844,256 @@ class NewsScraperAsync:
             log_error(e, "save_articles")
             logging.error(f"❌ Gagal menyimpan artikel: {str(e)}")
 
+def extract_articles(html: str, base_url: str, backend_name: Optional[str] = None,
+                     single_pass: bool = True, profile: Optional[Profile] = None) -> List[Dict]:
+    """
+    Parse homepage HTML and extract keyword-matching articles with enhanced metadata
+
+    Kept at module level and free of scraper state so it can run in a parse
+    worker process; deduplication happens afterwards in parse_article.
+    single_pass=False runs every _extract_* helper separately, which gives the
+    same output and is kept as the reference for benchmarks.
+
+    With a selector profile only its containers are visited and its title
+    selectors are tried first; otherwise every element whose class contains
+    one of ARTICLE_CLASS_HINTS is a candidate. Each article carries the
+    (container, title) selectors that found it for SelectorProfiles.learn.
+    """
+    articles, _, _ = extract_changed_articles(html, base_url, None, profile, backend_name, single_pass)
+    return articles
+
+def extract_changed_articles(html: str, base_url: str, known_blocks: Optional[AbstractSet[str]] = None,
+                             profile: Optional[Profile] = None, backend_name: Optional[str] = None,
+                             single_pass: bool = True) -> Tuple[List[Dict], List[str], int]:
+    """
+    extract_articles for incremental mode: candidate blocks whose serialized
+    HTML fingerprint is in known_blocks were processed in an earlier cycle
+    and are skipped before any metadata extraction or keyword filtering.
+
+    Returns (articles, fingerprints of every candidate block, number of
+    blocks processed). With known_blocks=None nothing is fingerprinted.
+    """
+    backend = get_backend(backend_name or PARSER_BACKEND)
+    return _extract_from_root(backend.parse(html), backend, base_url, known_blocks, profile, single_pass)
+
+def extract_changed_articles_timed(html: str, base_url: str, known_blocks: Optional[AbstractSet[str]] = None,
+                                   profile: Optional[Profile] = None) -> Tuple[List[Dict], List[str], int, Tuple[float, float]]:
+    """
+    extract_changed_articles for parse_article, plus the seconds spent
+    building the tree and extracting, measured inside the parse worker
+    """
+    backend = get_backend(PARSER_BACKEND)
+    started = time.perf_counter()
+    root = backend.parse(html)
+    built = time.perf_counter()
+    articles, fingerprints, processed = _extract_from_root(root, backend, base_url, known_blocks, profile, True)
+    return articles, fingerprints, processed, (built - started, time.perf_counter() - built)
+
+def _extract_from_root(root: Any, backend: ParserBackend, base_url: str, known_blocks: Optional[AbstractSet[str]],
+                       profile: Optional[Profile], single_pass: bool) -> Tuple[List[Dict], List[str], int]:
+    articles = []
+    fingerprints = []
+    processed = 0
+
+    # Find article elements with improved selectors
+    if profile is None:
+        article_elements = backend.find_all(root, ARTICLE_TAGS, ARTICLE_CLASS_HINTS)
+    else:
+        article_elements = backend.select(root, profile.container_group)
+
+    if known_blocks is not None:
+        fingerprints = backend.fingerprints(article_elements)
+
+    for index, element in enumerate(article_elements):
+        if known_blocks is not None and fingerprints[index] in known_blocks:
+            continue
+        processed += 1
+
+        if single_pass:
+            title_element, metadata, has_content, raw_description = NewsScraperAsync._extract_metadata(element, backend)
+            if title_element is None:
+                continue
+        else:
+            # Extract title with multiple selectors
+            title_element = backend.find(element, TITLE_TAGS)
+            if title_element is None:
+                continue
+
+        if profile is not None:
+            for selector in profile.titles:
+                found = backend.select_one(element, selector)
+                if found is not None:
+                    title_element = found
+                    break
+
+        title = clean_indo_text(backend.get_text(title_element))
+        url = normalize_url(base_url, backend.get_attr(title_element, 'href', ''))
+
+        if not title or not url:
+            continue
+
+        if not single_pass:
+            # Extract metadata with improved parsing
+            raw_description = NewsScraperAsync._extract_raw_description(element, backend)
+            metadata = {
+                'author': NewsScraperAsync._extract_author(element, backend),
+                'published_date': parse_indo_date(NewsScraperAsync._extract_date(element, backend)),
+                'category': NewsScraperAsync._extract_category(element, backend),
+                'description': clean_indo_text(raw_description)
+            }
+            has_content = True
+
+        # Extract full content if available; content blocks are rare on
+        # homepages, so the single pass skips this unless a selector matched
+        if has_content:
+            content = NewsScraperAsync._extract_full_content(element, backend)
+            if content:
+                metadata['full_content'] = content
+
+        matched_keywords = KEYWORD_MATCHER.matches(title + ' ' + metadata['description'])
+        if not matched_keywords:
+            continue
+        metadata['keywords'] = matched_keywords
+        # Locations only for articles that passed the keyword filter; the
+        # dateline needs the raw description's punctuation
+        metadata['location'], metadata['region_codes'] = extract_regions(
+            raw_description, title, metadata.get('full_content')
+        )
+
+        articles.append({
+            'title': title,
+            'url': url,
+            'source': base_url,
+            'metadata': metadata,
+            'timestamp': datetime.now().isoformat(),
+            # Popped in parse_article, not saved: MinHash for story
+            # clustering and the selectors for profile learning
+            'signature': article_signature(title, metadata['description'], metadata.get('full_content')),
+            'selectors': (
+                element_selector(backend, element, ARTICLE_CLASS_HINTS),
+                element_selector(backend, title_element)
+            )
+        })
+
+    return articles, fingerprints, processed
+
+def extract_article_body(html: str, url: str, order: Sequence[str] = STRATEGIES,
+                         backend_name: Optional[str] = None) -> Tuple[Optional[str], Optional[str], StrategyTimings]:
+    """
+    Body text of a fetched article page for the full-article stage, as
+    (body, winning strategy, per-strategy timings). Strategies are tried in
+    order: trafilatura, the CONTENT_SELECTORS of _extract_full_content, then
+    the text-density heuristic; the page is parsed once, on first need.
+    """
+    backend = get_backend(backend_name or PARSER_BACKEND)
+    parsed = []
+
+    def root():
+        if not parsed:
+            parsed.append(backend.parse(html))
+        return parsed[0]
+
+    return run_strategies(order, {
+        'trafilatura': lambda: trafilatura_body(html, url),
+        'selectors': lambda: NewsScraperAsync._extract_full_content(root(), backend),
+        'density': lambda: density_body(root(), backend),
+    })
+
 async def main():
     scraper = NewsScraperAsync()
+    metrics_runner = None
+    # Profiles land next to the articles output
+    profiler = CycleProfiler(OUTPUT_DIR if OUTPUT_MODE == 'ndjson' else '.', PROFILER)
+    profiler.install_signal_handler(asyncio.get_running_loop())
+    tracer = scraper.tracer
     try:
         await scraper.initialize()
+        if METRICS_PORT:
+            metrics_runner = await start_metrics_server(scraper.metrics.registry, METRICS_HOST, METRICS_PORT)
         while True:
-            logging.info("Starting news scraping cycle...")
+            cycle_started = time.monotonic()
+            profiler.start()
+            schedule = scraper.poll_schedule
+            if schedule is not None:
+                due = schedule.due(scraper.source_urls())
+                logging.info(f"Starting news scraping cycle for {len(due)} due sources...")
+            else:
+                due = None
+                logging.info("Starting news scraping cycle...")
 
-            articles = await scraper.scrape_all_sources()
-            if articles:
+            with tracer.span('scrape_all_sources', sources=len(due) if due is not None else None):
+                articles = await scraper.scrape_all_sources(due)
+            scraper.metrics.end_cycle(time.monotonic() - cycle_started)
+            cache = scraper.http_cache
+            logging.info(
+                f"HTTP cache: {cache.hits} hits ({cache.stats['not_modified']} not modified, "
+                f"{cache.stats['unchanged']} unchanged), {cache.stats['misses']} misses"
+            )
+            cache.save(exclude=scraper.held_sources())
+            cache.reset_stats()
+            logging.info(f"Fetches: {scraper.attempt_log.summary()}")
+            logging.info(f"HTTP: {scraper.http_stats.summary()}")
+            scraper.metrics.connection_reuse.set(scraper.http_stats.reuse_ratio)
+            scraper.http_stats.reset_stats()
+            scraper.attempt_log.reset_stats()
+            logging.info(f"Circuit breaker: {scraper.breaker.summary()}")
+            for line in scraper.breaker.report():
+                logging.info(f"  {line}")
+            scraper.breaker.save()
+            scraper.breaker.reset_stats()
+            scraper.profiles.save()
+            logging.info(f"Selector profiles: {scraper.profiles.summary()}")
+            if scraper.blocks is not None:
+                logging.info(f"Incremental parsing: {scraper.blocks.summary()}")
+                scraper.blocks.save(exclude=scraper.held_sources())
+                scraper.blocks.reset_stats()
+            if scraper.article_fetcher is not None:
+                logging.info(f"Full-article fetcher: {scraper.article_fetcher.summary()}")
+                logging.info(f"Content extraction: {scraper.content_extractor.summary()}")
+            save_started = time.perf_counter()
+            scraper.flush_dedup()
+            if scraper.parquet is not None:
+                exported = scraper.parquet.flush()
+                logging.info(f"Appended {exported} articles to Parquet dataset {scraper.parquet.base_dir}")
+            written = 0
+            if scraper.sink is not None:
+                written = scraper.sink.flush()
+                if written:
+                    logging.info(f"Successfully scraped {written} new articles into {scraper.sink.path}")
+            elif articles:
                 scraper.save_articles(articles)
                 logging.info(f"Successfully scraped {len(articles)} new articles")
-            else:
+            pending = scraper.pending_articles()
+            if pending:
+                logging.info(f"{pending} new articles are waiting for their full text")
+            elif not written and not articles:
                 logging.info("No new articles found")
+            tracer.add('save', save_started, time.perf_counter())
+
+            profile_path = profiler.stop()
+            if profile_path:
+                logging.info(f"Wrote cycle profile to {profile_path}")
+            trace_path = tracer.flush()
+            if trace_path:
+                logging.info(f"Wrote cycle trace to {trace_path}")
 
-            logging.info("Waiting for next cycle...")
-            await asyncio.sleep(300)  # 5 minutes between cycles
+            if schedule is not None:
+                logging.info(f"Poll schedule: {schedule.summary()}")
+                schedule.save()
+                schedule.reset_stats()
+                wait = schedule.seconds_until_due(scraper.source_urls())
+            else:
+                wait = POLL_DEFAULT_INTERVAL
+            logging.info(f"Waiting {wait:.0f}s for next cycle...")
+            await asyncio.sleep(max(wait, 1))
 
     except KeyboardInterrupt:
         logging.info("Shutting down gracefully...")
     except Exception as e:
         log_error(e, "main")
     finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
         await scraper.close()
 
 if __name__ == "__main__":
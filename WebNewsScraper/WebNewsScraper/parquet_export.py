@@ -0,0 +1,195 @@
+"""
+Columnar Parquet export of scraped articles for analytics
+
+Articles are flattened (title, url, source, category, metadata.*) and
+written as a hive-partitioned dataset:
+
+    <base_dir>/date=2025-06-19/category=Media%20Bisnis%20dan%20Keuangan/part-....parquet
+
+date is the article's published day when parse_indo_date produced an ISO
+date, else the day it was scraped; category is the NEWS_SOURCES group.
+
+Usage:
+    python parquet_export.py import                 # convert every articles_*.json snapshot
+    python parquet_export.py compact                # merge the per-cycle files of each partition
+"""
+import argparse
+import glob
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for the Parquet export
+    pa = None
+
+from article_store import read_snapshot
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+# Flattened columns; metadata.category is the site's own rubric, kept apart
+# from category, the NEWS_SOURCES group used for partitioning
+COLUMNS = [
+    ('title', 'string'), ('url', 'string'), ('source', 'string'),
+    ('author', 'string'), ('published_date', 'string'), ('metadata_category', 'string'),
+    ('description', 'string'), ('full_content', 'string'), ('location', 'string'),
+    ('region_codes', 'list'), ('keywords', 'list'), ('story_id', 'string'), ('timestamp', 'string'),
+]
+PARTITION_COLUMNS = ['date', 'category']
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is not installed, run 'pip install .[parquet]' to export Parquet")
+
+
+def _schema():
+    types = {'string': pa.string(), 'list': pa.list_(pa.string())}
+    return pa.schema(
+        [(name, types[kind]) for name, kind in COLUMNS]
+        + [(name, pa.string()) for name in PARTITION_COLUMNS]
+    )
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+
+
+def flatten_article(article: Dict, category: Optional[str]) -> Dict:
+    """One flat row in COLUMNS order plus the partition columns"""
+    metadata = article.get('metadata') or {}
+    published_date = metadata.get('published_date') or ''
+    day = published_date[:10] if _ISO_DATE.match(published_date) else (article.get('timestamp') or '')[:10]
+    return {
+        'title': article.get('title'),
+        'url': article.get('url'),
+        'source': article.get('source'),
+        'author': metadata.get('author'),
+        'published_date': published_date or None,
+        'metadata_category': metadata.get('category'),
+        'description': metadata.get('description'),
+        'full_content': metadata.get('full_content'),
+        'location': metadata.get('location'),
+        'region_codes': metadata.get('region_codes') or [],
+        'keywords': metadata.get('keywords') or [],
+        'story_id': metadata.get('story_id'),
+        'timestamp': article.get('timestamp'),
+        'date': day or 'unknown',
+        'category': category or 'Lainnya',
+    }
+
+
+class ParquetExporter:
+    """
+    Buffers flattened articles and appends them to the partitioned dataset
+    with flush(), normally once per scrape cycle. Every flush writes new
+    uniquely named files, so earlier cycles are never rewritten; compact()
+    merges them when a partition has collected many small files.
+    """
+
+    def __init__(self, base_dir: str = 'articles_parquet'):
+        _require_pyarrow()
+        self.base_dir = base_dir
+        self._rows: List[Dict] = []
+
+    def add(self, articles: Iterable[Dict], category: Optional[str] = None,
+            category_of: Optional[Callable[[str], str]] = None) -> None:
+        for article in articles:
+            group = category or (category_of(article.get('source') or '') if category_of else None)
+            self._rows.append(flatten_article(article, group))
+
+    def flush(self) -> int:
+        """Append buffered rows as new Parquet files and return how many were written"""
+        if not self._rows:
+            return 0
+        rows, self._rows = self._rows, []
+        table = pa.Table.from_pylist(rows, schema=_schema())
+        ds.write_dataset(
+            table, self.base_dir, format='parquet', partitioning=_partitioning(),
+            basename_template=f"part-{time.strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        return len(rows)
+
+    def compact(self) -> int:
+        """Rewrite every partition with more than one file as a single file; returns partitions merged"""
+        merged = 0
+        for directory, _, files in os.walk(self.base_dir):
+            parts = sorted(f for f in files if f.endswith('.parquet'))
+            if len(parts) < 2:
+                continue
+            paths = [os.path.join(directory, f) for f in parts]
+            table = pa.concat_tables(pq.read_table(path) for path in paths)
+            tmp_path = os.path.join(directory, f"compact-{uuid.uuid4().hex[:8]}.parquet.tmp")
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, os.path.join(directory, f"part-compacted-{uuid.uuid4().hex[:8]}.parquet"))
+            for path in paths:
+                os.remove(path)
+            merged += 1
+        return merged
+
+
+def read_articles(base_dir: str = 'articles_parquet', since: Optional[str] = None, until: Optional[str] = None,
+                  categories: Optional[List[str]] = None, columns: Optional[List[str]] = None,
+                  where=None):
+    """
+    Load the dataset into a pandas DataFrame.
+
+    since/until (YYYY-MM-DD, inclusive) and categories prune whole partition
+    directories; where is an extra pyarrow.dataset expression pushed down to
+    the Parquet row groups, e.g. ds.field('source') == 'https://www.kompas.com/'.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(base_dir, format='parquet', partitioning=_partitioning(), schema=_schema())
+    expression = where
+    for clause in (
+        ds.field('date') >= since if since else None,
+        ds.field('date') <= until if until else None,
+        ds.field('category').isin(categories) if categories else None,
+    ):
+        if clause is not None:
+            expression = clause if expression is None else expression & clause
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def import_snapshots(pattern: str = 'articles_*.json', base_dir: str = 'articles_parquet',
+                     category_of: Optional[Callable[[str], str]] = None) -> int:
+    """Convert JSON snapshots or NDJSON files into the dataset in one append (importing twice duplicates rows)"""
+    exporter = ParquetExporter(base_dir)
+    for path in sorted(glob.glob(pattern)):
+        try:
+            for article, category in read_snapshot(path):
+                exporter.add([article], category, category_of)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skipping unreadable snapshot {path}: {e}")
+    return exporter.flush()
+
+
+def main(argv=None):
+    from config import PARQUET_EXPORT_DIR
+    from news_scraper import NewsScraperAsync
+
+    parser = argparse.ArgumentParser(description="Export scraped articles to partitioned Parquet")
+    parser.add_argument('--dir', default=PARQUET_EXPORT_DIR or 'articles_parquet')
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="convert JSON snapshots or NDJSON files")
+    import_parser.add_argument('patterns', nargs='*', default=['articles_*.json'])
+    commands.add_parser('compact', help="merge the per-cycle files of each partition")
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        for pattern in args.patterns:
+            written = import_snapshots(pattern, args.dir, NewsScraperAsync._source_category)
+            print(f"{pattern}: {written} articles exported to {args.dir}")
+    else:
+        print(f"{ParquetExporter(args.dir).compact()} partitions compacted")
+
+
+if __name__ == "__main__":
+    main()
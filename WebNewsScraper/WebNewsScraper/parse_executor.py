@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+class ParseExecutor:
+    """Run CPU-bound HTML parsing inline, in a thread pool or in a process pool"""
+
+    MODES = ('inline', 'thread', 'process')
+
+    def __init__(self, mode: str = 'process', max_workers: Optional[int] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown parse executor mode '{mode}', expected one of {self.MODES}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'thread':
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logging.info(f"Started {self.mode} parse pool with {self.max_workers} workers")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run func(*args) according to the configured mode.
+
+        In process mode func and its arguments must be picklable, so pass plain
+        data (raw HTML, URLs) and return plain dicts.
+        """
+        if self.mode == 'inline':
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            logging.error("Parse worker pool died, it will be restarted on next use")
+            self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for queued parses"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,448 @@
+"""
+Pluggable HTML parser backends for article extraction.
+
+Every backend exposes the small set of tree operations the extractors need
+(find by tag and class substring, simple CSS select_one, text, attributes,
+node removal), so extraction code is written once and runs on any tree.
+"""
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional, the BeautifulSoup backend always works
+    lxml = None
+    etree = None
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+# Tags whose text BeautifulSoup's get_text() leaves out by default
+NON_CONTENT_TAGS = ('script', 'style', 'template', 'rt', 'rp')
+
+
+class SimpleSelector(NamedTuple):
+    """One compound selector: optional tag, required classes and attributes"""
+    tag: Optional[str]
+    classes: Tuple[str, ...]
+    attrs: Tuple[Tuple[str, Optional[str]], ...]
+
+
+_COMPOUND_PART = re.compile(
+    r'(?P<tag>^[a-zA-Z][\w-]*)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)(?:=(?P<quote>["\']?)(?P<value>[^"\'\]]*)(?P=quote))?\]'
+)
+
+
+@lru_cache(maxsize=256)
+def parse_selector(selector: str) -> Tuple[SimpleSelector, ...]:
+    """
+    Parse the CSS subset used by the extractors: tag, .class and [attr="value"]
+    compounds joined by the descendant combinator.
+    """
+    compounds = []
+    for token in selector.split():
+        tag, classes, attrs = None, [], []
+        position = 0
+        while position < len(token):
+            match = _COMPOUND_PART.match(token, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Unsupported selector '{selector}'")
+            if match.group('tag'):
+                tag = match.group('tag').lower()
+            elif match.group('cls'):
+                classes.append(match.group('cls'))
+            else:
+                value = match.group('value') if match.group('quote') is not None else None
+                attrs.append((match.group('attr').lower(), value))
+            position = match.end()
+        compounds.append(SimpleSelector(tag, tuple(classes), tuple(attrs)))
+    if not compounds:
+        raise ValueError("Empty selector")
+    return tuple(compounds)
+
+
+def class_matches(class_value, substrings: Sequence[str]) -> bool:
+    """Same test as the class_=lambda filters: any class contains a substring"""
+    return isinstance(class_value, str) and any(c in class_value.lower() for c in substrings)
+
+
+class ParserBackend:
+    """Interface shared by all parser backends"""
+
+    name = 'base'
+
+    def parse(self, html: str):
+        raise NotImplementedError
+
+    def find_all(self, node, tags: Sequence[str], class_substrings: Optional[Sequence[str]] = None) -> List:
+        """Descendants with one of the tags (and a matching class), in document order"""
+        raise NotImplementedError
+
+    def find(self, node, tags: Sequence[str], class_substrings: Optional[Sequence[str]] = None):
+        found = self.find_all(node, tags, class_substrings)
+        return found[0] if found else None
+
+    def select_one(self, node, selector: str):
+        raise NotImplementedError
+
+    def select(self, node, selector: str) -> List:
+        """All matches of a selector group ('a.x, div.y'), in document order"""
+        raise NotImplementedError
+
+    def get_text(self, node) -> str:
+        raise NotImplementedError
+
+    def get_attr(self, node, name: str, default=None):
+        raise NotImplementedError
+
+    def remove(self, node) -> None:
+        raise NotImplementedError
+
+    def iter_elements(self, node) -> Iterator:
+        """Descendant elements in document order, without text or comments"""
+        raise NotImplementedError
+
+    def outer_html(self, node) -> str:
+        """Serialized markup of node and its descendants"""
+        raise NotImplementedError
+
+    def fingerprints(self, nodes: Sequence) -> List[str]:
+        """Short hash of each node's markup, equal only for identical subtrees"""
+        return [_digest(self.outer_html(node).encode('utf-8', 'replace')) for node in nodes]
+
+    def tag_name(self, node) -> str:
+        raise NotImplementedError
+
+    def parent(self, node):
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup tree built by html.parser or lxml's tree builder"""
+
+    def __init__(self, features: str = 'html.parser'):
+        self.features = features
+        self.name = 'bs4' if features == 'html.parser' else f'bs4-{features}'
+
+    def parse(self, html: str):
+        return BeautifulSoup(html, self.features)
+
+    def find_all(self, node, tags, class_substrings=None):
+        if class_substrings is None:
+            return node.find_all(list(tags))
+        return node.find_all(list(tags), class_=lambda x: class_matches(x, class_substrings))
+
+    def find(self, node, tags, class_substrings=None):
+        if class_substrings is None:
+            return node.find(list(tags))
+        return node.find(list(tags), class_=lambda x: class_matches(x, class_substrings))
+
+    def select_one(self, node, selector):
+        return node.select_one(selector)
+
+    def select(self, node, selector):
+        compounds = [parse_selector(part.strip()) for part in selector.split(',')]
+        if any(len(c) > 1 or c[0].attrs for c in compounds):
+            return node.select(selector)
+
+        # Plain tag.class groups: one find_all walk beats soupsieve
+        simple = [(c[0].tag, set(c[0].classes)) for c in compounds]
+
+        def matches(tag):
+            classes = tag.get('class') or ()
+            return any((name is None or tag.name == name) and wanted.issubset(classes) for name, wanted in simple)
+
+        return node.find_all(matches)
+
+    def get_text(self, node):
+        return node.get_text()
+
+    def get_attr(self, node, name, default=None):
+        value = node.get(name, default)
+        # Multi-valued attributes (class, rel) come back as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def remove(self, node):
+        node.decompose()
+
+    def iter_elements(self, node):
+        return (d for d in node.descendants if isinstance(d, Tag))
+
+    def outer_html(self, node):
+        return node.decode(formatter=None)
+
+    def fingerprints(self, nodes):
+        # Candidate blocks nest, and serializing each one separately would
+        # re-serialize the inner ones at every level; hash bottom-up instead,
+        # every node once, from its tag, attributes, text and child hashes
+        memo: Dict[int, bytes] = {}
+
+        def digest(node) -> bytes:
+            key = id(node)
+            if key not in memo:
+                h = hashlib.blake2b(digest_size=8)
+                h.update(f"<{node.name} {sorted(node.attrs.items())}>".encode('utf-8', 'replace'))
+                for child in node.children:
+                    h.update(digest(child) if isinstance(child, Tag) else str(child).encode('utf-8', 'replace'))
+                memo[key] = h.digest()
+            return memo[key]
+
+        return [digest(node).hex() for node in nodes]
+
+    def tag_name(self, node):
+        return node.name
+
+    def parent(self, node):
+        return node.parent
+
+
+def _xpath_literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _compound_xpath(compound: SimpleSelector) -> str:
+    conditions = []
+    for cls in compound.classes:
+        conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), {_xpath_literal(' ' + cls + ' ')})")
+    for attr, value in compound.attrs:
+        conditions.append(f"@{attr}" if value is None else f"@{attr}={_xpath_literal(value)}")
+    return (compound.tag or '*') + ''.join(f'[{condition}]' for condition in conditions)
+
+
+def selector_to_xpath(selector: str) -> str:
+    """
+    Translate a simple selector into a relative XPath. Ancestor compounds may
+    match above the context node, which is how soupsieve scopes select_one.
+    """
+    compounds = parse_selector(selector)
+    path = _compound_xpath(compounds[-1])
+    ancestors = ''
+    for compound in reversed(compounds[:-1]):
+        ancestors = f"ancestor::{_compound_xpath(compound)}" + (f"[{ancestors}]" if ancestors else '')
+    if ancestors:
+        path += f"[{ancestors}]"
+    return './/' + path
+
+
+class LxmlBackend(ParserBackend):
+    """Native lxml tree queried through precompiled XPath expressions"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("lxml is not installed")
+        self._xpaths: Dict[str, 'etree.XPath'] = {}
+        excluded = ' or '.join(f'ancestor::{tag}' for tag in NON_CONTENT_TAGS)
+        self._text_xpath = etree.XPath(f'.//text()[not({excluded})]')
+
+    def _xpath(self, expression: str):
+        compiled = self._xpaths.get(expression)
+        if compiled is None:
+            compiled = self._xpaths[expression] = etree.XPath(expression)
+        return compiled
+
+    def parse(self, html: str):
+        if not html or not html.strip():
+            return lxml.html.document_fromstring('<html></html>')
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # str input with an XML encoding declaration is rejected by lxml
+            return lxml.html.document_fromstring(html.encode('utf-8'))
+
+    def find_all(self, node, tags, class_substrings=None):
+        tag_test = ' or '.join(f'self::{tag}' for tag in tags)
+        if class_substrings is None:
+            return self._xpath(f'.//*[{tag_test}]')(node)
+        candidates = self._xpath(f'.//*[{tag_test}][@class]')(node)
+        return [el for el in candidates if class_matches(el.get('class'), class_substrings)]
+
+    def find(self, node, tags, class_substrings=None):
+        tag_test = ' or '.join(f'self::{tag}' for tag in tags)
+        if class_substrings is None:
+            found = self._xpath(f'(.//*[{tag_test}])[1]')(node)
+            return found[0] if found else None
+        for el in self._xpath(f'.//*[{tag_test}][@class]')(node):
+            if class_matches(el.get('class'), class_substrings):
+                return el
+        return None
+
+    def select_one(self, node, selector):
+        found = self._xpath(f'({selector_to_xpath(selector)})[1]')(node)
+        return found[0] if found else None
+
+    def select(self, node, selector):
+        # An XPath union comes back in document order, like soupsieve's select
+        return self._xpath(' | '.join(selector_to_xpath(part.strip()) for part in selector.split(',')))(node)
+
+    def get_text(self, node):
+        return ''.join(self._text_xpath(node))
+
+    def get_attr(self, node, name, default=None):
+        return node.get(name, default)
+
+    def remove(self, node):
+        node.drop_tree()
+
+    def iter_elements(self, node):
+        return node.iterdescendants(etree.Element)
+
+    def outer_html(self, node):
+        return lxml.html.tostring(node, encoding='unicode', with_tail=False)
+
+    def tag_name(self, node):
+        return node.tag
+
+    def parent(self, node):
+        return node.getparent()
+
+
+class SlotMatcher:
+    """
+    Classify the descendants of an element into extraction slots in one walk.
+
+    Each slot has an ordered list of selectors plus an optional fallback of
+    (tags, class substrings). For every slot match() returns the rank of the
+    best rule that matched and the first node in document order for it, which
+    is what calling select_one per selector and then find() would return.
+    """
+
+    def __init__(self, slots: Dict[str, Tuple[Sequence[str], Optional[Tuple[Sequence[str], Optional[Sequence[str]]]]]]):
+        self.slots = list(slots)
+        self._by_class: Dict[str, List[Tuple[str, int, Tuple[SimpleSelector, ...]]]] = {}
+        self._by_tag: Dict[str, List[Tuple[str, int, Tuple[SimpleSelector, ...]]]] = {}
+        self._unindexed: List[Tuple[str, int, Tuple[SimpleSelector, ...]]] = []
+        self._fallbacks: Dict[str, List[Tuple[str, int, Optional[Sequence[str]]]]] = {}
+
+        for slot, (selectors, fallback) in slots.items():
+            for rank, selector in enumerate(selectors):
+                compounds = parse_selector(selector)
+                rule = (slot, rank, compounds)
+                last = compounds[-1]
+                if last.classes:
+                    self._by_class.setdefault(last.classes[0], []).append(rule)
+                elif last.tag:
+                    self._by_tag.setdefault(last.tag, []).append(rule)
+                else:
+                    self._unindexed.append(rule)
+            if fallback is not None:
+                tags, substrings = fallback
+                for tag in tags:
+                    self._fallbacks.setdefault(tag, []).append((slot, len(selectors), substrings))
+
+    @staticmethod
+    def _compound_matches(backend: ParserBackend, node, tag: str, tokens, compound: SimpleSelector) -> bool:
+        if compound.tag and compound.tag != tag:
+            return False
+        if any(cls not in tokens for cls in compound.classes):
+            return False
+        for attr, value in compound.attrs:
+            actual = backend.get_attr(node, attr)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+
+    def _rule_matches(self, backend: ParserBackend, node, tag: str, tokens, compounds) -> bool:
+        if not self._compound_matches(backend, node, tag, tokens, compounds[-1]):
+            return False
+        ancestor = backend.parent(node)
+        for compound in reversed(compounds[:-1]):
+            while ancestor is not None:
+                class_value = backend.get_attr(ancestor, 'class')
+                ancestor_tokens = class_value.split() if class_value else ()
+                if self._compound_matches(backend, ancestor, backend.tag_name(ancestor), ancestor_tokens, compound):
+                    break
+                ancestor = backend.parent(ancestor)
+            if ancestor is None:
+                return False
+            ancestor = backend.parent(ancestor)
+        return True
+
+    def match(self, backend: ParserBackend, element) -> Dict[str, Tuple[int, object]]:
+        """Map each slot that matched to (rank, node)"""
+        best: Dict[str, Tuple[int, object]] = {}
+        remaining = len(self.slots)
+
+        for node in backend.iter_elements(element):
+            tag = backend.tag_name(node)
+            class_value = backend.get_attr(node, 'class')
+            tokens = class_value.split() if class_value else ()
+
+            rules = list(self._unindexed)
+            for token in tokens:
+                rules.extend(self._by_class.get(token, ()))
+            rules.extend(self._by_tag.get(tag, ()))
+            for slot, rank, compounds in rules:
+                current = best.get(slot)
+                if current is not None and current[0] <= rank:
+                    continue
+                if self._rule_matches(backend, node, tag, tokens, compounds):
+                    best[slot] = (rank, node)
+                    if rank == 0:
+                        remaining -= 1
+
+            for slot, rank, substrings in self._fallbacks.get(tag, ()):
+                current = best.get(slot)
+                if current is not None and current[0] <= rank:
+                    continue
+                if substrings is None or class_matches(class_value, substrings):
+                    best[slot] = (rank, node)
+                    if rank == 0:
+                        remaining -= 1
+
+            if remaining == 0:
+                break
+
+        return best
+
+
+SOUP_BACKEND = SoupBackend('html.parser')
+_BACKENDS: Dict[str, ParserBackend] = {SOUP_BACKEND.name: SOUP_BACKEND, 'html.parser': SOUP_BACKEND}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends usable in this environment"""
+    names = ['bs4']
+    if lxml is not None:
+        names += ['bs4-lxml', 'lxml']
+    return names
+
+
+def get_backend(name: str) -> ParserBackend:
+    """Return a shared backend instance, falling back to bs4 when lxml is missing"""
+    backend = _BACKENDS.get(name)
+    if backend is not None:
+        return backend
+
+    if name in ('lxml', 'bs4-lxml') and lxml is None:
+        logging.warning(f"Parser backend '{name}' needs lxml, falling back to html.parser")
+        backend = SOUP_BACKEND
+    elif name == 'lxml':
+        backend = LxmlBackend()
+    elif name == 'bs4-lxml':
+        backend = SoupBackend('lxml')
+    else:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {available_backends()}")
+
+    _BACKENDS[name] = backend
+    return backend
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """BeautifulSoup with the fastest available tree builder"""
+    return BeautifulSoup(html, 'lxml' if lxml is not None else 'html.parser')
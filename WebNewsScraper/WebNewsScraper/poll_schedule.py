@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import time
+from statistics import median
+from typing import Dict, List, Optional
+
+
+class PollSchedule:
+    """
+    Per-source homepage poll intervals adapted to how often each source
+    publishes.
+
+    Every successful poll updates an exponentially weighted estimate of the
+    source's rate of new (non-duplicate) articles per second, and the next
+    interval is the time expected to bring target_articles new ones, kept
+    within [min_interval, max_interval]. A poll without new articles lowers
+    the estimate, so quiet sources back off geometrically; a failed poll
+    doubles the wait per consecutive failure without touching the estimate.
+    Times are wall-clock so the schedule survives restarts via path.
+    """
+
+    def __init__(self, path: Optional[str] = 'poll_schedule.json', min_interval: float = 60,
+                 max_interval: float = 3600, default_interval: float = 300,
+                 target_articles: float = 1.0, smoothing: float = 0.3):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.target_articles = target_articles
+        self.smoothing = smoothing
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'polls': 0, 'failures': 0, 'new_articles': 0}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable poll schedule {self.path}: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Write the schedule to disk atomically"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save poll schedule {self.path}: {e}")
+
+    def _entry(self, url: str) -> Dict:
+        return self.entries.setdefault(url, {
+            'interval': self.default_interval, 'next_due': 0.0, 'last_success': None,
+            'rate': None, 'failures': 0
+        })
+
+    def due(self, urls: List[str], now: Optional[float] = None) -> List[str]:
+        """URLs whose next poll time has come (never-polled sources are due at once)"""
+        now = time.time() if now is None else now
+        return [url for url in urls if self._entry(url)['next_due'] <= now]
+
+    def seconds_until_due(self, urls: List[str], now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        if not urls:
+            return self.default_interval
+        return max(0.0, min(self._entry(url)['next_due'] for url in urls) - now)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record(self, url: str, new_articles: Optional[int], now: Optional[float] = None) -> float:
+        """
+        Record a poll: new_articles is the number of new articles it yielded
+        (0 for an unchanged page) or None when the fetch failed. Returns the
+        interval until the source's next poll.
+        """
+        now = time.time() if now is None else now
+        entry = self._entry(url)
+        self.stats['polls'] += 1
+
+        if new_articles is None:
+            self.stats['failures'] += 1
+            entry['failures'] += 1
+            interval = self._clamp(entry['interval'] * 2 ** entry['failures'])
+        else:
+            self.stats['new_articles'] += new_articles
+            entry['failures'] = 0
+            if entry['last_success'] is not None and now > entry['last_success']:
+                sample = new_articles / (now - entry['last_success'])
+                # Until measured, assume the default interval was about right
+                rate = entry['rate'] if entry['rate'] is not None else self.target_articles / self.default_interval
+                entry['rate'] = self.smoothing * sample + (1 - self.smoothing) * rate
+                entry['interval'] = (
+                    self._clamp(self.target_articles / entry['rate']) if entry['rate'] else self.max_interval
+                )
+            entry['last_success'] = now
+            interval = entry['interval']
+
+        entry['next_due'] = now + interval
+        return interval
+
+    def summary(self) -> str:
+        intervals = [entry['interval'] for entry in self.entries.values()]
+        if not intervals:
+            return "no sources polled yet"
+        failing = sum(1 for entry in self.entries.values() if entry['failures'])
+        return (
+            f"{self.stats['polls']} polls ({self.stats['failures']} failed, {self.stats['new_articles']} new articles), "
+            f"intervals {min(intervals):.0f}s-{max(intervals):.0f}s (median {median(intervals):.0f}s), "
+            f"{failing} sources backing off"
+        )
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
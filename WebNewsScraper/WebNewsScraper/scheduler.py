@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+from urllib.parse import urlparse
+
+
+class HostScheduler:
+    """
+    Global work queue with a concurrency cap and per-host politeness slots.
+
+    The host slot methods are public so other stages fetching from the same
+    sites (e.g. the full-article fetcher) share one politeness budget.
+    """
+
+    def __init__(self, max_concurrency: int = 10, per_host_limit: int = 1, host_delay: float = 15):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.host_delay = host_delay
+        self._host_next_start: Dict[str, float] = {}
+        self._host_active: Dict[str, int] = {}
+
+    def host_wait(self, domain: str, now: float) -> float:
+        """Seconds until the host has a free slot and its politeness delay has passed"""
+        wait = self._host_next_start.get(domain, 0.0) - now
+        if self._host_active.get(domain, 0) >= self.per_host_limit:
+            wait = max(wait, self.host_delay or 1.0)
+        return max(wait, 0.0)
+
+    def acquire_host(self, domain: str, now: float) -> None:
+        """Take a slot on domain; call release_host when the request is done"""
+        self._host_active[domain] = self._host_active.get(domain, 0) + 1
+        self._host_next_start[domain] = now + self.host_delay
+
+    def release_host(self, domain: str) -> None:
+        self._host_active[domain] = max(self._host_active.get(domain, 1) - 1, 0)
+
+    async def run(self, urls: List[str], handler: Callable[[str], Awaitable[Any]]) -> List[Any]:
+        """
+        Run handler(url) for every URL through a single queue.
+
+        Workers never sleep on a busy host: a URL whose host is not ready yet is
+        re-queued for the moment its slot opens, so other hosts keep flowing.
+        Exceptions raised by the handler are returned in the result list.
+        """
+        if not urls:
+            return []
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        results: List[Any] = []
+        remaining = len(urls)
+        finished = asyncio.Event()
+
+        for url in urls:
+            queue.put_nowait(url)
+
+        async def worker():
+            nonlocal remaining
+            while True:
+                url = await queue.get()
+                domain = urlparse(url).netloc
+                wait = self.host_wait(domain, loop.time())
+                if wait > 0:
+                    loop.call_later(wait, queue.put_nowait, url)
+                    continue
+
+                self.acquire_host(domain, loop.time())
+                try:
+                    results.append(await handler(url))
+                except Exception as e:
+                    results.append(e)
+                finally:
+                    self.release_host(domain)
+                    remaining -= 1
+                    if remaining == 0:
+                        finished.set()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_concurrency, len(urls)))
+        ]
+        try:
+            await finished.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        logging.info(f"Scheduler finished {len(urls)} sources across {len(self._host_next_start)} hosts")
+        return results
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+from parser_backends import ParserBackend
+
+# Class tokens usable in the simple selector syntax of parser_backends
+_SAFE_CLASS = re.compile(r'^[A-Za-z_][\w-]*$')
+
+
+class Profile(NamedTuple):
+    """Exact selectors for one site: article containers and titles inside them"""
+    containers: Tuple[str, ...]
+    titles: Tuple[str, ...]
+
+    @property
+    def container_group(self) -> str:
+        return ', '.join(self.containers)
+
+
+def element_selector(backend: ParserBackend, element, hints: Optional[Sequence[str]] = None) -> str:
+    """
+    tag.class selector for element: the first class containing one of hints
+    (the token that made a generic class-substring match) or, without hints,
+    its first class; just the tag when no class is usable.
+    """
+    tag = backend.tag_name(element)
+    for token in (backend.get_attr(element, 'class') or '').split():
+        if not _SAFE_CLASS.match(token):
+            continue
+        if hints is None or any(hint in token.lower() for hint in hints):
+            return f"{tag}.{token}"
+    return tag
+
+
+class SelectorProfiles:
+    """
+    Per-domain extraction profiles, declared or learned from generic passes.
+
+    A generic pass reports the (container, title) selectors of every article
+    that matched the keywords and they become the domain's profile; later
+    cycles select only those containers. When a profiled pass yields nothing
+    the caller re-runs the generic pass (see record), and every refresh_every
+    profiled passes a generic pass runs anyway so new page sections are
+    picked up. Declared profiles (config SELECTOR_PROFILES) are never
+    replaced by learning. Learned profiles persist to path as JSON.
+    """
+
+    def __init__(self, path: Optional[str] = 'selector_profiles.json',
+                 declared: Optional[Dict[str, Dict]] = None, refresh_every: int = 12):
+        self.path = path
+        self.refresh_every = refresh_every
+        self.declared = {
+            domain: Profile(tuple(spec.get('containers', ())), tuple(spec.get('titles', ())))
+            for domain, spec in (declared or {}).items()
+        }
+        self.learned: Dict[str, Profile] = {}
+        self._profiled_runs: Dict[str, int] = {}
+        self.stats = {'profiled': 0, 'generic': 0, 'fallbacks': 0, 'learned': 0}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.learned = {
+                domain: Profile(tuple(spec['containers']), tuple(spec['titles']))
+                for domain, spec in data.items()
+            }
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable selector profiles {self.path}: {e}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {domain: profile._asdict() for domain, profile in self.learned.items()},
+                f, ensure_ascii=False, indent=2
+            )
+        os.replace(tmp_path, self.path)
+
+    def has_profile(self, domain: str) -> bool:
+        return domain in self.declared or domain in self.learned
+
+    def get(self, domain: str) -> Optional[Profile]:
+        """Profile to use for this pass, or None to run the generic pass"""
+        profile = self.declared.get(domain) or self.learned.get(domain)
+        if profile is None or not profile.containers:
+            return None
+        runs = self._profiled_runs.get(domain, 0)
+        if domain not in self.declared and runs >= self.refresh_every:
+            self._profiled_runs[domain] = 0
+            return None
+        self._profiled_runs[domain] = runs + 1
+        return profile
+
+    def learn(self, domain: str, observations: Iterable[Tuple[str, str]]) -> None:
+        """Replace a learned profile with the selectors seen in a generic pass"""
+        observations = list(observations)
+        if domain in self.declared or not observations:
+            return
+        profile = Profile(
+            tuple(sorted({container for container, _ in observations})),
+            tuple(sorted({title for _, title in observations}))
+        )
+        if self.learned.get(domain) != profile:
+            self.learned[domain] = profile
+            self.stats['learned'] += 1
+            logging.info(f"Learned selector profile for {domain}: {profile.container_group}")
+
+    def record(self, domain: str, profiled: bool, produced: int) -> bool:
+        """
+        Count a pass; returns True when a profiled pass produced nothing and
+        the caller should fall back to the generic pass for this page.
+        """
+        if not profiled:
+            self.stats['generic'] += 1
+            return False
+        self.stats['profiled'] += 1
+        if produced:
+            return False
+        self.stats['fallbacks'] += 1
+        self._profiled_runs[domain] = 0
+        return True
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.learned)} learned and {len(self.declared)} declared profiles, "
+            f"{self.stats['profiled']} profiled and {self.stats['generic']} generic passes, "
+            f"{self.stats['fallbacks']} fallbacks"
+        )
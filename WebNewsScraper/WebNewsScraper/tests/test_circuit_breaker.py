@@ -0,0 +1,64 @@
+"""Circuit breaker state transitions"""
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+DOMAIN = 'www.example.com'
+
+
+def _opened(now=1000.0):
+    breaker = CircuitBreaker(None, window=4, min_requests=4, error_rate=0.5, open_seconds=60, max_open_seconds=240)
+    for ok in (True, True, False):
+        breaker.record(DOMAIN, ok, now=now)
+    assert breaker.state(DOMAIN) == CLOSED and breaker.allow(DOMAIN, now) == (True, None)
+    breaker.record(DOMAIN, False, error='HTTP 503', now=now)
+    assert breaker.state(DOMAIN) == OPEN
+    return breaker
+
+
+def test_open_refuses_until_the_period_ends():
+    breaker = _opened()
+    assert breaker.allow(DOMAIN, 1059.0) == (False, None)
+    allowed, probe = breaker.allow(DOMAIN, 1060.0)
+    assert allowed and probe is not None and breaker.state(DOMAIN) == HALF_OPEN
+    # One probe at a time
+    assert breaker.allow(DOMAIN, 1061.0) == (False, None)
+
+
+def test_probe_success_closes():
+    breaker = _opened()
+    _, probe = breaker.allow(DOMAIN, 1060.0)
+    breaker.record(DOMAIN, True, now=1061.0, probe=probe)
+    assert breaker.state(DOMAIN) == CLOSED and breaker.entries[DOMAIN]['opens'] == 0
+
+
+def test_probe_failure_reopens_for_longer():
+    breaker = _opened()
+    _, probe = breaker.allow(DOMAIN, 1060.0)
+    breaker.record(DOMAIN, False, error='timeout', now=1061.0, probe=probe)
+    assert breaker.state(DOMAIN) == OPEN
+    assert breaker.entries[DOMAIN]['open_until'] == 1061.0 + 120
+
+
+def test_late_result_does_not_decide_half_open():
+    breaker = _opened()
+    _, probe = breaker.allow(DOMAIN, 1060.0)
+    # A request sent before the circuit opened finishes during the probe
+    breaker.record(DOMAIN, True, now=1061.0)
+    breaker.record(DOMAIN, False, now=1061.0, probe=probe + 1)
+    assert breaker.state(DOMAIN) == HALF_OPEN
+    breaker.record(DOMAIN, False, now=1062.0, probe=probe)
+    assert breaker.state(DOMAIN) == OPEN
+
+
+def test_released_probe_lets_the_next_request_probe():
+    breaker = _opened()
+    _, probe = breaker.allow(DOMAIN, 1060.0)
+    breaker.release(DOMAIN, probe)
+    allowed, second = breaker.allow(DOMAIN, 1061.0)
+    assert allowed and second != probe
+    # The first probe's token no longer counts, nor releases the second
+    breaker.release(DOMAIN, probe)
+    assert breaker.allow(DOMAIN, 1061.0) == (False, None)
+    breaker.record(DOMAIN, True, now=1062.0, probe=probe)
+    assert breaker.state(DOMAIN) == HALF_OPEN
+    breaker.record(DOMAIN, True, now=1062.0, probe=second)
+    assert breaker.state(DOMAIN) == CLOSED
@@ -0,0 +1,78 @@
+"""Published dates through the extraction pipeline, not only parse_indo_date"""
+from datetime import datetime
+
+import pytest
+
+from id_helpers import JAKARTA, parse_indo_datetime
+from news_scraper import ARTICLE_CLASS_HINTS, ARTICLE_TAGS, NewsScraperAsync, extract_articles
+from parser_backends import get_backend
+
+BACKENDS = ['bs4', 'lxml']
+
+CASES = [
+    # (date markup inside the teaser, expected published_date)
+    ('<time class="published" datetime="">17 Feb 2025 20:29 WIB</time>', '2025-02-17T20:29:00+07:00'),
+    ('<time class="published" datetime="2025-02-17T23:30:00Z">17 Feb</time>', '2025-02-18T06:30:00+07:00'),
+    ('<meta property="article:published_time" content="2025-02-17T20:29:00+07:00">', '2025-02-17T20:29:00+07:00'),
+    ('<span class="date">17/02/2025 20.29</span>', '2025-02-17T20:29:00+07:00'),
+    ('<span class="post-date">Senin, 17 Feb 2025 | 20:29 WITA</span>', '2025-02-17T19:29:00+07:00'),
+    ('<span class="tanggal">\n  Senin, 17 Februari 2025\n</span>', '2025-02-17T00:00:00+07:00'),
+]
+
+
+def _teaser(date_html: str) -> str:
+    return (
+        '<html><body><div class="article-item">'
+        '<a href="/read/1">Ekonomi Jawa Barat tumbuh</a>'
+        f'{date_html}<p class="article-excerpt">JAKARTA, KOMPAS.com - Ekonomi tumbuh.</p>'
+        '</div></body></html>'
+    )
+
+
+def _block(backend, html: str):
+    return backend.find_all(backend.parse(html), ARTICLE_TAGS, ARTICLE_CLASS_HINTS)[0]
+
+
+@pytest.mark.parametrize('backend_name', BACKENDS)
+@pytest.mark.parametrize('date_html, expected', CASES)
+def test_extract_metadata_keeps_time_and_zone(backend_name, date_html, expected):
+    backend = get_backend(backend_name)
+    _, metadata, _, _ = NewsScraperAsync._extract_metadata(_block(backend, _teaser(date_html)), backend)
+    assert metadata['published_date'] == expected
+
+
+@pytest.mark.parametrize('backend_name', BACKENDS)
+@pytest.mark.parametrize('date_html, expected', CASES)
+def test_per_helper_path_matches(backend_name, date_html, expected):
+    from id_helpers import parse_indo_date
+
+    backend = get_backend(backend_name)
+    assert parse_indo_date(NewsScraperAsync._extract_date(_block(backend, _teaser(date_html)), backend)) == expected
+
+
+@pytest.mark.parametrize('single_pass', [True, False])
+def test_extract_articles_published_date(single_pass):
+    html = _teaser('<time class="published" datetime="2025-02-17T23:30:00Z"></time>')
+    articles = extract_articles(html, 'https://www.kompas.com/', 'bs4', single_pass)
+    assert [a['metadata']['published_date'] for a in articles] == ['2025-02-18T06:30:00+07:00']
+
+
+def test_unparsed_date_is_kept_readable():
+    backend = get_backend('bs4')
+    _, metadata, _, _ = NewsScraperAsync._extract_metadata(
+        _block(backend, _teaser('<span class="date">\n Edisi  khusus </span>')), backend)
+    assert metadata['published_date'] == 'Edisi khusus'
+
+
+NOW = datetime(2026, 10, 18, 15, 0, tzinfo=JAKARTA)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Kemarin 10:00', '2026-10-17T10:00:00+07:00'),
+    ('kemarin pukul 08.30 WIB', '2026-10-17T08:30:00+07:00'),
+    ('Kemarin, 09:15 WITA', '2026-10-17T08:15:00+07:00'),
+    ('Kemarin', '2026-10-17T15:00:00+07:00'),
+    ('3 jam yang lalu', '2026-10-18T12:00:00+07:00'),
+])
+def test_relative_dates_keep_explicit_time(text, expected):
+    assert parse_indo_datetime(text, now=NOW).isoformat() == expected
@@ -0,0 +1,71 @@
+"""Dedup store expiry and the Bloom filter in front of it"""
+import time
+
+import news_scraper
+from bloom_filter import BloomFilter
+from dedup_store import PersistentDedupStore
+from utils import MemoryCache
+
+ARTICLE = {'title': 'Banjir di Bekasi', 'url': 'https://example.com/read/1'}
+OTHER = {'title': 'Harga beras naik', 'url': 'https://example.com/read/2'}
+
+
+def test_store_expires_after_ttl(tmp_path):
+    store = PersistentDedupStore(str(tmp_path / 'dedup.sqlite3'), ttl_seconds=60)
+    store.add_article(ARTICLE)
+    assert store.is_duplicate(ARTICLE)
+    assert store.expire(now=time.time() + 30) == []
+    assert store.expire(now=time.time() + 120) == [PersistentDedupStore._generate_key(ARTICLE)]
+    assert not store.is_duplicate(ARTICLE)
+    assert len(store) == 0
+    store.close()
+
+
+def test_touch_pushes_back_expiry(tmp_path):
+    store = PersistentDedupStore(str(tmp_path / 'dedup.sqlite3'), ttl_seconds=60)
+    store.add_article(ARTICLE)
+    store.add_article(OTHER)
+    store.ttl_seconds = 600
+    store.touch(ARTICLE)
+    assert store.expire(now=time.time() + 120) == [PersistentDedupStore._generate_key(OTHER)]
+    assert store.is_duplicate(ARTICLE)
+    store.close()
+
+
+def test_store_survives_reopen(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite3')
+    store = PersistentDedupStore(path)
+    store.add_article(ARTICLE)
+    store.close()
+    store = PersistentDedupStore(path)
+    assert store.is_duplicate(ARTICLE) and not store.is_duplicate(OTHER)
+    assert list(store.iter_keys()) == [PersistentDedupStore._generate_key(ARTICLE)]
+    store.close()
+
+
+def test_bloom_roundtrip(tmp_path):
+    path = str(tmp_path / 'dedup.bloom')
+    bloom = BloomFilter.build(1000, 0.01, [b'a' * 16, b'b' * 16])
+    bloom.save(path)
+    loaded = BloomFilter.open(path, 1000, 0.01, max_age=3600)
+    assert b'a' * 16 in loaded and b'b' * 16 in loaded
+    assert (loaded.count, loaded.built_at) == (2, bloom.built_at)
+    # Different sizing or an expired filter is rebuilt from the seed keys
+    assert BloomFilter.open(path, 2000, 0.01, [b'c' * 16]).count == 1
+    assert BloomFilter.open(path, 1000, 0.01, [], max_age=0).count == 0
+
+
+def test_bloom_only_with_persistent_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(news_scraper, 'DEDUP_STORE_FILE', None)
+    scraper = news_scraper.NewsScraperAsync()
+    assert isinstance(scraper.cache, MemoryCache) and scraper.bloom is None
+    scraper.flush_dedup()
+    assert not (tmp_path / 'dedup.bloom').exists()
+
+    monkeypatch.setattr(news_scraper, 'DEDUP_STORE_FILE', str(tmp_path / 'dedup.sqlite3'))
+    scraper = news_scraper.NewsScraperAsync()
+    scraper.remember(ARTICLE)
+    scraper.flush_dedup()
+    assert PersistentDedupStore._generate_key(ARTICLE) in BloomFilter.load(str(tmp_path / 'dedup.bloom'))
+    scraper.cache.close()
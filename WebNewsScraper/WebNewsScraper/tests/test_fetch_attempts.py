@@ -0,0 +1,39 @@
+"""Retry-After parsing and the bounded attempt log"""
+from email.utils import formatdate
+
+import pytest
+
+from fetch_attempts import Attempt, AttemptLog, retry_after_seconds
+
+NOW = 1_790_000_000.0
+
+
+@pytest.mark.parametrize('value, seconds', [
+    ('120', 120.0),
+    (' 5 ', 5.0),
+    (formatdate(NOW + 90, usegmt=True), 90.0),
+    (formatdate(NOW - 3600, usegmt=True), 0.0),  # a date in the past means retry now
+    (None, None),
+    ('', None),
+    ('soon', None),
+    ('-5', None),
+])
+def test_retry_after_seconds(value, seconds):
+    assert retry_after_seconds(value, now=NOW) == seconds
+
+
+def test_attempt_log_keeps_recent_urls_only():
+    log = AttemptLog(history=3, max_urls=100)
+    log.record('https://www.kompas.com/', 'ok', [Attempt(200, None, 0.1, 0.0)])
+    for i in range(500):
+        log.record(f'https://www.kompas.com/read/{i}', 'ok', [Attempt(200, None, 0.1, 0.0)])
+        if i % 10 == 0:
+            # Homepages are fetched every cycle and stay
+            log.record('https://www.kompas.com/', 'not_modified', [Attempt(304, None, 0.1, 0.0)])
+    assert len(log.requests) == 100
+    assert log.last_outcome('https://www.kompas.com/') == 'not_modified'
+    assert len(log.requests['https://www.kompas.com/']) == 3
+    assert log.last_outcome('https://www.kompas.com/read/0') is None
+    assert log.last_outcome('https://www.kompas.com/read/499') == 'ok'
+    # Totals still count every request
+    assert log.stats['requests'] == 551 and log.outcomes['ok'] == 501
@@ -0,0 +1,59 @@
+"""Articles waiting for the full-article stage hold back their homepage's saved state"""
+import asyncio
+import json
+
+import news_scraper
+
+SOURCE = 'https://www.kompas.com/'
+PAGE = (
+    '<html><body><div class="article-item">'
+    '<a href="/read/1">Ekonomi warga tumbuh</a>'
+    '<p class="article-excerpt">Pertumbuhan ekonomi warga.</p>'
+    '</div></body></html>'
+)
+
+
+def _saved(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_pending_articles_hold_back_validators_and_fingerprints(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(news_scraper, 'DEDUP_STORE_FILE', None)
+    monkeypatch.setattr(news_scraper, 'FETCH_FULL_ARTICLES', True)
+    monkeypatch.setattr(news_scraper, 'OUTPUT_MODE', 'json')
+
+    async def run():
+        scraper = news_scraper.NewsScraperAsync()
+        fetcher = scraper.article_fetcher
+        never = asyncio.Event()
+
+        async def fetch(url):
+            await never.wait()
+        fetcher.fetch = fetch
+        fetcher.start()
+
+        scraper.http_cache.store(SOURCE, {'ETag': '"v1"'}, PAGE)
+        articles = await scraper.parse_article(PAGE, SOURCE)
+        assert len(articles) == 1 and scraper.pending_articles() == 1
+        assert set(scraper.held_sources()) == {SOURCE}
+        scraper.http_cache.save(exclude=scraper.held_sources())
+        scraper.blocks.save(exclude=scraper.held_sources())
+        # As if the process died here: the page is refetched and reparsed
+        assert SOURCE not in _saved(scraper.http_cache.path)
+        assert SOURCE not in _saved(scraper.blocks.path)
+
+        # Stopping writes the article out without its body and releases the page
+        await fetcher.stop()
+        assert not scraper.held_sources() and scraper.pending_articles() == 0
+        assert [a['url'] for a in scraper._unsaved] == [articles[0]['url']]
+        scraper.http_cache.save(exclude=scraper.held_sources())
+        scraper.blocks.save(exclude=scraper.held_sources())
+        assert _saved(scraper.http_cache.path)[SOURCE]['etag'] == '"v1"'
+        assert SOURCE in _saved(scraper.blocks.path)
+        scraper.parse_executor.shutdown()
+        if scraper.store is not None:
+            scraper.store.close()
+
+    asyncio.run(run())
@@ -0,0 +1,56 @@
+"""Datelines and region codes through the extraction pipeline"""
+import pytest
+
+from news_scraper import extract_articles
+from parquet_export import flatten_article
+
+
+def _page(description: str) -> str:
+    return (
+        '<html><body><div class="article-item">'
+        '<a href="/read/1">Ekonomi warga tumbuh</a>'
+        f'<p class="article-excerpt">{description}</p>'
+        '</div></body></html>'
+    )
+
+
+@pytest.mark.parametrize('single_pass', [True, False])
+@pytest.mark.parametrize('description, location, codes', [
+    ('JAKARTA, KOMPAS.com - Banjir di Jakarta Utara dan Kab. Bekasi.', 'DKI Jakarta', ['31', '31.75', '32.16']),
+    ('Bekasi (ANTARA) - Warga kota Bekasi mengeluhkan jalan rusak.', 'Kota Bekasi', ['32.75']),
+    ('Pemerintah Kota Bekasi, melalui dinas terkait, menata pasar.', '', ['32.75']),
+])
+def test_dateline_from_raw_description(single_pass, description, location, codes):
+    articles = extract_articles(_page(description), 'https://www.kompas.com/', 'bs4', single_pass)
+    assert [(a['metadata']['location'], a['metadata']['region_codes']) for a in articles] == [(location, codes)]
+    # The stored description is still the cleaned display text
+    assert ',' not in articles[0]['metadata']['description']
+
+
+def test_parquet_row_keeps_region_codes():
+    article = {'title': 't', 'url': 'u', 'metadata': {'location': 'Kota Bekasi', 'region_codes': ['32.75', '32.16']}}
+    assert flatten_article(article, 'Berita')['region_codes'] == ['32.75', '32.16']
+
+
+def test_gazetteer_lists_every_regency_and_city():
+    from gazetteer import default_gazetteer
+
+    levels = [region.level for region in default_gazetteer().regions.values()]
+    assert levels.count('provinsi') == 38
+    assert levels.count('kabupaten/kota') == 514
+
+
+@pytest.mark.parametrize('text, location, codes', [
+    # Datelines name the seat of a kabupaten
+    ('TIMIKA, KOMPAS.com - Warga Mimika menggelar aksi.', 'Kabupaten Mimika', ['94.04']),
+    ('LABUAN BAJO (ANTARA) - Kunjungan wisatawan naik.', 'Kabupaten Manggarai Barat', ['53.15']),
+    ('Cikarang (ANTARA) - Banjir di Kota Bekasi.', 'Kabupaten Bekasi', ['32.16', '32.75']),
+    # Everyday phrases are no places without their region-type word
+    ('Kapolda Metro Jaya meninjau kawasan Puncak.', '', []),
+    ('Harga Batu Bara naik, kata Bupati Batu Bara.', '', []),
+    ('Produksi di Kabupaten Batu Bara dan Kota Metro naik.', '', ['12.19', '18.72']),
+])
+def test_regions_outside_java(text, location, codes):
+    from id_helpers import extract_regions
+
+    assert extract_regions(text) == (location, codes)
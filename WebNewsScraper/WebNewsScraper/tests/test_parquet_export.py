@@ -0,0 +1,26 @@
+"""Parquet export roundtrip; skipped when the parquet extra is not installed"""
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from parquet_export import ParquetExporter, read_articles
+
+
+def test_export_roundtrip(tmp_path):
+    article = {
+        'title': 'Banjir di Bekasi', 'url': 'https://example.com/read/1', 'source': 'https://example.com/',
+        'timestamp': '2026-10-18T15:00:00',
+        'metadata': {
+            'published_date': '2026-10-17T10:00:00+07:00', 'full_content': 'Isi lengkap',
+            'location': 'Kota Bekasi', 'region_codes': ['32.75'], 'keywords': ['banjir'],
+        },
+    }
+    exporter = ParquetExporter(str(tmp_path))
+    exporter.add([article], 'Berita')
+    assert exporter.flush() == 1
+    rows = read_articles(str(tmp_path), since='2026-10-17', categories=['Berita']).to_dict('records')
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row['date'], row['category'], row['full_content']) == ('2026-10-17', 'Berita', 'Isi lengkap')
+    assert list(row['region_codes']) == ['32.75'] and list(row['keywords']) == ['banjir']
+    assert read_articles(str(tmp_path), since='2026-10-18').empty
@@ -0,0 +1,211 @@
+"""
+Per-cycle tracing spans and an on-demand cycle profiler
+
+Tracer collects complete events for one scrape cycle and writes them as a
+Chrome trace (open in chrome://tracing or https://ui.perfetto.dev), one
+row per host: pool wait, DNS, connect and time to headers come from an
+aiohttp trace config; download, decode, tree build, extraction and saving
+are spans opened by the scraper. A disabled Tracer costs one attribute
+check per span.
+
+CycleProfiler wraps a whole cycle in cProfile, or pyinstrument's sampling
+profiler when installed, when NEWS_SCRAPER_PROFILE is set in the
+environment (first cycle) or on SIGUSR1 (next cycle).
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # cProfile only
+    SamplingProfiler = None
+
+PROFILE_ENV_VAR = 'NEWS_SCRAPER_PROFILE'
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+class Tracer:
+    """Chrome trace events for one cycle at a time; lanes (trace threads) are named by host"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.enabled = bool(directory)
+        self.events: List[Dict] = []
+        self._lanes: Dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def _lane(self, name: str) -> int:
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = len(self._lanes) + 1
+        return lane
+
+    def add(self, name: str, start: float, end: float, lane: str = 'cycle', **args) -> None:
+        """Record a span given time.perf_counter() start and end"""
+        if not self.enabled:
+            return
+        self.events.append({
+            'name': name, 'ph': 'X', 'pid': self._pid, 'tid': self._lane(lane),
+            'ts': start * 1e6, 'dur': max(0.0, end - start) * 1e6, 'args': args
+        })
+
+    @contextmanager
+    def span(self, name: str, lane: str = 'cycle', **args) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), lane, **args)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Pool wait, DNS, connect and time-to-headers spans per request"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.lane = urlparse(str(params.url)).netloc
+            context.started = time.perf_counter()
+
+        async def on_connection_queued_start(session, context, params):
+            context.queued = time.perf_counter()
+
+        async def on_connection_queued_end(session, context, params):
+            self.add('pool_wait', context.queued, time.perf_counter(), context.lane)
+
+        async def on_dns_resolvehost_start(session, context, params):
+            context.resolving = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, context, params):
+            self.add('dns', context.resolving, time.perf_counter(), context.lane)
+
+        async def on_connection_create_start(session, context, params):
+            context.connecting = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            self.add('connect', context.connecting, time.perf_counter(), context.lane)
+
+        async def on_request_end(session, context, params):
+            self.add('request', context.started, time.perf_counter(), context.lane,
+                     url=str(params.url), status=params.response.status)
+
+        async def on_request_exception(session, context, params):
+            self.add('request', context.started, time.perf_counter(), context.lane,
+                     url=str(params.url), error=repr(params.exception))
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_queued_start.append(on_connection_queued_start)
+        trace.on_connection_queued_end.append(on_connection_queued_end)
+        trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        return trace
+
+    def flush(self) -> Optional[str]:
+        """Write the cycle's events to a new trace file and start over; returns its path"""
+        if not self.enabled or not self.events:
+            return None
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': lane, 'args': {'name': name}}
+            for name, lane in self._lanes.items()
+        ]
+        events.extend(self.events)
+        self.events = []
+        path = os.path.join(self.directory, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        except OSError as e:
+            logging.error(f"Failed to write trace {path}: {e}")
+            return None
+        return path
+
+
+class CycleProfiler:
+    """
+    Profiles one scrape cycle on request. NEWS_SCRAPER_PROFILE=cprofile (or
+    1) or =pyinstrument profiles the first cycle; SIGUSR1 profiles the next
+    one with the default profiler.
+    """
+
+    def __init__(self, output_dir: str = '.', default: str = 'cprofile'):
+        self.output_dir = output_dir
+        self.default = default
+        requested = os.environ.get(PROFILE_ENV_VAR, '').strip().lower()
+        self.requested: Optional[str] = None
+        if requested and requested not in ('0', 'false', 'no'):
+            self.request(requested if requested in PROFILERS else default)
+        self._profiler = None
+        self._mode: Optional[str] = None
+
+    def request(self, mode: Optional[str] = None) -> None:
+        mode = mode or self.default
+        if mode == 'pyinstrument' and SamplingProfiler is None:
+            logging.warning("pyinstrument is not installed, profiling with cProfile instead")
+            mode = 'cprofile'
+        self.requested = mode
+        logging.info(f"Profiling the next scrape cycle with {mode}")
+
+    def install_signal_handler(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Make SIGUSR1 request a profile of the next cycle (POSIX event loops only)"""
+        if not hasattr(signal, 'SIGUSR1'):
+            return
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, self.request)
+        except (NotImplementedError, RuntimeError) as e:
+            logging.warning(f"SIGUSR1 profiling unavailable: {e}")
+
+    def start(self) -> bool:
+        """Start profiling if a profile was requested; call at the start of a cycle"""
+        if self.requested is None:
+            return False
+        self._mode, self.requested = self.requested, None
+        if self._mode == 'pyinstrument':
+            self._profiler = SamplingProfiler(async_mode='disabled')
+            self._profiler.start()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return True
+
+    def stop(self) -> Optional[str]:
+        """Stop profiling and dump the result next to the articles output; returns its path"""
+        if self._profiler is None:
+            return None
+        profiler, self._profiler = self._profiler, None
+        base = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if self._mode == 'pyinstrument':
+                profiler.stop()
+                path = f"{base}.html"
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+            else:
+                import pstats
+                profiler.disable()
+                path = f"{base}.prof"
+                profiler.dump_stats(path)
+                # Readable summary alongside the file for snakeviz/pstats
+                with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+                    pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(40)
+        except OSError as e:
+            logging.error(f"Failed to write profile {base}: {e}")
+            return None
+        return path
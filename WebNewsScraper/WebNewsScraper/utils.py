@@ -1,9 +1,12 @@
 import hashlib
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 from urllib.parse import urljoin
 import logging
 from collections import OrderedDict
+from functools import lru_cache
+
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-\']|_')
 
 class MemoryCache:
     def __init__(self, max_size: int = 1000):
@@ -22,6 +25,15 @@ class MemoryCache:
         """Check if article is already in cache"""
         return self._generate_hash(article) in self.cache
 
+    def touch(self, article: Dict) -> None:
+        """Mark a cached article as recently seen so it is evicted last"""
+        article_hash = self._generate_hash(article)
+        if article_hash in self.cache:
+            self.cache.move_to_end(article_hash)
+
+    def flush(self) -> None:
+        """Nothing to persist; present for parity with PersistentDedupStore"""
+
     @staticmethod
     def _generate_hash(article: Dict) -> str:
         """Generate unique hash for article based on title and URL"""
@@ -36,7 +48,7 @@ def clean_text(text: str) -> str:
     # Remove extra whitespace
     text = ' '.join(text.split())
     # Remove special characters but keep Indonesian diacritics
-    text = re.sub(r'[^\w\s\-\']|_', ' ', text)
+    text = _SPECIAL_CHARS.sub(' ', text)
     # Normalize whitespace
     text = text.strip()
     return text
@@ -49,10 +61,94 @@ def normalize_url(base_url: str, url: str) -> str:
         return url
     return urljoin(base_url, url)
 
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation factored as a prefix trie, so each position only tries
+    the branches that start with its character. Longer words win because
+    optional suffixes are greedy.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Match a fixed keyword list against text with one precompiled,
+    trie-factored alternation.
+
+    Keywords are compared case-insensitively (both sides lowercased, like
+    contains_keywords). With word_boundary=True a keyword only matches as a
+    whole word, so "politik" no longer matches inside "politikus".
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundary: bool = False):
+        self.word_boundary = word_boundary
+        self.keywords: List[str] = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+        self._pattern: Optional[re.Pattern] = None
+        # Shorter keywords hidden at the start of a longer match ("pemilu" in "pemilukada")
+        self._prefixes: Dict[str, List[str]] = {}
+
+        if self.keywords:
+            alternation = _trie_pattern(self.keywords)
+            if word_boundary:
+                alternation = rf'\b(?:{alternation})\b'
+            self._pattern = re.compile(alternation)
+            if not word_boundary:
+                self._prefixes = {
+                    k: [other for other in self.keywords if other != k and k.startswith(other)]
+                    for k in self.keywords
+                }
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in text"""
+        if not text or self._pattern is None:
+            return False
+        return self._pattern.search(text.lower()) is not None
+
+    def matches(self, text: str) -> List[str]:
+        """Keywords found in text, in order of first occurrence"""
+        if not text or self._pattern is None:
+            return []
+        found: Dict[str, None] = {}
+        lowered = text.lower()
+        position = 0
+        while True:
+            match = self._pattern.search(lowered, position)
+            if match is None:
+                break
+            keyword = match.group()
+            found[keyword] = None
+            for prefix in self._prefixes.get(keyword, ()):
+                found[prefix] = None
+            # Resume right after the match start so overlapping keywords
+            # ("olahraga" / "ragam") are reported too
+            position = match.start() + 1
+        return list(found)
+
+    __contains__ = search
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
 def contains_keywords(text: str, keywords: List[str]) -> bool:
     """Check if text contains any of the keywords"""
-    text_lower = text.lower()
-    return any(keyword.lower() in text_lower for keyword in keywords)
+    return _cached_matcher(tuple(keywords)).search(text)
 
 def log_error(error: Exception, source: str) -> None:
     """Log error with context"""